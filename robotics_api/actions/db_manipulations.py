@@ -1,12 +1,27 @@
 import time
 import uuid
+import socket
 import warnings
+from functools import lru_cache
+from contextlib import contextmanager
 
 from rdkit.Chem import MolFromSmiles
 from rdkit.Chem.rdMolDescriptors import CalcExactMolWt
 from robotics_api.settings import *
 from robotics_api.utils.base_utils import unit_conversion
-from robotics_api.utils.mongo_dbs import RobotStatusDB, MongoDatabase
+from robotics_api.utils.mongo_dbs import RobotStatusDB, MongoDatabase, StatusJournal, StatusTransition
+from robotics_api.utils.status_notifier import STATUS_NOTIFIER
+from pymongo import ReturnDocument
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"  # Default owner for station claims made by this process
+STATUS_INDEXES = {  # collection --> fields queried by the status and standards lookups
+    "status_reagents": ["location", "name", "smiles"],
+    "status_vials": ["experiment_name"],
+    "status_stations": ["available", "state"],
+    "standards_CACalib": ["date_updated"],
+}
+_INDEXED_COLLECTIONS = set()  # collections with ensured indexes, by (backend, full collection name)
+REAGENT_VERSION_ID = "status_reagents"  # status_versions document holding the reagent database version stamp
 
 
 class VialStatus(RobotStatusDB):
@@ -50,12 +65,12 @@ class VialStatus(RobotStatusDB):
     @property
     def content_history(self):
         """
-        Get the vial content.
+        Get the vial content history (reagent additions and extractions) from the status event journal.
 
         Returns:
-            list: The vial content.
+            list: The vial content history.
         """
-        return self.get_prop("content_history") or []
+        return self.history("content")
 
     @property
     def current_weight(self):
@@ -85,7 +100,17 @@ class VialStatus(RobotStatusDB):
         Returns:
             list: The location history.
         """
-        return self.get_prop("location_history") or []
+        return self.history("location")
+
+    @property
+    def weight_history(self):
+        """
+        Get the weight history.
+
+        Returns:
+            list: The weight history.
+        """
+        return self.history("weight")
 
     @property
     def current_station(self):
@@ -168,12 +193,7 @@ class VialStatus(RobotStatusDB):
             "name": reagent.name,
             "amount": amount
         }
-        history = self.get_prop("content_history") or []
-        history.append(current_addition)
-        self.insert(self.id, override_lists=True, instance={
-            "vial_content": other_reagents + new_vial_content,
-            "content_history": history
-        })
+        self.append_history("content", current_addition, vial_content=other_reagents + new_vial_content)
         self.update_status(None, "weight")
 
     def check_addition_id(self, addition_id):
@@ -185,9 +205,9 @@ class VialStatus(RobotStatusDB):
         Raises:
             boolean: If the reagent does not exist in the reagent database.
         """
-        history = self.get_prop("content_history") or []
-        existing_addition_ids = [a["addition_id"] for a in history]
-        if addition_id in existing_addition_ids:
+        self.flush_journal()
+        if self.journal.coll.count_documents({"collection": self.collection_name, "entity": self.id,
+                                              "field": "content", "new.addition_id": addition_id}):
             return False
         return True
 
@@ -226,12 +246,7 @@ class VialStatus(RobotStatusDB):
                 "name": "extraction",
                 "amount": extracted_mass
             }
-            history = self.get_prop("content_history") or []
-            history.append(current_addition)
-            self.insert(self.id, override_lists=True, instance={
-                "vial_content": new_vial_content,
-                "content_history": history
-            })
+            self.append_history("content", current_addition, vial_content=new_vial_content)
             print(f"Successfully extracted {extract_perc*100:.2f}% of the mass from vial {self}.")
 
 
@@ -269,7 +284,7 @@ class StationStatus(RobotStatusDB):
         Returns:
             bool: The availability status.
         """
-        return self.get_prop("available")
+        return self.get_prop("available", refresh=True)
 
     @property
     def state(self):
@@ -309,7 +324,41 @@ class StationStatus(RobotStatusDB):
         Returns:
             list: The content history.
         """
-        return self.get_prop("content_history")
+        return self.history("content")
+
+    @property
+    def owner(self):
+        """
+        Get the worker that claimed the station.
+
+        Returns:
+            str: The owner, or None if the station is not claimed.
+        """
+        return self.get_prop("owner", refresh=True)
+
+    @property
+    def lease_expires(self):
+        """
+        Get the time (seconds since the epoch) the station claim expires.
+
+        Returns:
+            float: The lease expiration time, or None if the station is not claimed.
+        """
+        return self.get_prop("lease_expires", refresh=True)
+
+    def is_free(self, owner=WORKER_ID):
+        """
+        Check if a vial may be placed at the station by a worker: the station is available, or it is empty and
+        claimed by that worker.
+
+        Args:
+            owner (str, optional): The worker. Defaults to WORKER_ID.
+
+        Returns:
+            bool: True if the worker may use the station.
+        """
+        doc = self.refresh()
+        return bool(doc.get("available") or (doc.get("owner") == owner and not doc.get("current_content")))
 
     def place_vial(self, vial, **kwargs):
         """
@@ -356,56 +405,52 @@ class StationStatus(RobotStatusDB):
 
     def get_first_available(self, name_str, wait=True, max_time=MAX_DB_WAIT_TIME, wait_interval=2, **kwargs):
         """
-        Get the first available station with a specified name string.
+        Get the first available station with a specified name string. While waiting, the search reruns as soon as
+        any station is made available.
 
         Args:
             name_str (str): The name string to search for.
             wait (bool, optional): Whether to wait for an available station. Defaults to True.
             max_time (int, optional): The maximum time to wait in seconds. Defaults to MAX_DB_WAIT_TIME.
-            wait_interval (int, optional): The interval between wait checks in seconds. Defaults to 2.
+            wait_interval (int, optional): The fallback interval between database checks in seconds. Defaults to 2.
             **kwargs: Additional keyword arguments.
 
         Returns:
             str: The ID of the first available station.
         """
-        available_stations = self.get_all_available(name_str, **kwargs)
         if not wait:
-            return available_stations[0] if available_stations else None
-        total_time = 0
-        while not available_stations:
-            print(f"Waited for {total_time} seconds, and a {name_str} station is still not available.")
-            time.sleep(wait_interval)
-            total_time += wait_interval
-            if max_time and (total_time >= max_time):
-                return None
             available_stations = self.get_all_available(name_str, **kwargs)
-        return available_stations[0]
+            return available_stations[0] if available_stations else None
+        available_stations = STATUS_NOTIFIER.wait(
+            self.coll, lambda: self.get_all_available(name_str, **kwargs), max_time=max_time,
+            poll_interval=wait_interval,
+            message="Waited for {} seconds, and a %s station is still not available." % name_str)
+        return available_stations[0] if available_stations else None
 
     def wait_till_available(self, max_time=MAX_DB_WAIT_TIME, wait_interval=2):
         """
-        Wait until the station is available.
+        Wait until the station is available. The station is rechecked as soon as any station is made available.
 
         Args:
             max_time (int, optional): The maximum time to wait in seconds. Defaults to MAX_DB_WAIT_TIME.
-            wait_interval (int, optional): The interval between wait checks in seconds. Defaults to 2.
+            wait_interval (int, optional): The fallback interval between database checks in seconds. Defaults to 2.
 
         Returns:
             bool: True if the station becomes available, False otherwise.
         """
-        total_time = 0
-        while not self.available:
-            print(f"Waited for {total_time} seconds and {self} station is still not available.")
-            time.sleep(wait_interval)
-            total_time += wait_interval
-            if max_time and (total_time >= max_time):
-                print(f"{self} is not available. ")
-                return False
+        available = STATUS_NOTIFIER.wait(
+            self.coll, lambda: self.refresh().get("available"), max_time=max_time, poll_interval=wait_interval,
+            message="Waited for {} seconds and %s station is still not available." % self)
+        if not available:
+            print(f"{self} is not available. ")
+            return False
         print(f"{self} is available!")
         return True
 
     def update_available(self, value: bool):
         """
-        Update the availability status.
+        Update the availability status. Making a station available releases any claim on it and wakes any
+        process waiting on a station.
 
         Args:
             value (bool): The new availability status.
@@ -413,7 +458,136 @@ class StationStatus(RobotStatusDB):
         Returns:
             prop: The updated availability status.
         """
-        return self.coll.update_one({"_id": self.id}, {"$set": {"available": value}})
+        if not value:
+            return self.update_props(available=False)
+        result = self.update_props(available=True, owner=None, lease_expires=None)
+        STATUS_NOTIFIER.notify(self.coll)
+        return result
+
+    @staticmethod
+    def _claim_query(query, check_clean=False):
+        """Query matching stations that are available, or empty with an expired claim."""
+        query = dict(query, **{"$or": [
+            {"available": True},
+            {"lease_expires": {"$lt": time.time()}, "current_content": {"$in": ["", None]}},
+        ]})
+        if check_clean:
+            query.update({"clean": True})
+        return query
+
+    def _claim(self, query, label, owner=WORKER_ID, lease_seconds=STATION_LEASE_TIME, check_clean=False, wait=True,
+               max_time=MAX_DB_WAIT_TIME, wait_interval=2, hold=False):
+        """
+        Atomically claim the first station that matches a query, waiting if requested.
+
+        Returns:
+            str: The ID of the claimed station, or None if no station was claimed.
+        """
+        def claim_once():
+            doc = self.coll.find_one_and_update(
+                self._claim_query(query, check_clean=check_clean),
+                {"$set": {"available": False, "owner": owner, "lease_expires": time.time() + lease_seconds,
+                          "held": hold}},
+                sort=[("_id", 1)], projection={"_id": 1}, return_document=ReturnDocument.AFTER)
+            return (doc or {}).get("_id")
+
+        if not wait:
+            station_id = claim_once()
+        else:
+            station_id = STATUS_NOTIFIER.wait(
+                self.coll, claim_once, max_time=max_time, poll_interval=wait_interval,
+                message="Waited for {} seconds, and a %s station is still not available." % label)
+        if station_id:
+            self.invalidate()
+            print(f"Station {station_id} claimed by {owner}.")
+        return station_id
+
+    def claim_station(self, name_pattern: str, owner=WORKER_ID, lease_seconds=STATION_LEASE_TIME, check_clean=False,
+                      wait=True, max_time=MAX_DB_WAIT_TIME, wait_interval=2, hold=False):
+        """
+        Atomically claim the first available station with a specified name string. The claim marks the station
+        unavailable and records its owner, so concurrent workers never receive the same station. A claim on a
+        station that is still empty after `lease_seconds` (e.g., because its worker crashed) may be reclaimed.
+        The claim is released when the station is made available (e.g., by `empty`) or by `release`. A held claim
+        (`hold=True`, see `hold_station`) is only released by `release`; `empty` just renews its lease.
+
+        Args:
+            name_pattern (str): The name string (regex) to search for.
+            owner (str, optional): The claiming worker. Defaults to WORKER_ID.
+            lease_seconds (float, optional): Seconds before an unused claim expires. Defaults to STATION_LEASE_TIME.
+            check_clean (bool, optional): Only claim clean stations if True. Defaults to False.
+            wait (bool, optional): Whether to wait for an available station. Defaults to True.
+            max_time (int, optional): The maximum time to wait in seconds. Defaults to MAX_DB_WAIT_TIME.
+            wait_interval (int, optional): The fallback interval between database checks in seconds. Defaults to 2.
+            hold (bool, optional): Keep the claim until `release`, even when the station is emptied. Defaults to False.
+
+        Returns:
+            str: The ID of the claimed station, or None if no station was claimed.
+        """
+        return self._claim({"_id": {"$regex": name_pattern}}, name_pattern, owner=owner, lease_seconds=lease_seconds,
+                           check_clean=check_clean, wait=wait, max_time=max_time, wait_interval=wait_interval,
+                           hold=hold)
+
+    @contextmanager
+    def hold_station(self, name_pattern: str, owner=WORKER_ID, **kwargs):
+        """
+        Claim the first available station with a specified name string for the duration of a `with` block, e.g.,
+        for a whole Firetask. Placing and removing vials does not release the claim; it is released when the block
+        exits, including on an exception. See `claim_station`.
+
+        Args:
+            name_pattern (str): The name string (regex) to search for.
+            owner (str, optional): The claiming worker. Defaults to WORKER_ID.
+            **kwargs: Other `claim_station` keyword arguments.
+
+        Yields:
+            str: The ID of the claimed station, or None if no station was claimed.
+        """
+        station_id = self.claim_station(name_pattern, owner=owner, hold=True, **kwargs)
+        try:
+            yield station_id
+        finally:
+            if station_id:
+                StationStatus(station_id).release(owner=owner)
+
+    def claim(self, owner=WORKER_ID, lease_seconds=STATION_LEASE_TIME, wait=True, max_time=MAX_DB_WAIT_TIME,
+              wait_interval=2):
+        """
+        Atomically claim this station. See `claim_station`.
+
+        Args:
+            owner (str, optional): The claiming worker. Defaults to WORKER_ID.
+            lease_seconds (float, optional): Seconds before an unused claim expires. Defaults to STATION_LEASE_TIME.
+            wait (bool, optional): Whether to wait for the station to become available. Defaults to True.
+            max_time (int, optional): The maximum time to wait in seconds. Defaults to MAX_DB_WAIT_TIME.
+            wait_interval (int, optional): The fallback interval between database checks in seconds. Defaults to 2.
+
+        Returns:
+            bool: True if the station was claimed, False otherwise.
+        """
+        return bool(self._claim({"_id": self.id}, self.id, owner=owner, lease_seconds=lease_seconds, wait=wait,
+                                max_time=max_time, wait_interval=wait_interval))
+
+    def release(self, owner=WORKER_ID):
+        """
+        Release a claim on the station if the station is empty and claimed by the given worker. If the station
+        still holds a vial, a held claim becomes a normal claim, which is released when the station is emptied.
+
+        Args:
+            owner (str, optional): The worker that claimed the station. Defaults to WORKER_ID.
+
+        Returns:
+            bool: True if the claim was released.
+        """
+        result = self.coll.update_one({"_id": self.id, "owner": owner, "current_content": {"$in": ["", None]}},
+                                      {"$set": {"available": True, "owner": None, "lease_expires": None,
+                                                "held": False}})
+        if not result.modified_count:
+            self.coll.update_one({"_id": self.id, "owner": owner}, {"$set": {"held": False}})
+        self.invalidate()
+        if result.modified_count:
+            STATUS_NOTIFIER.notify(self.coll)
+        return bool(result.modified_count)
 
     def update_state(self, new_state: str):
         """
@@ -422,7 +596,7 @@ class StationStatus(RobotStatusDB):
         Args:
             new_state (str): The new state for the station.
         """
-        self.coll.update_one({"_id": self.id}, {"$set": {"state": new_state}})
+        self.update_props(state=new_state)
 
     def update_clean(self, clean_status: bool):
         """
@@ -431,7 +605,7 @@ class StationStatus(RobotStatusDB):
         Args:
             clean_status (bool): The new cleanliness status for the station.
         """
-        self.coll.update_one({"_id": self.id}, {"$set": {"clean": clean_status}})
+        self.update_props(clean=clean_status)
         print(f"Potentiostat {self} updated to clean is {clean_status}.")
 
     def update_content(self, new_content):
@@ -443,10 +617,26 @@ class StationStatus(RobotStatusDB):
         """
         self.update_status(new_content, "content")
 
-    def empty(self):
-        """Empty the station content and update availability."""
+    def empty(self, transition: StatusTransition = None):
+        """
+        Empty the station content and update availability.
+
+        Args:
+            transition (StatusTransition, optional): If given, the changes are staged in the transition instead of
+                written immediately. Defaults to None.
+        """
+        held = (self.coll.find_one({"_id": self.id}, {"held": 1}) or {}).get("held")
+        release = {"lease_expires": time.time() + STATION_LEASE_TIME} if held else \
+            {"available": True, "owner": None, "lease_expires": None}
+        if transition is not None:
+            transition.update_status(self, "", "content")
+            transition.update_props(self, **release)
+            return
         self.update_status("", "content")
-        self.update_available(True)
+        if held:
+            self.update_props(**release)
+        else:
+            self.update_available(True)
         print(f"Successfully emptied station {self}")
 
 
@@ -489,6 +679,39 @@ class ReagentStatus(RobotStatusDB):
         self.type = self.get_prop("type")
         self.current_wflow_name = self.get_prop("current_wflow_name")
 
+    @staticmethod
+    def ids_at_location(location: str):
+        """
+        Get the IDs of the reagents at a location with an indexed query. Results are not cached, so a reagent
+        database reset by another process is seen immediately.
+
+        Args:
+            location (str): The reagent location (e.g., a liquid station ID).
+
+        Returns:
+            list: IDs of the reagents at the location.
+        """
+        return [d["_id"] for d in ReagentStatus().coll.find({"location": location}, {"_id": 1})]
+
+    @staticmethod
+    def db_version():
+        """
+        Get the reagent database version stamp, which `reset_reagent_db` changes on every reset.
+
+        Returns:
+            int: The version stamp (0 if the reagents were never reset).
+        """
+        versions = MongoDatabase(database="robotics", collection_name="status_versions").coll
+        return (versions.find_one({"_id": REAGENT_VERSION_ID}) or {}).get("version", 0)
+
+    @staticmethod
+    def bump_db_version():
+        """
+        Change the reagent database version stamp, so every process reloads its reagent registry.
+        """
+        versions = MongoDatabase(database="robotics", collection_name="status_versions").coll
+        versions.update_one({"_id": REAGENT_VERSION_ID}, {"$inc": {"version": 1}}, upsert=True)
+
     @property
     def molecular_weight(self):
         """
@@ -499,8 +722,124 @@ class ReagentStatus(RobotStatusDB):
         """
         if not self.smiles:
             raise Exception(f"Cannot calculate molecular weight because no SMILES is associated with {self}.")
-        rdkmol = MolFromSmiles(self.smiles)
-        return CalcExactMolWt(rdkmol)
+        return molecular_weight(self.smiles)
+
+
+@lru_cache(maxsize=None)
+def molecular_weight(smiles: str):
+    """
+    Calculate the exact molecular weight of a SMILES string. Results are cached by SMILES.
+
+    Args:
+        smiles (str): SMILES string.
+
+    Returns:
+        float: The molecular weight (g/mol), or None if the SMILES cannot be parsed.
+    """
+    rdkmol = MolFromSmiles(smiles) if smiles else None
+    return CalcExactMolWt(rdkmol) if rdkmol else None
+
+
+class ReagentRegistry:
+    """
+    Workflow-scoped, in-memory copy of the Robot Reagent Status database. Reagents are loaded with one query at task
+    start and reused for property lookups. The registry records the reagent database version stamp when it loads
+    and reloads when `load` (called at each task start) or `properties` finds that the stamp has changed, i.e., the
+    reagent database was reset by any process.
+    """
+
+    def __init__(self):
+        self.wflow_name = None
+        self.loaded = False
+        self.version = None  # reagent database version stamp when the registry was loaded
+        self._reagents = {}  # reagent ID --> reagent document
+
+    def load(self, wflow_name=None, force=False):
+        """
+        Load all reagents from the reagent database. Does nothing if the reagents for this workflow are already
+        loaded and the reagent database has not been reset since, unless `force` is True.
+
+        Args:
+            wflow_name (str, optional): The current workflow name. Defaults to None.
+            force (bool, optional): Reload even if already loaded. Defaults to False.
+        """
+        version = ReagentStatus.db_version()
+        if self.loaded and self.wflow_name == wflow_name and self.version == version and not force:
+            return
+        self._reagents = {d["_id"]: d for d in ReagentStatus().coll.find({})}
+        self.wflow_name = wflow_name
+        self.version = version
+        self.loaded = True
+
+    def clear(self):
+        """
+        Invalidate the registry so the next lookup reloads from the reagent database.
+        """
+        self._reagents = {}
+        self.wflow_name = None
+        self.version = None
+        self.loaded = False
+
+    def check_version(self):
+        """
+        Invalidate the registry if the reagent database version stamp changed since it was loaded.
+        """
+        if self.loaded and self.version != ReagentStatus.db_version():
+            self.clear()
+
+    def get(self, reagent_id: str):
+        """
+        Get a reagent document.
+
+        Args:
+            reagent_id (str): The reagent ID.
+
+        Returns:
+            dict: The reagent document, or an empty dict if the reagent does not exist.
+        """
+        if not self.loaded:
+            self.load()
+        if reagent_id not in self._reagents:
+            doc = ReagentStatus().coll.find_one({"_id": reagent_id})
+            if not doc:
+                return {}
+            self._reagents[reagent_id] = doc
+        return self._reagents[reagent_id]
+
+    def molecular_weight(self, reagent_id: str):
+        """
+        Get the molecular weight (g/mol) of a reagent, or None if it has no SMILES.
+        """
+        return molecular_weight(self.get(reagent_id).get("smiles"))
+
+    def density(self, reagent_id: str):
+        """
+        Get the density of a reagent (in DENSITY_UNIT).
+        """
+        return self.get(reagent_id).get("density")
+
+    def formal_potential(self, reagent_id: str):
+        """
+        Get the formal potential of a reagent (in POTENTIAL_UNIT).
+        """
+        return self.get(reagent_id).get("formal_potential")
+
+    def properties(self, reagent_ids):
+        """
+        Get the molecular weights and densities of several reagents.
+
+        Args:
+            reagent_ids (list): Reagent IDs.
+
+        Returns:
+            dict: Reagent ID --> {"molecular_weight": float or None, "density": float or None}
+        """
+        self.check_version()
+        return {i: {"molecular_weight": self.molecular_weight(i), "density": self.density(i)}
+                for i in set(reagent_ids) if self.get(i)}
+
+
+REAGENT_REGISTRY = ReagentRegistry()
 
 
 class ChemStandardsDB(MongoDatabase):
@@ -509,7 +848,8 @@ class ChemStandardsDB(MongoDatabase):
     Copyright 2024, University of Kentucky
     """
 
-    def __init__(self, standards_type: str, _id: str = None, instance: dict = None, override_lists: bool = True):
+    def __init__(self, standards_type: str, _id: str = None, instance: dict = None, override_lists: bool = True,
+                 backend=None):
         """
         Initialize class instance.
 
@@ -518,9 +858,11 @@ class ChemStandardsDB(MongoDatabase):
             _id (str, optional): The ID of the standard. Defaults to None.
             instance (dict, optional): The instance to insert or validate. Defaults to None.
             override_lists (bool, optional): Whether to override existing lists. Defaults to True.
+            backend (str, optional): Database backend, "mongo" or "memory". Defaults to DB_BACKEND.
         """
         self.db_name = 'standards_' + standards_type
-        super().__init__(database="robotics", collection_name=self.db_name, instance=instance, validate_schema=False)
+        super().__init__(database="robotics", collection_name=self.db_name, instance=instance, validate_schema=False,
+                         backend=backend)
         self.id = _id or self.instance.get("_id", str(uuid.uuid4()))
         if instance:
             instance["_id"] = self.id
@@ -576,7 +918,8 @@ def check_duplicates(test_list, exemptions=None):
         return ", ".join(duplicates)
 
 
-def reset_reagent_db(reagents_list, current_wflow_name="", solvent_densities=SOLVENT_DENSITIES, potentials_dict=FORMAL_POTENTIALS):
+def reset_reagent_db(reagents_list, current_wflow_name="", solvent_densities=SOLVENT_DENSITIES,
+                     potentials_dict=FORMAL_POTENTIALS, diff=True):
     """
     Reset the reagent database with the provided list of reagents.
 
@@ -584,6 +927,7 @@ def reset_reagent_db(reagents_list, current_wflow_name="", solvent_densities=SOL
         reagents_list (list): List of dictionaries representing reagents.
         current_wflow_name (str, optional): Name of the current workflow. Defaults to "".
         solvent_densities (dict, optional): Dictionary with solvent SMILES and densities
+        diff (bool, optional): Leave reagents that are already up-to-date untouched. Defaults to True.
     """
     # Check reagent locations 1-to-1 status
     reagent_locs = [r.get("location") for r in reagents_list]
@@ -591,43 +935,62 @@ def reset_reagent_db(reagents_list, current_wflow_name="", solvent_densities=SOL
     if duplicate_reagents:
         raise ValueError("More than one reagent is assigned the same station: " + duplicate_reagents)
 
-    ReagentStatus().coll.delete_many({})
+    REAGENT_REGISTRY.clear()
     for r in reagents_list:
         smiles = r.get("smiles", "")
         r.update({"current_wflow_name": current_wflow_name,
                   "density": unit_conversion(solvent_densities.get(smiles), default_unit=DENSITY_UNIT),
                   "formal_potential": unit_conversion(potentials_dict.get(smiles), default_unit=POTENTIAL_UNIT)})
-        ReagentStatus(instance=r)
+    ReagentStatus().reset(reagents_list, diff=diff)
+    ReagentStatus.bump_db_version()
 
 
-def reset_station_db(current_wflow_name=""):
+def ensure_status_indexes(indexes=None, force=False):
+    """
+    Create the indexes used by status and standards lookups. Indexes are only ensured once per process for each
+    collection unless `force` is True.
+
+    Args:
+        indexes (dict, optional): Collection name --> list of fields to index. Defaults to STATUS_INDEXES.
+        force (bool, optional): Ensure indexes even if they were already ensured in this process. Defaults to False.
+    """
+    for coll_name, fields in (indexes or STATUS_INDEXES).items():
+        coll = MongoDatabase(database="robotics", collection_name=coll_name).coll
+        key = (DB_BACKEND, coll.full_name)
+        if key in _INDEXED_COLLECTIONS and not force:
+            continue
+        for field in fields:
+            coll.create_index(field)
+        _INDEXED_COLLECTIONS.add(key)
+    StatusJournal().ensure_indexes()
+
+
+def reset_station_db(current_wflow_name="", diff=True):
     """
     Reset the station database.
 
     Args:
         current_wflow_name (str, optional): Name of the current workflow. Defaults to "".
+        diff (bool, optional): Leave stations that are already up-to-date untouched. Defaults to True.
     """
-    StationStatus().coll.delete_many({})
-    for station in STATIONS:
-        state = "down" if "potentiostat" in station else ""
-        StationStatus(instance={
-            "_id": station,
-            "current_wflow_name": current_wflow_name,
-            "available": True,
-            "state": state,
-            "clean": True,
-            "current_content": "",
-            "content_history": [],
-        })
-
-
-def reset_vial_db(experiment_locs: dict, current_wflow_name=""):
+    StationStatus().reset([{
+        "_id": station,
+        "current_wflow_name": current_wflow_name,
+        "available": True,
+        "state": "down" if "potentiostat" in station else "",
+        "clean": True,
+        "current_content": "",
+    } for station in STATIONS], diff=diff)
+
+
+def reset_vial_db(experiment_locs: dict, current_wflow_name="", diff=True):
     """
     Reset the vial database with the provided experiment locations.
 
     Args:
         experiment_locs (dict): Dictionary mapping vial IDs to experiment names.
         current_wflow_name (str, optional): Name of the current workflow. Defaults to "".
+        diff (bool, optional): Leave vials that are already up-to-date untouched. Defaults to True.
     """
     # Check experiment locations 1-to-1 status
     experiment_locs.update(RINSE_VIALS)
@@ -638,18 +1001,14 @@ def reset_vial_db(experiment_locs: dict, current_wflow_name=""):
     print("EXPERIMENT DICT: ", exp_dict)
 
     # Set up vial locations DB
-    VialStatus().coll.delete_many({})
-    for vial in VIALS:
-        VialStatus(instance={
-            "_id": vial,
-            "current_wflow_name": current_wflow_name,
-            "experiment_name": exp_dict.get(vial, ""),
-            "vial_content": [],
-            "current_weight": None,
-            "current_location": "home",
-            "weight_history": [],
-            "location_history": [],
-        })
+    VialStatus().reset([{
+        "_id": vial,
+        "current_wflow_name": current_wflow_name,
+        "experiment_name": exp_dict.get(vial, ""),
+        "vial_content": [],
+        "current_weight": None,
+        "current_location": "home",
+    } for vial in VIALS], diff=diff)
 
 
 def reset_test_db():
@@ -711,7 +1070,27 @@ def reset_test_db():
     reset_station_db(current_wflow_name=wflow_name)
 
 
+def replay_status_db(apply=False):
+    """
+    Reconstruct the current vial and station status from the status event journal, e.g., after a crash.
+
+    Args:
+        apply (bool, optional): Write the reconstructed status to the status database if True. Defaults to False.
+
+    Returns:
+        dict: Status collection name --> status document ID --> reconstructed properties.
+    """
+    journal = StatusJournal()
+    state = {}
+    for coll_name in [VialStatus().collection_name, StationStatus().collection_name]:
+        state[coll_name] = journal.replay(coll_name, apply=apply)
+        for _id, props in state[coll_name].items():
+            print(f"{coll_name} {_id}: {props}")
+    return state
+
+
 def setup_status_db(wflow_name, experiments, reagents):
+    ensure_status_indexes()
     reset_reagent_db(reagents, current_wflow_name=wflow_name)
     reset_vial_db(experiments, current_wflow_name=wflow_name)
     reset_station_db(current_wflow_name=wflow_name)
@@ -1,9 +1,15 @@
 import math
 import time
+import threading
+import numpy as np
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
 
 from d3tales_api.Processors.parser_echem import ProcessChiESI
 from robotics_api.utils.kinova_move import *
 from robotics_api.utils.base_utils import *
+from robotics_api.utils.serial_utils import get_serial_session, RateLimitedPrinter
 from robotics_api.actions.db_manipulations import *
 
 
@@ -108,24 +114,31 @@ class VialMove(VialStatus):
                             f"at {self.current_location}. ")
         return success
 
-    def update_position(self, position, update_vial=True):
+    def update_position(self, position, update_vial=True, empty_station=None):
         """
-        Updates the current position of the vial.
+        Updates the current position of the vial. The vial location, the new station, and the emptied station are
+        committed together as one status transition.
 
         Args:
             position (str): The new position of the vial.
             update_vial (bool): Update vial position if true.
+            empty_station (str): Station to empty in the same transition, e.g. "robot_grip" (default is None).
 
         Returns:
             None
         """
+        transition = StatusTransition()
         if update_vial:
-            self.update_location(position)
+            transition.update_status(self, position, "location")
         station = StationStatus(position)
         if station.exists:
-            station.update_content(self.id)
-            station.update_available(False)
+            transition.update_status(station, self.id, "content")
+            transition.update_props(station, available=False)
+        else:
             print(f"Warning! Station {position} not found! Station content not updated!")
+        if empty_station:
+            StationStatus(empty_station).empty(transition=transition)
+        transition.commit()
         print(f"Successfully updated vial {self} to position {position}")
 
     def place_home(self, raise_error=True):
@@ -148,8 +161,7 @@ class VialMove(VialStatus):
             raise Exception(f"Vial {self} was not successfully moved home.")
 
         if success:
-            self.update_position("home")
-            StationStatus("robot_grip").empty()
+            self.update_position("home", empty_station="robot_grip")
 
         return success
 
@@ -171,7 +183,7 @@ class VialMove(VialStatus):
 
         if station.current_content == self.id:
             success &= True
-        elif station.available:
+        elif station.is_free():
             success &= get_place_vial(station, action_type='place', raise_error=raise_error)
         else:
             success &= False
@@ -180,8 +192,7 @@ class VialMove(VialStatus):
             raise Exception(f"Vial {self} was not successfully moved to {station}.")
 
         if success:
-            self.update_position(station.id)
-            StationStatus("robot_grip").empty()
+            self.update_position(station.id, empty_station="robot_grip")
 
         return success
 
@@ -204,7 +215,7 @@ class VialMove(VialStatus):
 
         if station.current_content == self.id:
             success &= True
-        elif station.available:
+        elif station.is_free():
             print("LOCATION: ", station.pre_location_snapshot)
             success &= get_place_vial(station, action_type='place', release_vial=False, leave=False,
                                       raise_error=raise_error, pre_position_only=pre_position_only)
@@ -293,13 +304,12 @@ class LiquidStation(StationStatus):
         Raises:
             ValueError: If no solvents or more than one solvent is found at this station.
         """
-        all_solvents = list(MongoDatabase(database="robotics", collection_name='status_reagents').coll.find())
-        potential_solvents = [s for s in all_solvents if s["location"] == self.id]
+        potential_solvents = ReagentStatus.ids_at_location(self.id)
         if len(potential_solvents) > 1:
             raise ValueError(f"More than one reagents are listed as located at station {self}: {potential_solvents}.")
         elif len(potential_solvents) < 1:
             raise ValueError(f"No reagents are listed as located at station {self}.")
-        return potential_solvents[0]["_id"]
+        return potential_solvents[0]
 
     def place_vial(self, vial: VialMove, raise_error=True):
         """
@@ -384,20 +394,24 @@ class LiquidStation(StationStatus):
             Exception: If the dispensing fails or the weighing fails.
         """
         # Pre dispense weighing
-        balance = BalanceStation(vial.current_location) if "balance" in vial.current_location else BalanceStation(
-            StationStatus().get_first_available("balance"))
-        pre_mass = balance.existing_weight(vial)
+        if "balance" in vial.current_location:
+            balance_claim = nullcontext(vial.current_location)
+        else:
+            balance_claim = StationStatus().hold_station("balance")
+        with balance_claim as balance_id:
+            balance = BalanceStation(balance_id)
+            pre_mass = balance.existing_weight(vial)
 
-        # Dispense liquid
-        self._dispense_to_vial(vial=vial, volume=volume, raise_error=raise_error)
+            # Dispense liquid
+            self._dispense_to_vial(vial=vial, volume=volume, raise_error=raise_error)
 
-        # Post dispense weighing
-        post_mass = balance.weigh(vial)
-        final_mass = post_mass - pre_mass
+            # Post dispense weighing
+            post_mass = balance.weigh(vial)
+            final_mass = post_mass - pre_mass
 
-        # Update vial contents
-        vial.add_reagent(self.solvent_id, amount=final_mass, default_unit=MASS_UNIT, addition_id=addition_id)
-        vial.update_weight(post_mass)
+            # Update vial contents
+            vial.add_reagent(self.solvent_id, amount=final_mass, default_unit=MASS_UNIT, addition_id=addition_id)
+            vial.update_weight(post_mass)
 
         return f"{final_mass}{MASS_UNIT}"
 
@@ -513,6 +527,133 @@ class PipetteStation(StationStatus):
         send_arduino_cmd(self.serial_name, volume*correction_factor)
 
 
+class BalanceStream:
+    """
+    Ring buffer of weight readings from a balance in continuous-send (SIR) mode. Readings are parsed on the serial
+    reader thread, and `wait_stable` returns as soon as the readings in the stability window agree.
+    """
+
+    def __init__(self, session, window: float = BALANCE_STABILITY_WINDOW,
+                 tolerance: float = BALANCE_STABILITY_TOLERANCE, buffer_size: int = BALANCE_STREAM_BUFFER):
+        """
+        Initializes the BalanceStream.
+
+        Args:
+            session (SerialSession): Serial session for the balance port.
+            window (float, optional): Seconds of readings that must agree. Defaults to BALANCE_STABILITY_WINDOW.
+            tolerance (float, optional): Maximum spread (g) of readings in the window. Defaults to
+                BALANCE_STABILITY_TOLERANCE.
+            buffer_size (int, optional): Number of readings to keep. Defaults to BALANCE_STREAM_BUFFER.
+        """
+        self.session = session
+        self.window = window
+        self.tolerance = tolerance
+        self.readings = deque(maxlen=buffer_size)  # (time, mass, balance reports stable)
+        self.errors = []
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        self.session.lock.acquire()
+        try:
+            self.session.discard_input()
+            self.session.subscribe(self.on_line)
+            self.session.write("SIR\n")
+        except BaseException:
+            self.session.unsubscribe(self.on_line)
+            self.session.lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            # Any weigh command ends continuous sending. "@" would too, but it resets the balance and clears the tare.
+            self.session.write("SI\n")
+            time.sleep(0.1)
+        finally:
+            self.session.unsubscribe(self.on_line)
+            self.session.discard_input()
+            self.session.lock.release()
+
+    @staticmethod
+    def parse(line: str):
+        """
+        Parses a balance weight line (e.g., "S S      12.3456 g").
+
+        Args:
+            line (str): Response line.
+
+        Returns:
+            tuple: (mass, stable) or None if the line is not a weight reading.
+        """
+        parts = line.split()
+        if len(parts) < 3 or parts[0] != "S" or parts[1] not in ("S", "D"):
+            return None
+        try:
+            return float(parts[2]), parts[1] == "S"
+        except ValueError:
+            return None
+
+    def on_line(self, line: str):
+        reading = self.parse(line)
+        with self._condition:
+            if reading:
+                self.readings.append((time.monotonic(), *reading))
+            elif line.startswith("S "):
+                self.errors.append(line)  # e.g., "S I" (command not executable) or "S +" (overload)
+            else:
+                return False
+            self._condition.notify_all()
+        return True
+
+    def stable_mass(self):
+        """
+        Checks the readings in the stability window.
+
+        Returns:
+            float: The mean mass of the window if the readings span the window and agree within the tolerance,
+                otherwise None.
+        """
+        if not self.readings:
+            return None
+        now = time.monotonic()
+        if now - self.readings[0][0] < self.window:
+            return None
+        window = [r for r in self.readings if now - r[0] <= self.window]
+        masses = [r[1] for r in window]
+        if len(masses) < 2 or not window[-1][2] or max(masses) - min(masses) > self.tolerance:
+            return None
+        return round(sum(masses) / len(masses), 6)
+
+    def wait_stable(self, timeout: float = BALANCE_STREAM_TIMEOUT):
+        """
+        Waits until the streamed reading settles.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. Defaults to BALANCE_STREAM_TIMEOUT.
+
+        Returns:
+            float: The settled mass.
+
+        Raises:
+            TimeoutError: If the reading does not settle before the timeout.
+        """
+        log = RateLimitedPrinter()
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while True:
+                mass = self.stable_mass()
+                if mass is not None:
+                    return mass
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    last = self.readings[-1][1] if self.readings else None
+                    raise TimeoutError(f"Balance reading did not settle within {timeout} s (last reading {last}, "
+                                       f"errors {self.errors[-3:]}).")
+                if self.readings:
+                    log("waiting for balance reading to settle ({} g)...".format(self.readings[-1][1]))
+                self._condition.wait(min(remaining, self.window / 4))
+
+
 class BalanceStation(StationStatus):
     """
     A class representing a balance station.
@@ -527,6 +668,7 @@ class BalanceStation(StationStatus):
         existing_weight(vial, raise_error=True): Returns the current weight of a vial if available, or weighs the vial.
         weigh(vial, raise_error=True): Weighs a vial by taring the balance and placing the vial.
         read_mass(): Reads the mass from the balance via serial communication.
+        read_stable_mass(): Reads the mass from the balance continuous-send stream once the reading settles.
         tare(): Tares the balance.
         _send_command(write_txt=None, read_response=False): Sends a command to the balance and optionally reads the response.
     """
@@ -628,7 +770,14 @@ class BalanceStation(StationStatus):
             vial.retrieve()
         self.tare()
         self.place_vial(vial, raise_error=raise_error)
-        mass = self.try_read_mass(max_balance_reads=max_balance_reads)
+        mass = None
+        if BALANCE_STREAMING:
+            try:
+                mass = self.read_stable_mass()
+            except (TimeoutError, SystemError, OSError) as e:  # serial.SerialException is an OSError
+                print(f"WARNING. Streamed balance reading failed ({e}). Falling back to single reads.")
+        if mass is None:
+            mass = self.try_read_mass(max_balance_reads=max_balance_reads)
         time.sleep(1)
         self._retrieve_vial(vial)
         vial.update_status(mass, "weight")
@@ -653,6 +802,27 @@ class BalanceStation(StationStatus):
                 balance_reads += 1
                 time.sleep(10)
 
+    def read_stable_mass(self, window=BALANCE_STABILITY_WINDOW, tolerance=BALANCE_STABILITY_TOLERANCE,
+                         timeout=BALANCE_STREAM_TIMEOUT):
+        """
+        Reads the mass from the balance in continuous-send mode, returning as soon as the reading settles.
+
+        Args:
+            window (float): Seconds of readings that must agree (default is BALANCE_STABILITY_WINDOW).
+            tolerance (float): Maximum spread (g) of readings in the window (default is BALANCE_STABILITY_TOLERANCE).
+            timeout (float): Maximum seconds to wait for the reading to settle (default is BALANCE_STREAM_TIMEOUT).
+
+        Returns:
+            float: The settled mass read from the balance.
+
+        Raises:
+            TimeoutError: If the reading does not settle before the timeout.
+        """
+        with BalanceStream(get_serial_session(self.p_address, timeout=1), window=window, tolerance=tolerance) as stream:
+            mass = stream.wait_stable(timeout=timeout)
+        print(f"BALANCE STABLE READING: {mass}")
+        return mass
+
     def read_mass(self):
         """
         Reads the mass from the balance via serial communication.
@@ -705,27 +875,15 @@ class BalanceStation(StationStatus):
         Raises:
             Exception: If the balance is not connected or an error occurs during communication.
         """
+        balance = get_serial_session(self.p_address, timeout=1)
+        if not read_response:
+            if write_txt:
+                balance.write(write_txt)
+            return None
         try:
-            balance = serial.Serial(self.p_address, timeout=1)
-        except IOError as e:
-            raise Exception("Warning! Balance {} is not connected to {} because: {}".format(self, self.p_address, e))
-        time.sleep(1)  # give the connection a second to settle
-        if write_txt:
-            balance.write(bytes(write_txt, encoding='utf-8'))
-        if read_response:
-            start_time = time.time()
-            while True:
-                data = balance.readline()
-                elapsed_time = time.time() - start_time
-                if elapsed_time > max_balance_read_time:
-                    raise ValueError(f"Balance failed to respond after {max_balance_read_time} s.")
-                print("waiting for {} balance results for {:.1f} seconds...".format(self, elapsed_time))
-                if data:
-                    result_txt = data.decode().strip()  # strip out the old lines
-                    print("BALANCE RESULT: ", result_txt)
-                    balance.close()
-                    return result_txt
-                time.sleep(1)
+            return balance.command(write_txt, timeout=max_balance_read_time, label=f"{self} BALANCE")
+        except TimeoutError as e:
+            raise ValueError(str(e))
 
 
 class TemperatureStation(StationStatus):
@@ -737,6 +895,8 @@ class TemperatureStation(StationStatus):
 
     Methods:
         temperature(): Gets current temperature
+
+    See TemperatureSampler for background sampling and lookups by collection time.
     """
 
     def __init__(self, _id="temperature_01", **kwargs):
@@ -763,7 +923,157 @@ class TemperatureStation(StationStatus):
 
         arduino_result = send_arduino_cmd(self.serial_name, "", return_txt=True)
         if arduino_result:
-            return {"value": sig_figs(float(arduino_result.split(":")[1].strip()) + 273.15, 5), "unit": "K"}
+            return self.parse_temperature(arduino_result)
+
+    @staticmethod
+    def parse_temperature(result_txt: str):
+        """
+        Parses an Arduino temperature response (e.g., "T1 success: 22.00", in Celsius).
+
+        Args:
+            result_txt (str): The final Arduino response line.
+
+        Returns:
+            dict: A dictionary with the temperature value in Kelvin and its unit.
+        """
+        return {"value": sig_figs(float(result_txt.split(":")[-1].strip()) + 273.15, 5), "unit": "K"}
+
+
+class TemperatureSampler:
+    """
+    Background thread that polls a temperature probe at a fixed interval into a timestamped ring buffer, so the
+    temperature at a past collection time can be looked up without another Arduino round trip. The sampler polls
+    the Arduino port from the process that starts it; stop it when the job that needs it ends.
+    """
+
+    def __init__(self, station_id="temperature_01", interval: float = TEMPERATURE_SAMPLE_INTERVAL,
+                 buffer_size: int = TEMPERATURE_BUFFER_SIZE):
+        """
+        Initializes the TemperatureSampler.
+
+        Args:
+            station_id (str, optional): ID of the temperature station. Defaults to "temperature_01".
+            interval (float, optional): Seconds between samples. Defaults to TEMPERATURE_SAMPLE_INTERVAL.
+            buffer_size (int, optional): Number of samples kept. Defaults to TEMPERATURE_BUFFER_SIZE.
+        """
+        self.station_id = station_id
+        self.interval = interval
+        self.samples = deque(maxlen=buffer_size)  # (POSIX timestamp, temperature in K)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self):
+        """
+        Starts sampling if the sampler is not already running.
+
+        Returns:
+            TemperatureSampler: This sampler.
+        """
+        if not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="temperature-sampler")
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops sampling. Samples already taken are kept.
+        """
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval)
+            self._thread = None
+
+    def sample(self):
+        """
+        Reads the probe once and stores the reading.
+
+        Returns:
+            dict: The temperature reading (see `TemperatureStation.temperature`), or None if the read failed.
+        """
+        timestamp = time.time()
+        reading = TemperatureStation(self.station_id).temperature()
+        if reading:
+            with self._lock:
+                self.samples.append((timestamp, reading["value"]))
+        return reading
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"WARNING. Temperature sample failed: {e}")
+            self._stop.wait(self.interval)
+
+    def latest(self, max_age: float = None):
+        """
+        Gets the most recent sample.
+
+        Args:
+            max_age (float, optional): Maximum age of the sample in seconds. Defaults to twice the interval.
+
+        Returns:
+            dict: The temperature value in Kelvin and its unit, or None if there is no recent enough sample.
+        """
+        max_age = 2 * self.interval if max_age is None else max_age
+        with self._lock:
+            if not self.samples or time.time() - self.samples[-1][0] > max_age:
+                return None
+            return {"value": self.samples[-1][1], "unit": "K"}
+
+    def temperature_at(self, collection_time, max_gap: float = None):
+        """
+        Gets the temperature at a given time, interpolating linearly between the samples on either side of it.
+
+        Args:
+            collection_time (str or datetime or float): Time as an ISO-format string, a datetime, or a POSIX timestamp.
+            max_gap (float, optional): Maximum seconds between `collection_time` and the nearest sample when it lies
+                outside the sampled range. Defaults to twice the interval.
+
+        Returns:
+            dict: The temperature value in Kelvin and its unit, or None if the buffer does not cover the time.
+        """
+        if isinstance(collection_time, str):
+            collection_time = datetime.fromisoformat(collection_time)
+        if isinstance(collection_time, datetime):
+            collection_time = collection_time.timestamp()
+        max_gap = 2 * self.interval if max_gap is None else max_gap
+        with self._lock:
+            samples = list(self.samples)
+        if not samples:
+            return None
+        times, values = [t for t, _ in samples], [v for _, v in samples]
+        if not times[0] - max_gap <= collection_time <= times[-1] + max_gap:
+            return None
+        return {"value": sig_figs(float(np.interp(collection_time, times, values)), 5), "unit": "K"}
+
+
+_TEMPERATURE_SAMPLER = None
+
+
+def temperature_sampler(start=True):
+    """
+    Gets the process-wide temperature sampler, starting it if requested. Returns None if TEMPERATURE_SAMPLING is
+    off. A started sampler runs until its `stop` method is called.
+
+    Args:
+        start (bool, optional): Start the sampler thread if it is not running. Defaults to True.
+
+    Returns:
+        TemperatureSampler: The sampler, or None.
+    """
+    global _TEMPERATURE_SAMPLER
+    if not TEMPERATURE_SAMPLING:
+        return None
+    if _TEMPERATURE_SAMPLER is None:
+        _TEMPERATURE_SAMPLER = TemperatureSampler()
+    return _TEMPERATURE_SAMPLER.start() if start else _TEMPERATURE_SAMPLER
 
 
 class StirStation(StationStatus):
@@ -949,7 +1259,7 @@ class PotentiostatStation(StationStatus):
         Returns:
             pymongo.results.UpdateResult: Result of the update operation.
         """
-        return self.coll.update_one({"_id": self.id}, {"$set": {"current_experiment": experiment}})
+        return self.update_props(current_experiment=experiment)
 
     def initiate_pot(self, vial: VialMove or str = None):
         """
@@ -1036,7 +1346,7 @@ class PotentiostatStation(StationStatus):
             bool: True if the vial is successfully placed, False otherwise.
         """
         vial = vial if isinstance(vial, VialMove) else VialMove(vial)
-        if self.available:
+        if self.is_free():
             success = True
             if self.state == "up":
                 success &= self.move_elevator(endpoint="down")
@@ -1090,15 +1400,13 @@ class PotentiostatStation(StationStatus):
         Returns:
             list: A list of voltages converted to the specified unit.
         """
-        ureg = pint.UnitRegistry()
         voltages = voltage_sequence.split(',')
-        voltage_units = ureg(voltages[-1]).units
+        voltage_units = UREG(voltages[-1]).units
         print(voltage_units)
         for i, v in enumerate(voltages):
             v_unit = "{}{}".format(v, voltage_units) if v.replace(".", "").replace("-", "").strip(
                 " ").isnumeric() else v
-            v_unit = ureg(v_unit)
-            voltages[i] = v_unit.to(volt_unit).magnitude
+            voltages[i] = convert_quantity(v_unit, volt_unit)
 
         return voltages
 
@@ -1119,8 +1427,7 @@ class PotentiostatStation(StationStatus):
         voltages = self.generate_volts(voltage_sequence=voltage_sequence, volt_unit=volt_unit)
 
         # Get scan rate with appropriate units
-        ureg = pint.UnitRegistry()
-        scan_rate = ureg(scan_rate).to(scan_unit).magnitude
+        scan_rate = convert_quantity(scan_rate, scan_unit)
         return [dict(voltage=v, scan_rate=scan_rate) for v in voltages]
 
     @staticmethod
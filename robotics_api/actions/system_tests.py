@@ -49,26 +49,27 @@ def flush_solvent(volume, vial_id="S_01", solv_id="solvent_01", go_home=True):
 
 
 def density_test(volume, pipette_id="pipette_01", vial_id="S_01", return_mass=False):
-    bal_station = BalanceStation(StationStatus().get_first_available("balance"))
-    pipette_station = PipetteStation(pipette_id)
-    vial = VialMove(_id=vial_id)
-
-    # Get initial mass
-    initial_mass = bal_station.existing_weight(vial)
-    # Extract solution
-    pipette_station.pipette(volume=volume, vial=vial)
-    # Get final mass
-    final_mass = bal_station.weigh(vial)
-
-    # Calculate solution density
-    extracted_mass = initial_mass - final_mass
-    raw_density = f"{extracted_mass / volume} {MASS_UNIT}/{VOLUME_UNIT}"
-    soln_density = "{:.3f}{}".format(unit_conversion(raw_density, default_unit=DENSITY_UNIT), DENSITY_UNIT)
-    print(f"Raw Density: {extracted_mass:.3f} / {volume:.3f} {MASS_UNIT}/{VOLUME_UNIT}")
-    print(f"--> SOLUTION DENSITY: {soln_density} {DENSITY_UNIT}")
-
-    # Return extracted solution
-    pipette_station.return_soln(vial=vial)
+    with StationStatus().hold_station("balance") as bal_id:
+        bal_station = BalanceStation(bal_id)
+        pipette_station = PipetteStation(pipette_id)
+        vial = VialMove(_id=vial_id)
+
+        # Get initial mass
+        initial_mass = bal_station.existing_weight(vial)
+        # Extract solution
+        pipette_station.pipette(volume=volume, vial=vial)
+        # Get final mass
+        final_mass = bal_station.weigh(vial)
+
+        # Calculate solution density
+        extracted_mass = initial_mass - final_mass
+        raw_density = f"{extracted_mass / volume} {MASS_UNIT}/{VOLUME_UNIT}"
+        soln_density = "{:.3f}{}".format(unit_conversion(raw_density, default_unit=DENSITY_UNIT), DENSITY_UNIT)
+        print(f"Raw Density: {extracted_mass:.3f} / {volume:.3f} {MASS_UNIT}/{VOLUME_UNIT}")
+        print(f"--> SOLUTION DENSITY: {soln_density} {DENSITY_UNIT}")
+
+        # Return extracted solution
+        pipette_station.return_soln(vial=vial)
 
     return (extracted_mass / volume, extracted_mass) if return_mass else soln_density
 
@@ -140,6 +141,117 @@ def pipette_calibration(test_vols: list, expected_density: float,
     return correction_factor, result_df if return_dataframe else correction_factor
 
 
+def unit_conversion_test(n_repeats=1000):
+    # Check that the fast unit parser matches pint for common units and compare their speeds.
+    import math
+    import pint
+    ureg = pint.UnitRegistry()
+    conversions = [("0.5mL", "L"), ("20.04g", "mg"), ("0.4682 g", "g"), ("25mg", "kg"), ("1.5L", "mL"),
+                   ("0.01M", "mM"), ("250mM", "M"), ("0.8V", "mV"), ("-150mV", "V"), ("100mV/s", "V/s"),
+                   ("0.1V/s", "mV/s"), ("90s", "min"), ("2.5min", "s"), ("294.18K", "K"), ("0.786g/mL", "g/L"),
+                   ("786g/L", "g/mL"), ("1e-3L", "uL"), (".5 mL", "mL"), ("5uM", "M"), ("250ms", "s")]
+    for quantity, unit in conversions:
+        fast, expected = fast_convert(quantity, unit), ureg(quantity).to(unit).magnitude
+        if fast is None or not math.isclose(fast, expected, rel_tol=1e-12):
+            raise AssertionError(f"Fast conversion of {quantity} to {unit} gave {fast}; pint gave {expected}.")
+
+    start = time.perf_counter()
+    for _ in range(n_repeats):
+        [fast_convert(q, u) for q, u in conversions]
+    fast_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(max(n_repeats // 100, 1)):
+        [ureg(q).to(u).magnitude for q, u in conversions]
+    pint_time = (time.perf_counter() - start) * n_repeats / max(n_repeats // 100, 1)
+    per_call = 1e6 / (n_repeats * len(conversions))
+    print(f"All {len(conversions)} fast conversions match pint.")
+    print(f"Fast parser: {fast_time * per_call:.2f} us/conversion; pint: {pint_time * per_call:.2f} us/conversion.")
+
+
+def serial_simulator_test(n_commands=20, latency=0.05):
+    # Run Arduino commands and balance reads against the virtual serial devices and report throughput and timeouts.
+    from robotics_api.simulators import ArduinoSimulator, BalanceSimulator
+    from robotics_api.utils.arduino_client import send_arduino_cmds
+    with ArduinoSimulator(latency=latency, durations={"E": latency, "L": latency, "S": latency}) as arduino:
+        start = time.perf_counter()
+        results = [send_arduino_cmd("E1", i % 2, address=arduino.port) for i in range(n_commands)]
+        elapsed = time.perf_counter() - start
+        print(f"Arduino: {sum(results)}/{n_commands} commands succeeded, {elapsed / n_commands * 1000:.1f} ms/command.")
+    with ArduinoSimulator(temperature=23.4) as arduino:
+        response = send_arduino_cmd("T1", "", address=arduino.port, return_txt=True)
+        reading = TemperatureStation.parse_temperature(response)
+        assert reading == {"value": sig_figs(23.4 + 273.15, 5), "unit": "K"}, f"Temperature round trip gave {reading}"
+        print(f"Arduino: temperature round trip read {reading['value']} {reading['unit']}.")
+    with ArduinoSimulator(drop_rate=1) as arduino:
+        start = time.perf_counter()
+        try:
+            send_arduino_cmd("E1", 1, address=arduino.port, timeout=1)
+            raise AssertionError("Dropped Arduino command did not time out.")
+        except TimeoutError:
+            print(f"Arduino: dropped command timed out after {time.perf_counter() - start:.2f} s.")
+    with ArduinoSimulator(durations={"E": 1, "L": 1}) as arduino:
+        start = time.perf_counter()
+        results = send_arduino_cmds([("E1", 0), ("L2", 3000)], address=arduino.port, tagged=True)
+        print(f"Arduino: tagged concurrent commands {results} took {time.perf_counter() - start:.2f} s.")
+    with ArduinoSimulator(durations={"E": 1, "L": 1}) as arduino:
+        start = time.perf_counter()
+        results = send_arduino_cmds([("E1", 0), ("L2", 3000)], address=arduino.port, tagged=False)
+        assert arduino.commands == ["E1_0", "L2_3000"], f"Untagged commands were not serialized: {arduino.commands}"
+        print(f"Arduino: untagged serialized commands {results} took {time.perf_counter() - start:.2f} s.")
+    with BalanceSimulator(latency=latency, settle_time=0.5) as balance:
+        session = get_serial_session(balance.port, timeout=1)
+        balance.set_load(12.3456)
+        start = time.perf_counter()
+        response = session.command("S\n", timeout=10)
+        print(f"Balance: 'S' returned {response} in {time.perf_counter() - start:.2f} s.")
+        balance.set_load(20.5)
+        start = time.perf_counter()
+        with BalanceStream(session) as stream:
+            mass = stream.wait_stable(timeout=10)
+        print(f"Balance: streamed reading settled at {mass} g in {time.perf_counter() - start:.2f} s.")
+        session.close()
+
+
+def memory_db_test():
+    # Run the status update, station claim, and status transition paths against the in-memory database backend.
+    # Run with ROBOTICS_DB_BACKEND=memory so no MongoDB server is needed (or touched).
+    if DB_BACKEND != "memory":
+        raise EnvironmentError("memory_db_test must run with ROBOTICS_DB_BACKEND=memory.")
+    reset_station_db("memory_test")
+    reset_vial_db({"exp01": "A_01"}, "memory_test")
+    vial = VialMove(exp_name="exp01", wflow_name="memory_test")
+
+    # Status updates and journal history
+    vial.update_location("robot_grip")
+    vial.update_weight(1.5)
+    assert vial.current_location == "robot_grip" and vial.current_weight == 1.5, vial.document
+    assert vial.location_history[-1] == "home", vial.location_history  # previous locations
+
+    # Station claims: concurrent claims never share a station, and held claims survive emptying
+    balances = [s for s in STATIONS if s.startswith("balance")]
+    first = StationStatus().claim_station("balance", owner="worker_a", wait=False)
+    second = StationStatus().claim_station("balance", owner="worker_b", wait=False)
+    assert first and first != second and (second or len(balances) == 1), (first, second)
+    StationStatus(first).release(owner="worker_a")
+    if second:
+        StationStatus(second).release(owner="worker_b")
+    with StationStatus().hold_station("balance", owner="worker_a") as bal_id:
+        station = StationStatus(bal_id)
+        station.update_status(vial.id, "content")
+        station.empty()
+        assert not station.available and station.owner == "worker_a", station.document
+    assert StationStatus(bal_id).available, StationStatus(bal_id).document
+
+    # Status transitions: the vial and station change together
+    with StatusTransition() as transition:
+        transition.update_status(vial, bal_id, "location")
+        transition.update_status(StationStatus(bal_id), vial.id, "content")
+        transition.update_props(StationStatus(bal_id), available=False)
+    assert vial.current_location == bal_id and StationStatus(bal_id).current_content == vial.id
+    assert not StationStatus(bal_id).available
+    print("Memory database: status update, claim, and transition paths passed.")
+
+
 if __name__ == "__main__":
     """
     The code below contains test functions for all stations. To implement a test, uncomment the line with 
@@ -155,6 +267,11 @@ if __name__ == "__main__":
     test_pip = PipetteStation("pipette_01")
     test_stir = StirStation("stir_01")
 
+    # UNIT TESTING
+    # unit_conversion_test()
+    # serial_simulator_test()
+    # memory_db_test()
+
     # RESET TESTING
     # reset_test_db()
     # reset_stations(end_home=True)
@@ -61,6 +61,8 @@ class RoboticsBase(FiretaskBase):
         self.metadata = fw_spec.get("metadata", {})
         self.collection_data = fw_spec.get("collection_data", [])
         self.processing_data = fw_spec.get("processing_data", {})
+        RobotStatusDB.start_task()
+        REAGENT_REGISTRY.load(wflow_name=self.wflow_name)
 
         if get_exp_vial:
             self.exp_vial = VialMove(exp_name=self.exp_name, wflow_name=self.wflow_name)
@@ -167,8 +169,8 @@ class Stir(RoboticsBase):
         stir_time = self.get("time")
 
         if stir_time:
-            stir_station = StirStation(StationStatus().get_first_available("stir"))
-            self.success &= stir_station.stir_vial(self.exp_vial, stir_time=stir_time)
+            with StationStatus().hold_station("stir") as stir_id:
+                self.success &= StirStation(stir_id).stir_vial(self.exp_vial, stir_time=stir_time)
         else:
             print(f"WARNING. HEAT_STIR action skipped because stir time was {stir_time}.")
 
@@ -182,7 +184,8 @@ class CollectTemp(RoboticsBase):
         self.setup_task(fw_spec)
 
         # Collect temperature
-        temperature = TemperatureStation().temperature()
+        sampler = temperature_sampler(start=False)
+        temperature = (sampler and sampler.running and sampler.latest()) or TemperatureStation().temperature()
         print("RECORDED TEMPERATURE: ", temperature)
 
         self.metadata.update({"temperature": temperature})
@@ -198,29 +201,29 @@ class MeasureDensity(RoboticsBase):
         volume = self.get("volume", 0)
         volume = unit_conversion(volume, default_unit=VOLUME_UNIT)
 
-        bal_station = BalanceStation(StationStatus().get_first_available("balance"))
-        pipette_station = PipetteStation(StationStatus().get_first_available("pipette"))
-        # Get initial mass
-        initial_mass = bal_station.existing_weight(self.exp_vial)
-        # Extract solution
-        pipette_station.pipette(volume=volume, vial=self.exp_vial)
-        # Get final mass
-        final_mass = bal_station.weigh(self.exp_vial)
-
-        # Calculate solution density
-        extracted_mass = initial_mass - final_mass
-        raw_density = f"{extracted_mass / volume} {MASS_UNIT}/{VOLUME_UNIT}"
-        soln_density = "{:.3f}{}".format(unit_conversion(raw_density, default_unit=DENSITY_UNIT), DENSITY_UNIT)
-        print(f"Raw Density: {extracted_mass:.3f} / {volume:.3f} {MASS_UNIT}/{VOLUME_UNIT}")
-        print("--> SOLUTION DENSITY: ", soln_density)
-        self.metadata.update({"soln_density": soln_density})
-
-        # Return extracted solution
-        if DISCARD_DENSITY_SOLN:
-            pipette_station.discard_soln()
-            self.exp_vial.extract_soln(extracted_mass=extracted_mass)
-        else:
-            pipette_station.return_soln(vial=self.exp_vial)
+        with StationStatus().hold_station("balance") as bal_id, StationStatus().hold_station("pipette") as pip_id:
+            bal_station, pipette_station = BalanceStation(bal_id), PipetteStation(pip_id)
+            # Get initial mass
+            initial_mass = bal_station.existing_weight(self.exp_vial)
+            # Extract solution
+            pipette_station.pipette(volume=volume, vial=self.exp_vial)
+            # Get final mass
+            final_mass = bal_station.weigh(self.exp_vial)
+
+            # Calculate solution density
+            extracted_mass = initial_mass - final_mass
+            raw_density = f"{extracted_mass / volume} {MASS_UNIT}/{VOLUME_UNIT}"
+            soln_density = "{:.3f}{}".format(unit_conversion(raw_density, default_unit=DENSITY_UNIT), DENSITY_UNIT)
+            print(f"Raw Density: {extracted_mass:.3f} / {volume:.3f} {MASS_UNIT}/{VOLUME_UNIT}")
+            print("--> SOLUTION DENSITY: ", soln_density)
+            self.metadata.update({"soln_density": soln_density})
+
+            # Return extracted solution
+            if DISCARD_DENSITY_SOLN:
+                pipette_station.discard_soln()
+                self.exp_vial.extract_soln(extracted_mass=extracted_mass)
+            else:
+                pipette_station.return_soln(vial=self.exp_vial)
 
         return FWAction(update_spec=self.updated_specs())
 
@@ -236,24 +239,25 @@ class Extract(RoboticsBase):
         if self.exp_vial.check_addition_id(self.ftask_id):  # Check if addition has already been made
 
             # Establish stations
-            bal_station = BalanceStation(StationStatus().get_first_available("balance"))
-            pipette_station = PipetteStation(StationStatus().get_first_available("pipette"))
-
-            # Extract solution
-            initial_mass = bal_station.existing_weight(self.exp_vial)
-            while volume > 0:
-                pipette_volume = MAX_PIPETTE_VOL if volume > MAX_PIPETTE_VOL else volume
-                print("PIPETTING VOLUME ", pipette_volume)
-                pipette_station.pipette(volume=pipette_volume, vial=self.exp_vial)  # Extract pipette volume
-                pipette_station.discard_soln()  # Discard the extracted volume
-                volume -= pipette_volume
-
-            # Find extracted mass
-            final_mass = bal_station.weigh(self.exp_vial)
-            extracted_mass = initial_mass - final_mass
-
-            # Update vial contents
-            self.exp_vial.extract_soln(extracted_mass=extracted_mass)
+            with StationStatus().hold_station("balance") as bal_id, \
+                    StationStatus().hold_station("pipette") as pip_id:
+                bal_station, pipette_station = BalanceStation(bal_id), PipetteStation(pip_id)
+
+                # Extract solution
+                initial_mass = bal_station.existing_weight(self.exp_vial)
+                while volume > 0:
+                    pipette_volume = MAX_PIPETTE_VOL if volume > MAX_PIPETTE_VOL else volume
+                    print("PIPETTING VOLUME ", pipette_volume)
+                    pipette_station.pipette(volume=pipette_volume, vial=self.exp_vial)  # Extract pipette volume
+                    pipette_station.discard_soln()  # Discard the extracted volume
+                    volume -= pipette_volume
+
+                # Find extracted mass
+                final_mass = bal_station.weigh(self.exp_vial)
+                extracted_mass = initial_mass - final_mass
+
+                # Update vial contents
+                self.exp_vial.extract_soln(extracted_mass=extracted_mass)
 
         return FWAction(update_spec=self.updated_specs())
 
@@ -261,7 +265,9 @@ class Extract(RoboticsBase):
 @explicit_serialize
 class SetupRinsePotentiostat(RoboticsBase):
     """FireTask for setting up the electrode rinse action by moving the correct
-    vial to the potentiostat elevator"""
+    vial to the potentiostat elevator. The potentiostat claim is handed off to RinseElectrode with the vial on
+    the elevator and is released when the rinse vial is retrieved (`StationStatus.empty`). If the vial is not
+    placed, the claim is released before the task ends."""
 
     def run_task(self, fw_spec):
         self.setup_task(fw_spec)
@@ -270,11 +276,17 @@ class SetupRinsePotentiostat(RoboticsBase):
         action_vial = VialMove(_id=RINSE_VIALS.get(potentiostat.id))
 
         # If potentiostat not available, return current vial home and fizzle.
-        if not potentiostat.wait_till_available():
+        if not potentiostat.claim():
             warnings.warn(f"Station {potentiostat} not available. Fizzling rinse.")
             return self.self_fizzle()
 
-        self.success &= potentiostat.place_vial(action_vial)
+        placed = False
+        try:
+            placed = bool(potentiostat.place_vial(action_vial))
+        finally:
+            if not placed:
+                potentiostat.release()
+        self.success &= placed
         self.metadata.update({"active_vial_id": action_vial.id})
 
         return FWAction(update_spec=self.updated_specs())
@@ -311,7 +323,9 @@ class CleanElectrode(RoboticsBase):
 @add_metaclass(abc.ABCMeta)
 class SetupPotentiostat(RoboticsBase):
     """Base FireTask for setting up a potentiostat action by moving the correct
-    vial to the potentiostat elevator"""
+    vial to the potentiostat elevator. The potentiostat claim is handed off to the measurement tasks with the vial
+    on the elevator and is released when the vial is retrieved from the potentiostat (`StationStatus.empty`). If
+    the vial is not placed, the claim is released before the task ends."""
     method: str
 
     def run_task(self, fw_spec):
@@ -335,23 +349,31 @@ class SetupPotentiostat(RoboticsBase):
                     print(f"WARNING. Potentiostat {potentiostat} is not clean.")
                     return self.self_fizzle()
 
-                # Wait till potentiostat is available
-                self.success = potentiostat.wait_till_available()
+                # Wait till potentiostat is available and claim it
+                self.success = potentiostat.claim()
                 print("WAITING ", self.success)
                 if not self.success:
                     return self.self_fizzle()
             else:
-                available_pot = StationStatus().get_first_available(pot_type, check_clean=CHECK_CLEAN_ELECTRODES)
+                available_pot = StationStatus().claim_station(pot_type, check_clean=CHECK_CLEAN_ELECTRODES)
                 potentiostat = PotentiostatStation(available_pot) if available_pot else None
 
             print("SUCCESS, POTENT: ", self.success, potentiostat)
             # If potentiostat not available, return current vial home and fizzle.
             if not (self.success and potentiostat):
                 warnings.warn(f"Station {potentiostat} not available. Moving vial {self.exp_vial} back home.")
+                if potentiostat:
+                    potentiostat.release()
                 self.exp_vial.place_home()
                 return self.self_fizzle()
-            potentiostat.update_experiment(self.exp_name)
-            self.success &= potentiostat.place_vial(self.exp_vial)
+            placed = False
+            try:
+                potentiostat.update_experiment(self.exp_name)
+                placed = bool(potentiostat.place_vial(self.exp_vial))
+            finally:
+                if not placed:
+                    potentiostat.release()
+            self.success &= placed
         print("POTENTIOSTAT: ", potentiostat)
 
         # Setup metadata
@@ -531,13 +553,19 @@ class RunCA(RoboticsBase):
 
         # Run CA experiment
         potent = CAPotentiostatStation(self.metadata.get("ca_potentiostat"))
-        potent.initiate_pot(vial=self.metadata.get("active_vial_id"))
-        collection_time = str(datetime.now())
-        self.success &= potent.run_ca(data_path=data_path, voltage_sequence=voltage_sequence, si=sample_interval,
-                                      pw=pulse_width, sens=sens, steps=steps)
-        # [os.remove(os.path.join(data_dir, f)) for f in os.listdir(data_dir) if f.endswith(".bin")]
-
-        temperature = TemperatureStation().temperature() or self.metadata.get("temperature")
+        sampler = temperature_sampler()
+        try:
+            potent.initiate_pot(vial=self.metadata.get("active_vial_id"))
+            collection_time = str(datetime.now())
+            self.success &= potent.run_ca(data_path=data_path, voltage_sequence=voltage_sequence, si=sample_interval,
+                                          pw=pulse_width, sens=sens, steps=steps)
+            # [os.remove(os.path.join(data_dir, f)) for f in os.listdir(data_dir) if f.endswith(".bin")]
+        finally:
+            if sampler:
+                sampler.stop()  # release the Arduino port for the robot worker
+
+        temperature = ((sampler and sampler.temperature_at(collection_time)) or TemperatureStation().temperature()
+                       or self.metadata.get("temperature"))
         print("RECORDED TEMPERATURE: ", temperature)
 
         self.metadata.update({"ca_idx": ca_idx + 1, "temperature": temperature})
@@ -7,11 +7,11 @@ from atomate.utils.utils import env_chk
 from d3tales_api.Calculators.calculators import *
 from d3tales_api.D3database.back2front import CV2Front
 from fireworks import FiretaskBase, explicit_serialize, FWAction
-from kortex_api.autogen.client_stubs.BaseCyclicClientRpc import BaseCyclicClient
 from robotics_api.actions.system_tests import reset_stations
 from robotics_api.actions.standard_actions import *
 from robotics_api.utils.processing_utils import *
-from robotics_api.utils.kinova_utils import DeviceConnection
+from robotics_api.utils.kinova_utils import robot_session
+from robotics_api.utils.snapshot_library import snapshot_library
 from robotics_api.fireworks.Firetasks_Actions import RoboticsBase
 
 # Copyright 2024, University of Kentucky
@@ -33,10 +33,10 @@ class InitializeRobot(FiretaskBase):
 
         # Create connection to the device and get the router
         if RUN_ROBOT:
-            connector = Namespace(ip=KINOVA_01_IP, username="admin", password="admin")
-            with DeviceConnection.createTcpConnection(connector) as router:
-                BaseClient(router)
-                BaseCyclicClient(router)
+            # Parse and check every snapshot before the first motion
+            snapshot_library(reload=True)
+            with robot_session() as session:
+                session.connect_real_time()
 
             snapshot_move(SNAPSHOT_HOME)
 
@@ -66,6 +66,7 @@ class InitializeStatusDB(FiretaskBase):
         print("REAGENTS: ", reagents)
         print("EXPS: ", experiments)
         # Setup standard_data databases
+        ensure_status_indexes()
         reset_reagent_db(reagents, current_wflow_name=wflow_name)
         reset_vial_db(experiments, current_wflow_name=wflow_name)
         reset_station_db(current_wflow_name=wflow_name)
@@ -174,15 +175,13 @@ class ProcessBase(RoboticsBase, ABC):
             dict: A dictionary with concentration information, including redox molecule and electrolyte concentrations
             and mole fractions.
         """
+        comp = solution_composition(vial_contents, self.solv_id, soln_density=soln_density)
+        kwargs = dict(solv_id=self.solv_id, soln_density=soln_density, composition=comp)
         return {
-            "redox_mol_concentration": get_concentration(vial_contents, solute_id=self.rom_id, solv_id=self.solv_id,
-                                                         soln_density=soln_density),
-            "electrolyte_concentration": get_concentration(vial_contents, self.elect_id, self.solv_id,
-                                                           soln_density=soln_density),
-            "redox_mol_fraction": get_concentration(vial_contents, solute_id=self.rom_id, solv_id=self.solv_id,
-                                                    soln_density=soln_density, mol_fraction=True),
-            "electrolyte_mol_fraction": get_concentration(vial_contents, self.elect_id, self.solv_id,
-                                                          soln_density=soln_density, mol_fraction=True),
+            "redox_mol_concentration": get_concentration(vial_contents, self.rom_id, **kwargs),
+            "electrolyte_concentration": get_concentration(vial_contents, self.elect_id, **kwargs),
+            "redox_mol_fraction": get_concentration(vial_contents, self.rom_id, mol_fraction=True, **kwargs),
+            "electrolyte_mol_fraction": get_concentration(vial_contents, self.elect_id, mol_fraction=True, **kwargs),
         }
 
     def check_file(self, file_loc):
@@ -217,7 +216,7 @@ class ProcessBase(RoboticsBase, ABC):
         ume = self.instrument.micro_electrode
         if not self.check_file(file_loc):
             return None
-        e_ref = ReagentStatus(_id=self.rom_id).formal_potential
+        e_ref = REAGENT_REGISTRY.formal_potential(self.rom_id)
         if self.mol_id and e_ref is None:
             raise KeyError(f"No formal potential exists in the reagents database for {self.mol_id}")
         self.metadata.update({"e_ref": e_ref})
@@ -402,7 +401,7 @@ class ProcessCalibration(ProcessBase):
                 "date_updated": datetime.now().strftime('%Y_%m_%d'),  # Day
                 "cond_measured": p_data.get("data", {}).get("measured_conductance"),
                 "res_measured": p_data.get("data", {}).get("measured_resistance"),
-                "temperature": self.metadata.get("temperature"),
+                "temperature": d.get("temperature") or self.metadata.get("temperature"),
             }
             if KCL_CALIB:
                 calib_instance.update({"cell_constant": kcl_cell_constant(calib_instance.get("cond_measured"),
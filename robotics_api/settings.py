@@ -29,7 +29,21 @@ FIZZLE_DIRTY_ELECTRODE = True  # FIZZLE a blank scan instrument job if the blank
 EXIT_ZERO_VOLUME = True  # If a liquid dispense job adds 0 mL, exit experiment by skipping all children Fireworks
 WAIT_FOR_BALANCE = True  # If balance connection fails, wait and try again
 MAX_DB_WAIT_TIME = 10  # Maximum seconds to wait for database response
+STATUS_HISTORY_CAP = None  # Maximum journal events kept per status document and field (None keeps all events)
+STATION_LEASE_TIME = 600  # Seconds a claimed station stays reserved before an empty station may be reclaimed
+DB_BACKEND = os.environ.get("ROBOTICS_DB_BACKEND", "mongo")  # Status DB backend: "mongo" or "memory" (not persisted)
+SCHEMA_OFFLINE = False  # Never download D3TaLES schemas; use only the schema cache and bundled schemas
+STATUS_CHANGE_STREAMS = True  # Wake station waiters with MongoDB change streams (requires a replica set)
+STATUS_SIGNAL_INTERVAL = 0.05  # Seconds between checks of local status signal files while waiting
 MAX_BALANCE_READS = 5  # Maximum number of times to attempt to read the balance.
+BALANCE_STREAMING = False  # Weigh from the balance continuous-send (SIR) stream, returning once the reading settles
+BALANCE_STABILITY_WINDOW = 1.0  # Seconds of streamed readings that must agree before a weight is accepted
+BALANCE_STABILITY_TOLERANCE = 0.0002  # Maximum spread (g) of streamed readings within the stability window
+BALANCE_STREAM_TIMEOUT = 30  # Maximum seconds to wait for a streamed reading to settle before falling back to "S" reads
+BALANCE_STREAM_BUFFER = 200  # Number of streamed readings kept in the ring buffer
+TEMPERATURE_SAMPLING = False  # Poll the temperature probe in the background during CA jobs (uses ARDUINO_PORT)
+TEMPERATURE_SAMPLE_INTERVAL = 10  # Seconds between background temperature samples
+TEMPERATURE_BUFFER_SIZE = 720  # Number of temperature samples kept (2 hours at the default interval)
 MAX_PIPETTE_VOL = 0.6  # Maximum volume in mL the pipette can extract
 PIPETTE_CORR_FACTOR = 1.019  # Pipette volume factor
 DISCARD_DENSITY_SOLN = True  # Discard solution extracted for density measurement if True
@@ -48,6 +62,9 @@ CONCENTRATION_UNIT = "M"
 
 # ---------  ROBOT SETTINGS -------------
 KINOVA_01_IP = "192.168.1.10"
+KINOVA_SESSION_TIMEOUT = 60000  # Milliseconds an idle robot session stays logged in
+KINOVA_CONNECTION_TIMEOUT = 60000  # Milliseconds an idle robot connection stays open
+KINOVA_HEALTH_CHECK_IDLE = 5  # Seconds of robot session inactivity after which the session is checked before use
 VIAL_GRIP_TARGET = 60
 OPEN_GRIP_TARGET = 40
 PERTURB_AMOUNT = 0.07
@@ -169,8 +186,16 @@ SOLVENT_DENSITIES = {  # Formal potentials
 }
 
 # ---------  PORT ADDRESS -------------
-ARDUINO_PORT = "COM4"
-BALANCE_PORT = "COM5"
+ARDUINO_PORT = os.environ.get("ROBOTICS_ARDUINO_PORT", "COM4")  # Set to a simulator port (see robotics_api.simulators)
+BALANCE_PORT = os.environ.get("ROBOTICS_BALANCE_PORT", "COM5")
+SERIAL_SETTLE_TIME = 1  # Seconds to let a serial port settle after opening it (paid once per connection)
+SERIAL_RECONNECT_WAIT = 20  # Seconds to wait before retrying a serial port that failed to open
+SERIAL_RECONNECT_ATTEMPTS = 1  # Number of times to retry opening a serial port
+SERIAL_LOG_INTERVAL = 5  # Minimum seconds between "waiting for results" messages while waiting on a serial device
+SERIAL_LINE_TIMEOUT = 0.5  # Quiet seconds after which a serial response without a line terminator is delivered
+SERIAL_IDLE_CLOSE = 300  # Seconds without use before a serial port is closed for other processes (None keeps it open)
+ARDUINO_CMD_TIMEOUT = None  # Maximum seconds to wait for an Arduino command response (None waits indefinitely)
+ARDUINO_TAGGED_PROTOCOL = False  # Firmware echoes request IDs (see Arduino protocol docs); allows concurrent commands
 
 # ---------  STATIONS -------------
 DISPENSE_STATIONS = ["solvent_01", "solvent_02", "solvent_03", "solvent_04"]
@@ -196,6 +221,9 @@ LAUNCH_DIR = PARENT_DIR / 'launch_dir'
 TEST_DATA_DIR = HOME_DIR / "test_data"
 ROBOTICS_API = HOME_DIR / "robotics_api"
 DB_INFO_FILE = HOME_DIR / 'db_infos.json'
+SCHEMA_CACHE_DIR = PARENT_DIR / "schema_cache"  # Downloaded D3TaLES schemas, by version
+SCHEMA_BUNDLE_DIR = ROBOTICS_API / "schemas"  # Optional bundled D3TaLES schema snapshot, by version
+STATUS_NOTIFY_DIR = PARENT_DIR / "status_signals"  # Signal files for status waiters on this machine
 
 SNAPSHOT_DIR = ROBOTICS_API / "snapshots"
 SNAPSHOT_HOME = SNAPSHOT_DIR / "home.json"
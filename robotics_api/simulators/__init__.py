@@ -0,0 +1,10 @@
+"""
+Virtual serial devices for exercising the robotics serial layer without hardware.
+
+The simulators create pseudo-terminals (Linux/macOS only) that behave like the station Arduino and the balance. Point
+a port setting (or the `address` argument of the serial functions) at a simulator's `port` to use it.
+"""
+
+from robotics_api.simulators.base import PtyDevice
+from robotics_api.simulators.arduino import ArduinoSimulator
+from robotics_api.simulators.balance import BalanceSimulator
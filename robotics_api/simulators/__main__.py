@@ -0,0 +1,19 @@
+"""
+Run the Arduino and balance simulators until interrupted.
+
+    python -m robotics_api.simulators
+
+Set the printed ports in ROBOTICS_ARDUINO_PORT and ROBOTICS_BALANCE_PORT before starting a robotics process.
+"""
+import time
+from robotics_api.simulators import ArduinoSimulator, BalanceSimulator
+
+if __name__ == "__main__":
+    with ArduinoSimulator() as arduino, BalanceSimulator() as balance:
+        print(f"ROBOTICS_ARDUINO_PORT={arduino.port}")
+        print(f"ROBOTICS_BALANCE_PORT={balance.port}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,92 @@
+import re
+import threading
+from robotics_api.simulators.base import PtyDevice
+
+COMMAND_RE = re.compile(r"^(?:#(?P<id>\d+):)?(?P<station>[A-Z]\d)_(?P<arg>.*)$")
+
+
+class ArduinoSimulator(PtyDevice):
+    """
+    Virtual station Arduino. Accepts the legacy protocol (e.g., `E1_0`, `P1_500`, `L2_3000`, `T1_`, `ABORT_E1`)
+    and the tagged protocol (e.g., `#12:E1_0`). Each command answers with a progress line and then a `success` or
+    `failure` line after the station's duration.
+    """
+
+    DURATIONS = {"E": 0.5, "P": 0.5, "L": 0.5, "S": 0.1, "T": 0.05}  # station prefix --> seconds per command
+
+    def __init__(self, durations: dict = None, volume_rate: float = None, failure_rate: float = 0.0,
+                 fail_stations: list = None, temperature: float = 22.0, **kwargs):
+        """
+        Initializes the ArduinoSimulator.
+
+        Args:
+            durations (dict, optional): Station prefix --> seconds each command takes. Defaults to DURATIONS.
+            volume_rate (float, optional): µL per second for pipette and dispense commands. If given, their
+                duration is proportional to the volume. Defaults to None.
+            failure_rate (float, optional): Probability that a command answers `failure`. Defaults to 0.
+            fail_stations (list, optional): Stations (e.g., ["E2"]) whose commands always fail. Defaults to None.
+            temperature (float, optional): Temperature (°C) reported by `T` stations. Defaults to 22.
+            **kwargs: PtyDevice keyword arguments (latency, jitter, drop_rate, frame_gap, seed).
+        """
+        super().__init__(**kwargs)
+        self.durations = {**self.DURATIONS, **(durations or {})}
+        self.volume_rate = volume_rate
+        self.failure_rate = failure_rate
+        self.fail_stations = set(fail_stations or [])
+        self.temperature = temperature
+        self.state = {}  # station --> last argument (elevators, stir) or total volume in µL (dispense, pipette)
+        self._busy = {}  # station --> threading.Event that aborts the running command
+
+    def duration(self, station: str, arg: str):
+        seconds = self.durations.get(station[0], 0.1)
+        if self.volume_rate and station[0] in ("L", "P"):
+            try:
+                seconds += float(arg) / self.volume_rate
+            except ValueError:
+                pass
+        return self.delay(seconds)
+
+    def handle(self, command: str):
+        if command.startswith("ABORT_"):
+            station = command[len("ABORT_"):]
+            abort = self._busy.get(station)
+            if abort:
+                abort.set()
+            self.reply([f"{station} aborted"], delay=self.delay())
+            return
+        match = COMMAND_RE.match(command)
+        if not match:
+            self.reply([f"unknown command {command} failure"], delay=self.delay())
+            return
+        request_id, station, arg = match.group("id"), match.group("station"), match.group("arg")
+        tag = f"#{request_id}:" if request_id else ""
+        if station in self._busy:
+            self.reply([f"{tag}{station} busy failure"], delay=self.delay())
+            return
+        if self.dropped():
+            return
+        abort = threading.Event()
+        self._busy[station] = abort
+        threading.Thread(target=self._run, args=(tag, station, arg, abort), daemon=True).start()
+
+    def _run(self, tag, station, arg, abort):
+        try:
+            self.write_line(f"{tag}{station} running {arg}")
+            if abort.wait(self.duration(station, arg)) or not self._running:
+                self.write_line(f"{tag}{station} aborted failure")
+                return
+            failed = station in self.fail_stations or (self.failure_rate and self.random.random() < self.failure_rate)
+            if failed:
+                self.write_line(f"{tag}{station} failure")
+                return
+            if station[0] in ("L", "P"):
+                try:
+                    self.state[station] = self.state.get(station, 0) + float(arg)
+                except ValueError:
+                    pass
+            elif station[0] != "T":
+                self.state[station] = arg
+            result = f"{station} success: {self.temperature:.2f}" if station[0] == "T" else f"{station} success"
+            self.write_line(tag + result)
+        finally:
+            self._busy.pop(station, None)
@@ -0,0 +1,110 @@
+import math
+import time
+import threading
+from robotics_api.simulators.base import PtyDevice
+
+
+class BalanceSimulator(PtyDevice):
+    """
+    Virtual balance speaking the MT-SICS subset used by BalanceStation: `S` (stable weight), `SI` (immediate
+    weight), `T` (tare), `SIR` (continuous weight stream) and `@` (reset, which also clears the tare). `S`, `SI` and
+    `@` end a running stream. After `set_load`, the reading settles exponentially toward the new
+    load with optional noise, and it reports dynamic (`D`) until it is within the stability threshold.
+    """
+
+    def __init__(self, settle_time: float = 1.0, noise: float = 0.00002, stable_threshold: float = 0.0001,
+                 stream_interval: float = 0.1, unstable_rate: float = 0.0, s_timeout: float = 5.0, **kwargs):
+        """
+        Initializes the BalanceSimulator.
+
+        Args:
+            settle_time (float, optional): Time constant (seconds) for the reading to settle after a load change.
+                Defaults to 1.
+            noise (float, optional): Amplitude (g) of random reading noise. Defaults to 0.00002.
+            stable_threshold (float, optional): Distance (g) from the load below which readings are stable.
+                Defaults to 0.0001.
+            stream_interval (float, optional): Seconds between streamed readings. Defaults to 0.1.
+            unstable_rate (float, optional): Probability that an `S` command answers `S I` (not executable).
+                Defaults to 0.
+            s_timeout (float, optional): Maximum seconds an `S` command waits for stability. Defaults to 5.
+            **kwargs: PtyDevice keyword arguments (latency, jitter, drop_rate, frame_gap, seed).
+        """
+        super().__init__(**kwargs)
+        self.settle_time = settle_time
+        self.noise = noise
+        self.stable_threshold = stable_threshold
+        self.stream_interval = stream_interval
+        self.unstable_rate = unstable_rate
+        self.s_timeout = s_timeout
+        self.load = 0.0
+        self.tare_mass = 0.0
+        self._start_load = 0.0
+        self._load_time = time.monotonic()
+        self._streaming = threading.Event()
+
+    def set_load(self, mass: float):
+        """
+        Changes the mass on the pan (g). The reading settles toward it over `settle_time`.
+        """
+        self._start_load = self._raw()
+        self.load = mass
+        self._load_time = time.monotonic()
+
+    def _raw(self):
+        elapsed = time.monotonic() - self._load_time
+        decay = math.exp(-elapsed / self.settle_time) if self.settle_time else 0
+        return self.load + (self._start_load - self.load) * decay
+
+    def reading(self):
+        """
+        Returns the current reading and whether it is stable.
+
+        Returns:
+            tuple: (net mass in g, stable)
+        """
+        raw = self._raw()
+        stable = abs(raw - self.load) <= self.stable_threshold
+        noisy = raw + (self.random.uniform(-self.noise, self.noise) if self.noise else 0)
+        return round(noisy - self.tare_mass, 4), stable
+
+    def _weight_line(self, prefix="S"):
+        mass, stable = self.reading()
+        return f"{prefix} {'S' if stable else 'D'} {mass:>10.4f} g"
+
+    def _stream(self):
+        while self._streaming.is_set() and self._running:
+            self.write_line(self._weight_line())
+            time.sleep(self.stream_interval)
+
+    def _stable_weight(self):
+        deadline = time.monotonic() + self.s_timeout
+        while time.monotonic() < deadline and not self.reading()[1]:
+            time.sleep(0.05)
+        self.write_line(self._weight_line() if self.reading()[1] else "S I")
+
+    def handle(self, command: str):
+        if command == "@":
+            self._streaming.clear()
+            self.tare_mass = 0.0
+            self.reply(['I4 A "SIMULATOR"'], delay=self.delay())
+            return
+        if self.dropped():
+            return
+        if command in ("S", "SI"):
+            self._streaming.clear()
+        if command == "SIR":
+            if not self._streaming.is_set():
+                self._streaming.set()
+                threading.Thread(target=self._stream, daemon=True).start()
+        elif command == "SI":
+            self.reply([self._weight_line()], delay=self.delay())
+        elif command == "S":
+            if self.unstable_rate and self.random.random() < self.unstable_rate:
+                self.reply(["S I"], delay=self.delay())
+            else:
+                threading.Timer(self.delay(), self._stable_weight).start()
+        elif command in ("T", "TI"):
+            self.tare_mass = self._raw()
+            self.reply([f"T S {self.tare_mass:>10.4f} g"], delay=self.delay())
+        else:
+            self.reply(["ES"], delay=self.delay())  # syntax error
@@ -0,0 +1,147 @@
+import os
+import pty
+import time
+import tty
+import random
+import select
+import threading
+
+
+class PtyDevice:
+    """
+    Base class for a virtual serial device on a pseudo-terminal. Subclasses implement `handle`, which receives each
+    command written by the host. Replies can be delayed and dropped to emulate slow or faulty hardware.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, drop_rate: float = 0.0, frame_gap: float = 0.05,
+                 seed: int = None):
+        """
+        Initializes the PtyDevice.
+
+        Args:
+            latency (float, optional): Seconds before each reply. Defaults to 0.
+            jitter (float, optional): Maximum random seconds added to each latency. Defaults to 0.
+            drop_rate (float, optional): Probability that a command gets no reply at all. Defaults to 0.
+            frame_gap (float, optional): Idle seconds that end a command written without a newline. Defaults to 0.05.
+            seed (int, optional): Random seed for jitter and failure injection. Defaults to None.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.frame_gap = frame_gap
+        self.random = random.Random(seed)
+        self.commands = []  # every command received, in order
+        self.port = None
+        self._master = None
+        self._slave = None
+        self._running = False
+        self._thread = None
+        self._write_lock = threading.Lock()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __str__(self):
+        return f"{type(self).__name__}({self.port})"
+
+    def start(self):
+        """
+        Creates the pseudo-terminal and starts handling commands.
+
+        Returns:
+            PtyDevice: This device, with `port` set to the pseudo-terminal path.
+        """
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True, name=f"sim-{type(self).__name__}")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops handling commands and closes the pseudo-terminal.
+        """
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=1)
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._master = self._slave = None
+
+    def _serve(self):
+        buffer = b""
+        last_data = time.monotonic()
+        while self._running:
+            ready, _, _ = select.select([self._master], [], [], self.frame_gap / 2)
+            if ready:
+                try:
+                    data = os.read(self._master, 1024)
+                except OSError:
+                    return
+                buffer += data
+                last_data = time.monotonic()
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    self._receive(line)
+            elif buffer and time.monotonic() - last_data >= self.frame_gap:
+                self._receive(buffer)  # commands written without a terminator end when the host goes quiet
+                buffer = b""
+
+    def _receive(self, data: bytes):
+        command = data.decode(errors="replace").strip()
+        if command:
+            self.commands.append(command)
+            self.handle(command)
+
+    def delay(self, extra: float = 0.0):
+        """
+        Returns the latency for one reply, including random jitter and `extra` seconds.
+        """
+        return self.latency + extra + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+
+    def dropped(self):
+        """
+        Returns True if this reply should be dropped (failure injection).
+        """
+        return self.drop_rate > 0 and self.random.random() < self.drop_rate
+
+    def write_line(self, text: str):
+        """
+        Writes one CRLF-terminated line to the host.
+        """
+        with self._write_lock:
+            if self._master is not None:
+                os.write(self._master, (text + "\r\n").encode())
+
+    def reply(self, lines: list, delay: float = 0.0):
+        """
+        Writes lines to the host after `delay` seconds without blocking command handling.
+
+        Args:
+            lines (list): Lines to write, or (seconds, line) tuples to space them out.
+            delay (float, optional): Seconds before the first line. Defaults to 0.
+        """
+        def _send():
+            time.sleep(delay)
+            for line in lines:
+                wait, line = line if isinstance(line, tuple) else (0, line)
+                time.sleep(wait)
+                if not self._running:
+                    return
+                self.write_line(line)
+        threading.Thread(target=_send, daemon=True).start()
+
+    def handle(self, command: str):
+        """
+        Handles one command from the host. Must be implemented by subclasses.
+        """
+        raise NotImplementedError
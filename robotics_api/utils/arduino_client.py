@@ -0,0 +1,222 @@
+import asyncio
+import itertools
+from robotics_api.settings import ARDUINO_PORT, ARDUINO_CMD_TIMEOUT, ARDUINO_TAGGED_PROTOCOL
+from robotics_api.utils.serial_utils import get_serial_session
+
+
+class ArduinoRequest:
+    """
+    One Arduino command waiting for its final response.
+    """
+
+    def __init__(self, request_id: int, station: str, command: str or float, future: asyncio.Future):
+        self.request_id = request_id
+        self.station = station
+        self.command = command
+        self.future = future
+        self.messages = []  # intermediate (non-final) response lines
+
+    def __str__(self):
+        return f"#{self.request_id}:{self.station}_{self.command}"
+
+
+class AsyncArduinoClient:
+    """
+    asyncio client for the station Arduino. Each command is tagged with a request ID and returns a future that
+    resolves when the matching "success" or "failure" line arrives, so commands for independent stations (e.g.,
+    lowering elevator E1 while dispensing from L2) can be in flight on the same port at once.
+
+    Untagged (legacy) frames have no terminator and responses carry no request ID, so with untagged firmware only
+    one command is in flight at a time: concurrent `send` calls wait their turn. See the Arduino protocol
+    documentation.
+
+    While a client is connected it owns reads on the port; send all commands for that port through it.
+    """
+
+    def __init__(self, address: str = ARDUINO_PORT, tagged: bool = ARDUINO_TAGGED_PROTOCOL, session=None):
+        """
+        Initializes the AsyncArduinoClient.
+
+        Args:
+            address (str, optional): Address of the Arduino port. Defaults to ARDUINO_PORT.
+            tagged (bool, optional): Whether the firmware echoes request IDs. Defaults to ARDUINO_TAGGED_PROTOCOL.
+            session (SerialSession, optional): Serial session to use. Defaults to the shared session for `address`.
+        """
+        self.address = address
+        self.tagged = tagged
+        self.session = session or get_serial_session(address, baudrate=115200, timeout=.1)
+        self._ids = itertools.count(1)
+        self._pending = {}  # request ID --> ArduinoRequest, in send order
+        self._legacy_lock = None  # asyncio.Lock serializing commands (untagged protocol only)
+        self._reader = None
+        self._closing = False
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def connect(self):
+        """
+        Opens the port and starts the response reader.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.session.open)
+        self._closing = False
+        self._reader = asyncio.create_task(self._read_loop())
+
+    async def close(self):
+        """
+        Stops the response reader and fails any commands still pending. The port itself stays open for reuse.
+        """
+        self._closing = True
+        if self._reader:
+            await self._reader
+            self._reader = None
+        for request in list(self._pending.values()):
+            if not request.future.done():
+                request.future.set_exception(ConnectionError(f"Arduino client closed before {request} finished."))
+        self._pending.clear()
+
+    async def _read_loop(self):
+        loop = asyncio.get_running_loop()
+        while not self._closing:
+            line = await loop.run_in_executor(None, self.session.readline)
+            if line:
+                self._dispatch(line)
+
+    @staticmethod
+    def parse_line(line: str):
+        """
+        Splits a response line into its request ID and text.
+
+        Args:
+            line (str): Response line (e.g., "#12:E1 success").
+
+        Returns:
+            tuple: (request ID or None if the line is untagged, response text)
+        """
+        if line.startswith("#") and ":" in line:
+            tag, text = line[1:].split(":", 1)
+            if tag.isdigit():
+                return int(tag), text.strip()
+        return None, line
+
+    def _match(self, request_id, text):
+        if self.tagged:
+            return self._pending.get(request_id) if request_id is not None else None
+        # Untagged commands are serialized, so any line belongs to the one pending command
+        return next(iter(self._pending.values()), None)
+
+    def _dispatch(self, line: str):
+        request_id, text = self.parse_line(line)
+        request = self._match(request_id, text)
+        if not request:
+            print(f"ARDUINO MESSAGE (no matching command): {line}")
+            return
+        print(f"ARDUINO RESULT {request}: {text}")
+        if "success" in text or "failure" in text:
+            self._pending.pop(request.request_id, None)
+            if not request.future.done():
+                request.future.set_result(text)
+        else:
+            request.messages.append(text)
+
+    def _frame(self, request_id: int, station: str, command: str or float):
+        cmd = f"{station}_{command}"
+        return f"#{request_id}:{cmd}\n" if self.tagged else cmd
+
+    async def _write(self, text: str):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.session.write, text)
+
+    async def send(self, station: str, command: str or float, return_txt: bool = False,
+                   timeout: float = ARDUINO_CMD_TIMEOUT):
+        """
+        Sends a command and waits for its final response.
+
+        Args:
+            station (str): The station identifier (e.g., "E1", "L2").
+            command (str or float): The command to send (e.g., "0", "3000").
+            return_txt (bool, optional): Whether to return the response text. Defaults to False.
+            timeout (float, optional): Maximum seconds to wait for the response. Defaults to ARDUINO_CMD_TIMEOUT.
+
+        Returns:
+            bool or str: True if the command succeeded, the response text if return_txt is True, otherwise False on
+                failure.
+
+        Raises:
+            TimeoutError: If no final response arrives before the timeout. The station is sent an abort command.
+        """
+        if not self._reader:
+            await self.connect()
+        if self.tagged:
+            return await self._send(station, command, return_txt, timeout)
+        if self._legacy_lock is None:
+            self._legacy_lock = asyncio.Lock()
+        async with self._legacy_lock:
+            return await self._send(station, command, return_txt, timeout)
+
+    async def _send(self, station, command, return_txt, timeout):
+        request = ArduinoRequest(next(self._ids), station, command, asyncio.get_running_loop().create_future())
+        self._pending[request.request_id] = request
+        await self._write(self._frame(request.request_id, station, command))
+        print("Command {} given to station {} at {} via Arduino.".format(command, station, self.address))
+        try:
+            result_txt = await asyncio.wait_for(request.future, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            self._pending.pop(request.request_id, None)
+            await self.abort(station)
+            if isinstance(e, asyncio.TimeoutError):
+                raise TimeoutError(f"Arduino station {station} did not respond to {request} after {timeout} s.")
+            raise
+        if "success" in result_txt:
+            return result_txt if return_txt else True
+        return False
+
+    async def abort(self, station: str):
+        """
+        Sends an abort command to a station. Aborts are not tagged and do not wait for a response.
+
+        Args:
+            station (str): The station identifier.
+        """
+        await self._write(f"ABORT_{station}\n" if self.tagged else f"ABORT_{station}")
+        print(f"Abort sent to Arduino station {station}.")
+
+    async def gather(self, commands: list, return_txt: bool = False, timeout: float = ARDUINO_CMD_TIMEOUT):
+        """
+        Sends several commands concurrently (one after another with untagged firmware).
+
+        Args:
+            commands (list): List of (station, command) tuples.
+            return_txt (bool, optional): Whether to return response texts. Defaults to False.
+            timeout (float, optional): Maximum seconds to wait for each response. Defaults to ARDUINO_CMD_TIMEOUT.
+
+        Returns:
+            list: Results in the order of `commands` (see `send`).
+        """
+        return await asyncio.gather(*[self.send(s, c, return_txt=return_txt, timeout=timeout) for s, c in commands])
+
+
+def send_arduino_cmds(commands: list, address: str = ARDUINO_PORT, return_txt: bool = False,
+                      timeout: float = ARDUINO_CMD_TIMEOUT, tagged: bool = ARDUINO_TAGGED_PROTOCOL):
+    """
+    Sends several Arduino commands concurrently from synchronous code.
+
+    Args:
+        commands (list): List of (station, command) tuples (e.g., [("E1", 0), ("L2", 3000)]).
+        address (str, optional): Address of the Arduino port. Defaults to ARDUINO_PORT.
+        return_txt (bool, optional): Whether to return response texts. Defaults to False.
+        timeout (float, optional): Maximum seconds to wait for each response. Defaults to ARDUINO_CMD_TIMEOUT.
+        tagged (bool, optional): Whether the firmware echoes request IDs. Defaults to ARDUINO_TAGGED_PROTOCOL.
+
+    Returns:
+        list: Results in the order of `commands` (see `AsyncArduinoClient.send`).
+    """
+    async def _run():
+        async with AsyncArduinoClient(address, tagged=tagged) as client:
+            return await client.gather(commands, return_txt=return_txt, timeout=timeout)
+    return asyncio.run(_run())
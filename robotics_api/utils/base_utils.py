@@ -1,7 +1,11 @@
+import re
 import pint
 import time
-import serial
+from functools import lru_cache
 from robotics_api.settings import *
+from robotics_api.utils.serial_utils import get_serial_session
+
+UREG = pint.UnitRegistry()  # Shared unit registry; quantities from different registries cannot be combined
 
 
 def sig_figs(number: float or str, num_sig_figs=5):
@@ -16,8 +20,7 @@ def sig_figs(number: float or str, num_sig_figs=5):
         float: The number rounded to the given significant figures.
     """
     if isinstance(number, str):
-        ureg = pint.UnitRegistry()
-        number = ureg(number).magnitude
+        number = UREG(number).magnitude
     if number == 0:
         return 0  # Zero remains zero regardless of sig figs
     if num_sig_figs <= 0:
@@ -35,6 +38,85 @@ def sig_figs(number: float or str, num_sig_figs=5):
     return float(f"{rounded:.{num_sig_figs - 1}e}")
 
 
+# Units handled without pint: unit --> (dimension, factor to the dimension's base unit)
+FAST_UNITS = {
+    "g": ("mass", 1), "mg": ("mass", 1e-3), "kg": ("mass", 1e3),
+    "L": ("volume", 1), "mL": ("volume", 1e-3), "uL": ("volume", 1e-6),
+    "M": ("concentration", 1), "mM": ("concentration", 1e-3), "uM": ("concentration", 1e-6),
+    "V": ("potential", 1), "mV": ("potential", 1e-3),
+    "V/s": ("scan_rate", 1), "mV/s": ("scan_rate", 1e-3),
+    "s": ("time", 1), "ms": ("time", 1e-3), "min": ("time", 60),
+    "K": ("temperature", 1),
+    "g/L": ("density", 1), "g/mL": ("density", 1e3), "kg/L": ("density", 1e3),
+}
+_QUANTITY_RE = re.compile(r"^\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*([A-Za-z/]*)\s*$")
+
+
+def fast_convert(quantity: str, unit: str):
+    """
+    Convert a "<number><unit>" string between units in FAST_UNITS without pint.
+
+    Args:
+        quantity (str): Measurement string (EX: "0.5mL").
+        unit (str): Unit to convert to.
+
+    Returns:
+        float: Magnitude of the converted measurement, or None if the string or units are not handled (i.e.,
+            pint is needed).
+    """
+    match = _QUANTITY_RE.match(quantity)
+    if not match:
+        return None
+    from_unit, to_unit = FAST_UNITS.get(match.group(2) or unit), FAST_UNITS.get(unit)
+    if not from_unit or not to_unit or from_unit[0] != to_unit[0]:
+        return None
+    value = float(match.group(1))
+    return value if from_unit[1] == to_unit[1] else value * from_unit[1] / to_unit[1]
+
+
+@lru_cache(maxsize=None)
+def density_context(density=None):
+    """
+    Get the name of a (cached) pint context for mass <--> volume conversions with a given density. Contexts are
+    created once per density and registered with the shared unit registry.
+
+    Args:
+        density (str, optional): Density (EX: "0.786g/mL"). Defaults to None (no mass <--> volume conversion).
+
+    Returns:
+        str: Name of the context.
+    """
+    name = "mol_density" if not density else "mol_density_{}".format(density)
+    c = pint.Context(name)
+    if density:
+        density_qty = UREG(density)
+        c.add_transformation('[mass]', '[volume]', lambda ureg_c, x: x / density_qty)
+        c.add_transformation('[volume]', '[mass]', lambda ureg_c, x: x * density_qty)
+    UREG.add_context(c)
+    return name
+
+
+@lru_cache(maxsize=4096)
+def convert_quantity(quantity: str, unit: str, density=None):
+    """
+    Convert a measurement string to a unit. Common units (FAST_UNITS) are converted directly; other units and
+    mass <--> volume conversions use the shared unit registry. Results are cached by (measurement string, unit,
+    density).
+
+    Args:
+        quantity (str): Measurement string (EX: "0.5mL").
+        unit (str): Unit to convert to.
+        density (str, optional): Density used for mass <--> volume conversions. Defaults to None.
+
+    Returns:
+        float: Magnitude of the converted measurement.
+    """
+    magnitude = fast_convert(quantity, unit) if isinstance(quantity, str) else None
+    if magnitude is not None:
+        return magnitude
+    return UREG(quantity).to(unit, density_context(density)).magnitude
+
+
 def unit_conversion(measurement, default_unit: str, density=None, return_dict=False):
     """
     Convert a measurement into a default unit using pint.
@@ -47,13 +129,6 @@ def unit_conversion(measurement, default_unit: str, density=None, return_dict=Fa
     """
     if measurement is None:
         return None
-    # Set context in case conversion include mass-->volume or volume-->mass
-    ureg = pint.UnitRegistry()
-    c = pint.Context('mol_density')
-    if density:
-        c.add_transformation('[mass]', '[volume]', lambda ureg_c, x: x / ureg_c(density))
-        c.add_transformation('[volume]', '[mass]', lambda ureg_c, x: x * ureg_c(density))
-    ureg.add_context(c)
     # Get measurement value and unit
     if not isinstance(measurement, (str, float, int, dict)):
         value, unit = getattr(measurement, "magnitude"), getattr(measurement, "units")
@@ -62,12 +137,15 @@ def unit_conversion(measurement, default_unit: str, density=None, return_dict=Fa
         unit = ""
         if isinstance(value, float) or str(value).replace('.', '', 1).replace('-', '', 1).isdigit():
             unit = measurement.get("unit", default_unit) if isinstance(measurement, dict) else default_unit
-    # Convert measurement to default unit
+    # Convert measurement to default unit (in case conversion include mass-->volume or volume-->mass, use density)
     unit = default_unit if unit == "dimensionless" else unit
-    pint_unit = ureg("{}{}".format(value, unit))
+    if unit == default_unit and isinstance(value, (float, int)):
+        return {"value": value, "unit": default_unit} if return_dict else value
+    density = str(density) if density else None
+    magnitude = convert_quantity("{}{}".format(value, unit), default_unit, density)
     if return_dict:
-        return {"value": pint_unit.to(default_unit, 'mol_density').magnitude, "unit": default_unit}
-    return pint_unit.to(default_unit, 'mol_density').magnitude
+        return {"value": magnitude, "unit": default_unit}
+    return magnitude
 
 
 def write_test(file_path, test_type=""):
@@ -93,7 +171,8 @@ def write_test(file_path, test_type=""):
         fn.write(test_text)
 
 
-def send_arduino_cmd(station: str, command: str or float, address: str = ARDUINO_PORT, return_txt: bool = False):
+def send_arduino_cmd(station: str, command: str or float, address: str = ARDUINO_PORT, return_txt: bool = False,
+                     timeout: float = ARDUINO_CMD_TIMEOUT):
     """
     Sends a command to the Arduino controlling a specific station.
 
@@ -102,6 +181,7 @@ def send_arduino_cmd(station: str, command: str or float, address: str = ARDUINO
         command (str or float): The command to send (e.g., "0", "1", "500").
         address (str): Address of the Arduino port (default is ARDUINO_PORT).
         return_txt (bool): Whether to return the Arduino response text (default is False).
+        timeout (float): Maximum seconds to wait for the response (default is ARDUINO_CMD_TIMEOUT).
 
     Returns:
         bool or str: True if the command succeeded, the response text if return_txt is True, otherwise False on failure.
@@ -109,37 +189,15 @@ def send_arduino_cmd(station: str, command: str or float, address: str = ARDUINO
     Raises:
         Exception: If unable to connect to the Arduino.
     """
-    try:
-        arduino = serial.Serial(address, 115200, timeout=.1)
-    except:
-        try:
-            time.sleep(20)
-            arduino = serial.Serial(address, 115200, timeout=.1)
-        except:
-            raise Exception("Warning! {} is not connected".format(address))
-    time.sleep(1)  # give the connection a second to settle
-    arduino.write(bytes(f"{station}_{command}", encoding='utf-8'))  # EX: E1_0 or P1_1_500
+    arduino = get_serial_session(address, baudrate=115200, timeout=.1)
     print("Command {} given to station {} at {} via Arduino.".format(command, station, address))
-    start_time = time.time()
     try:
-        while True:
-            print("trying to read...")
-            data = arduino.readline()
-            print("waiting for {} arduino results for {:.1f} seconds...".format(station, time.time() - start_time))
-            if data:
-                result_txt = data.decode().strip()  # strip out the old lines
-                print("ARDUINO RESULT: ", result_txt)
-                if "success" in result_txt:
-                    return result_txt if return_txt else True
-                elif "failure" in result_txt:
-                    return False
-            time.sleep(1)
+        result_txt = arduino.command(f"{station}_{command}", until=lambda l: "success" in l or "failure" in l,
+                                     timeout=timeout, label=f"{station} ARDUINO")  # EX: E1_0 or P1_1_500
+        if "success" in result_txt:
+            return result_txt if return_txt else True
+        return False
     except KeyboardInterrupt:
-        arduino.write(bytes(f"ABORT_{station}", encoding='utf-8'))
-        while True:
-            print("Aborted arduino. Trying to read abort message...")
-            data = arduino.readline()
-            if data:
-                print("ARDUINO ABORT MESSAGE: ", data.decode().strip())  # strip out the old lines
-                raise KeyboardInterrupt
-            time.sleep(1)
\ No newline at end of file
+        abort_txt = arduino.command(f"ABORT_{station}", label=f"{station} ARDUINO ABORT")
+        print("ARDUINO ABORT MESSAGE: ", abort_txt)
+        raise KeyboardInterrupt
\ No newline at end of file
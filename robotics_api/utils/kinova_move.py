@@ -1,16 +1,14 @@
 import sys
-import json
 import time
 import warnings
 import threading
-import numpy as np
-from argparse import Namespace
 from kortex_api.autogen.messages import Base_pb2
 from kortex_api.autogen.client_stubs.BaseClientRpc import BaseClient
 
 from robotics_api.actions.db_manipulations import VialStatus
 from robotics_api.utils import kinova_utils as utilities
 from robotics_api.utils.kinova_gripper import GripperMove
+from robotics_api.utils.snapshot_library import snapshot_library, get_zone, JointSnapshot, PoseSnapshot
 from robotics_api.settings import *
 
 # Maximum allowed waiting time during actions (in seconds)
@@ -123,31 +121,27 @@ def move_gripper(target_position=None, max_gripper_attempts=5):
     :return: bool, True if action a success
     """
 
-    # Create connection to the device and get the router
-    connector = Namespace(ip=KINOVA_01_IP, username="admin", password="admin")
-
-    def _try_gripper(conn=connector, target=target_position):
+    def _try_gripper(target=target_position):
         finished = True
-        with utilities.DeviceConnection.createTcpConnection(conn) as router:
-            # Create connection to the device and get the router
-            with utilities.DeviceConnection.createUdpConnection(conn) as router_real_time:
-                action = GripperMove(router, router_real_time, 2)
-
-                if target == 'open':
-                    if VERBOSE > 2:
-                        print("Moving gripper open...")
-                    finished &= action.gripper_move(OPEN_GRIP_TARGET)
-                    action.cleanup()
-                elif target == 'closed':
-                    if VERBOSE > 2:
-                        print("Moving gripper closed...")
-                    finished &= action.gripper_move(90)
-                    action.cleanup()
-                elif target:
-                    if VERBOSE > 2:
-                        print("Moving gripper to {}...".format(target))
-                    finished &= action.gripper_move(target)
-                    action.cleanup()
+        # Use the shared robot session (TCP for servoing mode changes, UDP for cyclic gripper commands)
+        with utilities.robot_session() as session:
+            action = GripperMove(session.router, session.router_real_time, 2)
+
+            if target == 'open':
+                if VERBOSE > 2:
+                    print("Moving gripper open...")
+                finished &= action.gripper_move(OPEN_GRIP_TARGET)
+                action.cleanup()
+            elif target == 'closed':
+                if VERBOSE > 2:
+                    print("Moving gripper closed...")
+                finished &= action.gripper_move(90)
+                action.cleanup()
+            elif target:
+                if VERBOSE > 2:
+                    print("Moving gripper to {}...".format(target))
+                finished &= action.gripper_move(target)
+                action.cleanup()
         return finished
 
     gripper_tries = 0
@@ -160,6 +154,7 @@ def move_gripper(target_position=None, max_gripper_attempts=5):
                 raise e
             print(f"WARNING. Gripper movement {gripper_tries} ended in error: ", e)
             gripper_tries += 1
+            utilities.robot_session().reconnect()
 
     print("Gripper movement successfully executed!" if finished else "Error! Gripper was not successfully moved.")
     return finished
@@ -181,11 +176,8 @@ def move_hand(linear_x: float = 0, linear_y: float = 0, linear_z: float = 0,
     Returns: boolean indicating success of action
 
     """
-    # Create connection to the device and get the router
-    connector = Namespace(ip=KINOVA_01_IP, username="admin", password="admin")
-    with utilities.DeviceConnection.createTcpConnection(connector) as router:
-        # Create required services
-        base = BaseClient(router)
+    with utilities.robot_session() as session:
+        base = session.base
 
         command = Base_pb2.TwistCommand()
         command.reference_frame = Base_pb2.CARTESIAN_REFERENCE_FRAME_TOOL
@@ -226,34 +218,6 @@ def move_hand(linear_x: float = 0, linear_y: float = 0, linear_z: float = 0,
     return finished
 
 
-def get_zone(angle, zone_dividers=ZONE_DIVIDERS):
-    """
-    Moves a given joint a specified range (in degrees).
-
-    Args:
-        angle (float): The angle in degrees.
-        zone_dividers (list): A list of zone divider angles in ascending order.
-    Returns:
-        int: The zone index (starting from 1) that the angle belongs to.
-    """
-
-    # Make sure zone_dividers starts with 0
-    zone_dividers = list(set([0] + zone_dividers))
-    zone_dividers.sort()
-
-    print("ZONES: ", angle, zone_dividers)
-    # Check if angle is above the last divider
-    if angle > zone_dividers[-1]:
-        return 1  # Belongs to Zone 1
-
-    # Find the zone
-    for idx in range(len(zone_dividers)):
-        if zone_dividers[idx] <= angle < (zone_dividers[(idx + 1) % len(zone_dividers)]):
-            return idx + 1  # Zone index starts from 1
-
-    raise ValueError(f"Zone not found for angle {angle} and dividers {zone_dividers}.")
-
-
 def get_current_zone(zone_dividers=ZONE_DIVIDERS):
     """
     Moves a given joint a specified range (in degrees).
@@ -263,46 +227,33 @@ def get_current_zone(zone_dividers=ZONE_DIVIDERS):
     Returns:
         int: The zone index (starting from 1) that the angle belongs to.
     """
-    connector = Namespace(ip=KINOVA_01_IP, username="admin", password="admin")
-    with utilities.DeviceConnection.createTcpConnection(connector) as router:
-        # Create required services
-        base = BaseClient(router)
-
-        current_joint_angles = base.GetMeasuredJointAngles()
+    with utilities.robot_session() as session:
+        current_joint_angles = session.base.GetMeasuredJointAngles()
         joint_1_angle = current_joint_angles.joint_angles[0].value
         return get_zone(joint_1_angle, zone_dividers=zone_dividers)
 
 
 def snapshot_zone(snapshot_file, zone_dividers=ZONE_DIVIDERS):
     """
-    Moves a given joint a specified range (in degrees).
+    Gets the zone of a snapshot.
 
     Args:
-        snapshot_file (str): A list of zone divider angles in ascending order.
+        snapshot_file (str or Snapshot): Snapshot, path to snapshot file (JSON), or snapshot name.
         zone_dividers (list): A list of zone divider angles in ascending order.
     Returns:
         int: The zone index (starting from 1) that the angle belongs to.
     """
-    with open(snapshot_file, 'r') as fn:
-        master_data = json.load(fn)
-
-        if "jointAnglesGroup" in master_data.keys():
-            joint_angle_values = master_data["jointAnglesGroup"]["jointAngles"][0]["reachJointAngles"]["jointAngles"][
-                "jointAngles"]
-            theta = joint_angle_values[0]["value"]
-        elif "poses" in master_data.keys():
-            coordinate_values = master_data["poses"]["pose"][0]["reachPose"]["targetPose"]
-            x = coordinate_values["x"]
-            y = coordinate_values["y"]
-            theta = -np.degrees(np.arctan2(y, x)) % 360
-    return get_zone(theta, zone_dividers=zone_dividers)
+    snapshot = snapshot_library().get(snapshot_file)
+    if zone_dividers == ZONE_DIVIDERS:
+        return snapshot.zone
+    return get_zone(snapshot.base_angle, zone_dividers=zone_dividers)
 
 
 def snapshot_move(snapshot_file: str = None, target_position: str or int = None, raise_error: bool = True,
                   angle_error: float = 0.2, position_error: float = 0.1):
     """
 
-    :param snapshot_file: str, path to snapshot file (JSON)
+    :param snapshot_file: str or Snapshot, snapshot, path to snapshot file (JSON), or snapshot name
     :param target_position: target position for the gripper: open, closed, or percentage closed (e.g., 90)
     :param raise_error:
     :param angle_error:
@@ -319,60 +270,49 @@ def snapshot_move(snapshot_file: str = None, target_position: str or int = None,
 
     finished = False
 
-    # Create connection to the device and get the router
-    connector = Namespace(ip=KINOVA_01_IP, username="admin", password="admin")
     if snapshot_file:
+        snapshot = snapshot_library().get(snapshot_file)
         try:
-            with utilities.DeviceConnection.createTcpConnection(connector) as router:
-                # Create required services
-                base = BaseClient(router)
-
-                with open(snapshot_file, 'r') as snapshot_file:
-                    # converts JSON to nested dictionary
-                    snapshot_file.dict = json.load(snapshot_file)
-
-                    if "jointAnglesGroup" in snapshot_file.dict:
-                        # grabs the list of joint angle values
-                        joint_angle_values = \
-                            snapshot_file.dict["jointAnglesGroup"]["jointAngles"][0]["reachJointAngles"]["jointAngles"][
-                                "jointAngles"]
-                        finished = snapshot_move_angular(base, joint_angle_values)
-
-                        if finished:
-                            current_joint_angles_raw = base.GetMeasuredJointAngles()
-                            current_joint_angles = {i.joint_identifier: i.value % 360 for i in
-                                                    current_joint_angles_raw.joint_angles}
-                            joint_angle_values_dict = {i["jointIdentifier"]: i["value"] for i in joint_angle_values}
-                            angle_diffs = [abs(current_joint_angles.get(k, 0) - joint_angle_values_dict.get(k, 0)) for k
-                                           in joint_angle_values_dict]
-                            if not all([d < angle_error for d in angle_diffs]):
-                                error_diffs = [d for d in angle_diffs if d > angle_error]
-                                if not all([abs(d - 360) < angle_error for d in error_diffs]):
-                                    finished = False
-                                    if raise_error:
-                                        raise SystemError("Error: Robot did not reach the desired joint angles: ",
-                                                          angle_diffs)
-                    elif "poses" in snapshot_file.dict:
-                        # grabs the dictionary of coordinate values
-                        coordinate_values = snapshot_file.dict["poses"]["pose"][0]["reachPose"]["targetPose"]
-                        finished = snapshot_move_cartesian(base, coordinate_values)
-
-                        if finished:
-                            current_pose_raw = base.GetMeasuredCartesianPose()
-                            current_pose = {"x": current_pose_raw.x, "y": current_pose_raw.y, "z": current_pose_raw.z,
-                                            "thetaX": current_pose_raw.theta_x, "thetaY": current_pose_raw.theta_y,
-                                            "thetaZ": current_pose_raw.theta_z}
-                            pose_diffs = [abs(current_pose.get(k, 0) - coordinate_values.get(k, 0)) for k in
-                                          coordinate_values]
-                            if not all([d < position_error for d in pose_diffs]):
-                                if raise_error:
-                                    raise SystemError(f"Error: Robot did not reach the desired Cartesian pose "
-                                                      f"({[coordinate_values.get(k, 0) for k in coordinate_values]}):"
-                                                      f" {pose_diffs}")
+            with utilities.robot_session() as session:
+                base = session.base
+
+                if isinstance(snapshot, JointSnapshot):
+                    finished = snapshot_move_angular(base, snapshot.joint_angle_values)
+
+                    if finished:
+                        current_joint_angles_raw = base.GetMeasuredJointAngles()
+                        current_joint_angles = {i.joint_identifier: i.value % 360 for i in
+                                                current_joint_angles_raw.joint_angles}
+                        joint_angle_values_dict = dict(enumerate(snapshot.angles))
+                        angle_diffs = [abs(current_joint_angles.get(k, 0) - joint_angle_values_dict.get(k, 0)) for k
+                                       in joint_angle_values_dict]
+                        if not all([d < angle_error for d in angle_diffs]):
+                            error_diffs = [d for d in angle_diffs if d > angle_error]
+                            if not all([abs(d - 360) < angle_error for d in error_diffs]):
                                 finished = False
-                    else:
-                        if raise_error:
-                            raise SystemError("Snapshot file type not suitable for robot movement")
+                                if raise_error:
+                                    raise SystemError("Error: Robot did not reach the desired joint angles: ",
+                                                      angle_diffs)
+                elif isinstance(snapshot, PoseSnapshot):
+                    coordinate_values = snapshot.coordinates
+                    finished = snapshot_move_cartesian(base, coordinate_values)
+
+                    if finished:
+                        current_pose_raw = base.GetMeasuredCartesianPose()
+                        current_pose = {"x": current_pose_raw.x, "y": current_pose_raw.y, "z": current_pose_raw.z,
+                                        "thetaX": current_pose_raw.theta_x, "thetaY": current_pose_raw.theta_y,
+                                        "thetaZ": current_pose_raw.theta_z}
+                        pose_diffs = [abs(current_pose.get(k, 0) - coordinate_values.get(k, 0)) for k in
+                                      coordinate_values]
+                        if not all([d < position_error for d in pose_diffs]):
+                            if raise_error:
+                                raise SystemError(f"Error: Robot did not reach the desired Cartesian pose "
+                                                  f"({[coordinate_values.get(k, 0) for k in coordinate_values]}):"
+                                                  f" {pose_diffs}")
+                            finished = False
+                else:
+                    if raise_error:
+                        raise SystemError("Snapshot file type not suitable for robot movement")
         except Exception as e:
             raise Exception(e)
 
@@ -394,10 +334,8 @@ def perturb_angular(reverse=False, wait_time=None, **joint_deltas):
     Returns:
         bool: True if the movement completed successfully, False otherwise.
     """
-    connector = Namespace(ip=KINOVA_01_IP, username="admin", password="admin")
-    with utilities.DeviceConnection.createTcpConnection(connector) as router:
-        # Create required services
-        base = BaseClient(router)
+    with utilities.robot_session() as session:
+        base = session.base
         current_joint_angles = base.GetMeasuredJointAngles()
 
         joint_angles = []
@@ -417,25 +355,18 @@ def perturb_angular(reverse=False, wait_time=None, **joint_deltas):
 
 def perturbed_snapshot(snapshot_file, perturb_amount: float = PERTURB_AMOUNT, axis="z"):
     """
-    Creates a perturbed snapshot by modifying the specified axis position in the given snapshot file.
+    Creates a perturbed snapshot by modifying the specified axis position of the given pose snapshot. The perturbed
+    pose is generated in memory; no snapshot file is written.
 
     Args:
-        snapshot_file (str): Path to the snapshot JSON file.
+        snapshot_file (str or Snapshot): Pose snapshot, path to snapshot file (JSON), or snapshot name.
         perturb_amount (float): Amount to perturb the position along the specified axis (default is PERTURB_AMOUNT).
         axis (str): Axis to apply the perturbation to, defaults to "z".
 
     Returns:
-        str: Path to the new perturbed snapshot file.
+        PoseSnapshot: The perturbed snapshot.
     """
-    with open(snapshot_file, 'r') as fn:
-        master_data = json.load(fn)
-
-    # Generate temporary perturbed file
-    new_height = master_data["poses"]["pose"][0]["reachPose"]["targetPose"][axis] + perturb_amount
-    master_data["poses"]["pose"][0]["reachPose"]["targetPose"][axis] = new_height
-    with open(os.path.join(SNAPSHOT_DIR, "_temp_perturbed.json"), "w+") as fn:
-        json.dump(master_data, fn, indent=2)
-    return os.path.join(SNAPSHOT_DIR, "_temp_perturbed.json")
+    return snapshot_library().perturbed(snapshot_file, perturb_amount=perturb_amount, axis=axis)
 
 
 def get_place_vial(station, action_type="get", go=True, leave=True, release_vial=True, raise_error=True,
@@ -484,8 +415,8 @@ def get_place_vial(station, action_type="get", go=True, leave=True, release_vial
         current_zone = get_current_zone()
         if current_zone != target_zone:
             print(f"--------- Moving from zone {current_zone} to zone {target_zone} ---------")
-            success &= snapshot_move(os.path.join(SNAPSHOT_DIR, f"zone_{current_zone:02d}.json"))
-            success &= snapshot_move(os.path.join(SNAPSHOT_DIR, f"zone_{target_zone:02d}.json"))
+            success &= snapshot_move(snapshot_library()[f"zone_{current_zone:02d}"])
+            success &= snapshot_move(snapshot_library()[f"zone_{target_zone:02d}"])
 
         # If pre-position, go there
         if pre_position_file:
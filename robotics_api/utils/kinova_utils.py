@@ -1,4 +1,7 @@
+import time
+import atexit
 import argparse
+import threading
 
 from robotics_api.settings import *
 from kortex_api.TCPTransport import TCPTransport
@@ -6,6 +9,9 @@ from kortex_api.UDPTransport import UDPTransport
 from kortex_api.SessionManager import SessionManager
 from kortex_api.autogen.messages import Session_pb2
 from kortex_api.RouterClient import RouterClient, RouterClientSendOptions
+from kortex_api.Exceptions.KClientException import KClientException
+from kortex_api.autogen.client_stubs.BaseClientRpc import BaseClient
+from kortex_api.autogen.client_stubs.BaseCyclicClientRpc import BaseCyclicClient
 
 
 def parseConnectionArguments(parser=argparse.ArgumentParser()):
@@ -35,11 +41,14 @@ class DeviceConnection:
 
         return DeviceConnection(args.ip, port=DeviceConnection.UDP_PORT, credentials=(args.username, args.password))
 
-    def __init__(self, ipAddress, port=TCP_PORT, credentials=("", "")):
+    def __init__(self, ipAddress, port=TCP_PORT, credentials=("", ""), session_inactivity_timeout=10000,
+                 connection_inactivity_timeout=2000):
 
         self.ipAddress = ipAddress
         self.port = port
         self.credentials = credentials
+        self.session_inactivity_timeout = session_inactivity_timeout
+        self.connection_inactivity_timeout = connection_inactivity_timeout
 
         self.sessionManager = None
 
@@ -56,8 +65,8 @@ class DeviceConnection:
             session_info = Session_pb2.CreateSessionInfo()
             session_info.username = self.credentials[0]
             session_info.password = self.credentials[1]
-            session_info.session_inactivity_timeout = 10000  # (milliseconds)
-            session_info.connection_inactivity_timeout = 2000  # (milliseconds)
+            session_info.session_inactivity_timeout = self.session_inactivity_timeout  # (milliseconds)
+            session_info.connection_inactivity_timeout = self.connection_inactivity_timeout  # (milliseconds)
 
             self.sessionManager = SessionManager(self.router)
             print("Logging as", self.credentials[0], "on device", self.ipAddress)
@@ -75,3 +84,178 @@ class DeviceConnection:
             self.sessionManager.CloseSession(router_options)
 
         self.transport.disconnect()
+
+
+class RobotSession:
+    """
+    Process-wide Kinova session. The TCP router (and the UDP router, once the gripper needs it) and their BaseClient
+    and BaseCyclicClient stay connected between motions, so a move does not pay for a new connection and login.
+    Use as a context manager to hold the session for one motion; the connection is checked and, if needed,
+    re-established on entry.
+    """
+
+    def __init__(self, ip=KINOVA_01_IP, username="admin", password="admin"):
+        """
+        Initializes the RobotSession. Nothing connects until the session is first used.
+
+        Args:
+            ip (str, optional): Robot IP address. Defaults to KINOVA_01_IP.
+            username (str, optional): Robot login. Defaults to "admin".
+            password (str, optional): Robot password. Defaults to "admin".
+        """
+        self.ip = ip
+        self.credentials = (username, password)
+        self.lock = threading.RLock()
+        self._tcp = None
+        self._udp = None
+        self._router = None
+        self._router_real_time = None
+        self._base = None
+        self._base_cyclic = None
+        self._last_used = 0
+        self._stale = False
+
+    def __enter__(self):
+        self.lock.acquire()
+        try:
+            self.ensure()
+        except Exception:
+            self.lock.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type and issubclass(exc_type, (KClientException, ConnectionError, OSError, TimeoutError)):
+            self._stale = True  # reconnect before the next motion
+        self._last_used = time.monotonic()
+        self.lock.release()
+
+    def _connection(self, port):
+        return DeviceConnection(self.ip, port=port, credentials=self.credentials,
+                                session_inactivity_timeout=KINOVA_SESSION_TIMEOUT,
+                                connection_inactivity_timeout=KINOVA_CONNECTION_TIMEOUT)
+
+    def connect(self):
+        """
+        Opens the TCP connection and logs in, if not already connected.
+        """
+        with self.lock:
+            if self._router:
+                return
+            self._tcp = self._connection(DeviceConnection.TCP_PORT)
+            self._router = self._tcp.__enter__()
+            self._base = BaseClient(self._router)
+            self._stale = False
+            self._last_used = time.monotonic()
+
+    def connect_real_time(self):
+        """
+        Opens the UDP (real-time) connection and logs in, if not already connected.
+        """
+        with self.lock:
+            self.connect()
+            if self._router_real_time:
+                return
+            self._udp = self._connection(DeviceConnection.UDP_PORT)
+            self._router_real_time = self._udp.__enter__()
+            self._base_cyclic = BaseCyclicClient(self._router_real_time)
+
+    def close(self):
+        """
+        Closes the sessions and disconnects.
+        """
+        with self.lock:
+            for connection in (self._udp, self._tcp):
+                if connection:
+                    try:
+                        connection.__exit__(None, None, None)
+                    except Exception as e:
+                        print(f"Error closing robot connection: {e}")
+            self._tcp = self._udp = None
+            self._router = self._router_real_time = None
+            self._base = self._base_cyclic = None
+
+    def reconnect(self):
+        """
+        Closes and reopens the connections that were open.
+        """
+        with self.lock:
+            real_time = self._router_real_time is not None
+            self.close()
+            print(f"Reconnecting to robot at {self.ip}...")
+            self.connect()
+            if real_time:
+                self.connect_real_time()
+
+    def healthy(self):
+        """
+        Checks that the TCP session still answers requests.
+
+        Returns:
+            bool: True if the session is usable.
+        """
+        if not self._base:
+            return False
+        try:
+            self._base.GetArmState()
+            return True
+        except Exception:
+            return False
+
+    def ensure(self):
+        """
+        Connects if needed and reconnects if the session failed or was idle long enough to have expired.
+        """
+        with self.lock:
+            if not self._router:
+                self.connect()
+            elif self._stale or (time.monotonic() - self._last_used > KINOVA_HEALTH_CHECK_IDLE and not self.healthy()):
+                self.reconnect()
+
+    @property
+    def router(self):
+        self.ensure()
+        return self._router
+
+    @property
+    def router_real_time(self):
+        self.ensure()
+        self.connect_real_time()
+        return self._router_real_time
+
+    @property
+    def base(self):
+        self.ensure()
+        return self._base
+
+    @property
+    def base_cyclic(self):
+        self.connect_real_time()
+        return self._base_cyclic
+
+
+_ROBOT_SESSION = None
+_ROBOT_SESSION_LOCK = threading.Lock()
+
+
+def robot_session():
+    """
+    Gets the process-wide robot session, creating it on first use.
+
+    Returns:
+        RobotSession: The shared session.
+    """
+    global _ROBOT_SESSION
+    with _ROBOT_SESSION_LOCK:
+        if _ROBOT_SESSION is None:
+            _ROBOT_SESSION = RobotSession()
+        return _ROBOT_SESSION
+
+
+@atexit.register
+def close_robot_session():
+    """
+    Closes the process-wide robot session.
+    """
+    if _ROBOT_SESSION is not None:
+        _ROBOT_SESSION.close()
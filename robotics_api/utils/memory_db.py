@@ -0,0 +1,617 @@
+import re
+import copy
+import threading
+from datetime import datetime, timezone
+from collections import namedtuple
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+UpdateResult = namedtuple("UpdateResult", ["matched_count", "modified_count", "upserted_id"])
+DeleteResult = namedtuple("DeleteResult", ["deleted_count"])
+InsertOneResult = namedtuple("InsertOneResult", ["inserted_id"])
+InsertManyResult = namedtuple("InsertManyResult", ["inserted_ids"])
+BulkWriteResult = namedtuple("BulkWriteResult", ["matched_count", "modified_count", "upserted_count",
+                                                 "inserted_count", "deleted_count"])
+
+_MISSING = object()
+
+
+def _get_values(doc, path):
+    """
+    Returns every value at a dot-notation path, expanding arrays along the way (as MongoDB queries do).
+    """
+    values = [doc]
+    for key in path.split("."):
+        next_values = []
+        for value in values:
+            if isinstance(value, dict):
+                if key in value:
+                    next_values.append(value[key])
+            elif isinstance(value, list):
+                if key.isdigit() and int(key) < len(value):
+                    next_values.append(value[int(key)])
+                else:
+                    next_values.extend(v[key] for v in value if isinstance(v, dict) and key in v)
+        values = next_values
+    return values
+
+
+def _get_path(doc, path, default=None):
+    """Returns the single value at a dot-notation path (no array expansion)."""
+    value = doc
+    for key in path.split("."):
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+            value = value[int(key)]
+        else:
+            return default
+    return value
+
+
+def _set_path(doc, path, value):
+    keys = path.split(".")
+    for key in keys[:-1]:
+        if isinstance(doc, list):
+            doc = doc[int(key)]
+        else:
+            doc = doc.setdefault(key, {})
+    if isinstance(doc, list):
+        doc[int(keys[-1])] = value
+    else:
+        doc[keys[-1]] = value
+
+
+def _unset_path(doc, path):
+    keys = path.split(".")
+    parent = _get_path(doc, ".".join(keys[:-1])) if len(keys) > 1 else doc
+    if isinstance(parent, dict):
+        parent.pop(keys[-1], None)
+
+
+def _sort_key(value, descending=False):
+    """
+    Returns a key that orders values of mixed types the way MongoDB sorts them: null (or missing), numbers, strings,
+    objects, arrays, binary data, ObjectIds, booleans, dates, then anything else. An array sorts by its smallest
+    element (largest when `descending`), and an empty array sorts before null.
+    """
+    if value is None:
+        return 1,
+    if isinstance(value, bool):
+        return 8, value
+    if isinstance(value, (int, float)):
+        return 2, value
+    if isinstance(value, str):
+        return 3, value
+    if isinstance(value, dict):
+        return 4, tuple((k, _sort_key(v, descending)) for k, v in value.items())
+    if isinstance(value, list):
+        keys = [_sort_key(v, descending) for v in value]
+        return (max if descending else min)(keys) if keys else (0,)
+    if isinstance(value, bytes):
+        return 6, value
+    if isinstance(value, ObjectId):
+        return 7, value
+    if isinstance(value, datetime):
+        return 9, (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).timestamp()  # naive is UTC
+    return 10, str(value)
+
+
+def _compare(a, b, op):
+    try:
+        return op(a, b)
+    except TypeError:
+        return False
+
+
+def _match_operators(values, condition):
+    """Evaluates an operator condition (e.g., {"$gt": 1}) against the values found at a path."""
+    exists = bool(values)
+    flat = []
+    for value in values:
+        flat.append(value)
+        if isinstance(value, list):
+            flat.extend(value)
+    for op, arg in condition.items():
+        if op == "$exists":
+            if exists != bool(arg):
+                return False
+        elif op == "$eq":
+            if not _match_value(values, arg):
+                return False
+        elif op == "$ne":
+            if _match_value(values, arg):
+                return False
+        elif op == "$in":
+            if not any(_match_value(values, a) for a in arg):
+                return False
+        elif op == "$nin":
+            if any(_match_value(values, a) for a in arg):
+                return False
+        elif op in ("$lt", "$lte", "$gt", "$gte"):
+            cmp = {"$lt": lambda a, b: a < b, "$lte": lambda a, b: a <= b,
+                   "$gt": lambda a, b: a > b, "$gte": lambda a, b: a >= b}[op]
+            if not any(_compare(v, arg, cmp) for v in flat if v is not None):
+                return False
+        elif op == "$regex":
+            pattern = re.compile(arg, re.IGNORECASE if "i" in condition.get("$options", "") else 0)
+            if not any(isinstance(v, str) and pattern.search(v) for v in flat):
+                return False
+        elif op == "$options":
+            continue
+        elif op == "$not":
+            if _match_operators(values, arg):
+                return False
+        elif op == "$size":
+            if not any(isinstance(v, list) and len(v) == arg for v in values):
+                return False
+        elif op == "$elemMatch":
+            if not any(isinstance(v, list) and any(isinstance(e, dict) and match(e, arg) for e in v)
+                       for v in values):
+                return False
+        else:
+            raise NotImplementedError("Query operator {} is not supported by the memory backend.".format(op))
+    return True
+
+
+def _match_value(values, target):
+    """Equality match, including matching elements of arrays and None against missing fields."""
+    if target is None and not values:
+        return True
+    for value in values:
+        if value == target or (isinstance(value, list) and target in value):
+            return True
+    return False
+
+
+def match(doc, query):
+    """
+    Checks whether a document matches a MongoDB query (supported subset: equality, dot-notation paths, $and, $or,
+    $nor, $exists, $eq, $ne, $in, $nin, $lt, $lte, $gt, $gte, $regex, $not, $size, $elemMatch).
+
+    Args:
+        doc (dict): Document.
+        query (dict): MongoDB query.
+
+    Returns:
+        bool: True if the document matches.
+    """
+    for key, condition in (query or {}).items():
+        if key == "$and":
+            if not all(match(doc, q) for q in condition):
+                return False
+        elif key == "$or":
+            if not any(match(doc, q) for q in condition):
+                return False
+        elif key == "$nor":
+            if any(match(doc, q) for q in condition):
+                return False
+        else:
+            values = _get_values(doc, key)
+            if isinstance(condition, re.Pattern):
+                condition = {"$regex": condition.pattern}
+            if isinstance(condition, dict) and condition and all(k.startswith("$") for k in condition):
+                if not _match_operators(values, condition):
+                    return False
+            elif not _match_value(values, condition):
+                return False
+    return True
+
+
+def _evaluate(expression, doc):
+    """Evaluates the subset of aggregation expressions used in pipeline updates."""
+    if isinstance(expression, str) and expression.startswith("$"):
+        return _get_path(doc, expression[1:])
+    if isinstance(expression, list):
+        return [_evaluate(e, doc) for e in expression]
+    if isinstance(expression, dict):
+        if len(expression) == 1 and next(iter(expression)).startswith("$"):
+            op, arg = next(iter(expression.items()))
+            if op == "$literal":
+                return arg
+            if op == "$ifNull":
+                values = [_evaluate(a, doc) for a in arg]
+                return next((v for v in values[:-1] if v is not None), values[-1])
+            if op == "$concatArrays":
+                return [e for a in arg for e in (_evaluate(a, doc) or [])]
+            if op == "$slice":
+                array, n = _evaluate(arg[0], doc), arg[1]
+                return array[n:] if n < 0 else array[:n]
+            if op == "$add":
+                return sum(_evaluate(a, doc) for a in arg)
+            raise NotImplementedError("Expression operator {} is not supported by the memory backend.".format(op))
+        return {k: _evaluate(v, doc) for k, v in expression.items()}
+    return expression
+
+
+def apply_update(doc, update):
+    """
+    Applies a MongoDB update document (or pipeline) to a document in place. Supported: $set, $unset, $inc,
+    $addToSet, $push (with $each and $slice), $pull, and pipeline stages $set / $addFields / $unset.
+
+    Args:
+        doc (dict): Document to update.
+        update (dict or list): Update document or aggregation pipeline.
+    """
+    if isinstance(update, list):
+        for stage in update:
+            for op, fields in stage.items():
+                if op in ("$set", "$addFields"):
+                    values = {path: _evaluate(v, doc) for path, v in fields.items()}
+                    for path, value in values.items():
+                        _set_path(doc, path, copy.deepcopy(value))
+                elif op == "$unset":
+                    for path in [fields] if isinstance(fields, str) else fields:
+                        _unset_path(doc, path)
+                else:
+                    raise NotImplementedError("Pipeline stage {} is not supported by the memory backend.".format(op))
+        return
+
+    for op, fields in update.items():
+        for path, value in fields.items():
+            current = _get_path(doc, path, _MISSING)
+            if op == "$set":
+                _set_path(doc, path, copy.deepcopy(value))
+            elif op == "$unset":
+                _unset_path(doc, path)
+            elif op == "$inc":
+                _set_path(doc, path, (0 if current is _MISSING else current) + value)
+            elif op in ("$addToSet", "$push"):
+                array = [] if current is _MISSING or current is None else current
+                if not isinstance(array, list):
+                    raise TypeError("Cannot apply {} to non-array field {}.".format(op, path))
+                each = value["$each"] if isinstance(value, dict) and "$each" in value else [value]
+                for item in copy.deepcopy(each):
+                    if op == "$push" or item not in array:
+                        array.append(item)
+                if op == "$push" and isinstance(value, dict) and value.get("$slice") is not None:
+                    n = value["$slice"]
+                    array = array[n:] if n < 0 else array[:n]
+                _set_path(doc, path, array)
+            elif op == "$pull":
+                if isinstance(current, list):
+                    if isinstance(value, dict):
+                        keep = [i for i in current if not (match(i, value) if isinstance(i, dict)
+                                                           else _match_operators([i], value))]
+                    else:
+                        keep = [i for i in current if i != value]
+                    _set_path(doc, path, keep)
+            else:
+                raise NotImplementedError("Update operator {} is not supported by the memory backend.".format(op))
+
+
+def project(doc, projection):
+    """Applies an inclusion or exclusion projection to a copy of a document."""
+    doc = copy.deepcopy(doc)
+    if not projection:
+        return doc
+    if isinstance(projection, (list, tuple)):
+        projection = {k: 1 for k in projection}
+    include = {k for k, v in projection.items() if v and k != "_id"}
+    if include:
+        projected = {"_id": doc["_id"]} if projection.get("_id", 1) and "_id" in doc else {}
+        for path in include:
+            value = _get_path(doc, path, _MISSING)
+            if value is not _MISSING:
+                _set_path(projected, path, value)
+        return projected
+    for path, v in projection.items():
+        if not v:
+            _unset_path(doc, path)
+    return doc
+
+
+class MemoryCursor:
+    """
+    Iterable query result supporting the cursor methods used with the status database. Stored documents are never
+    modified in place, so the cursor holds references and copies documents only as they are read.
+    """
+
+    def __init__(self, docs, projection=None):
+        self._docs = list(docs)
+        self._projection = projection
+        self._limit = 0
+        self._skip = 0
+
+    def sort(self, key, direction=1):
+        keys = key if isinstance(key, list) else [(key, direction)]
+        for k, d in reversed(keys):
+            self._docs.sort(key=lambda doc: _sort_key(_get_path(doc, k), descending=d < 0), reverse=d < 0)
+        return self
+
+    def limit(self, limit):
+        self._limit = limit
+        return self
+
+    def skip(self, skip):
+        self._skip = skip
+        return self
+
+    def batch_size(self, batch_size):
+        return self
+
+    def _selected(self):
+        docs = self._docs[self._skip:]
+        return docs[:self._limit] if self._limit else docs
+
+    def distinct(self, key):
+        values = []
+        for doc in self._selected():
+            for value in _get_values(doc, key):
+                for v in value if isinstance(value, list) else [value]:
+                    if v not in values:
+                        values.append(v)
+        return values
+
+    def __iter__(self):
+        return (project(doc, self._projection) for doc in self._selected())
+
+
+class MemoryCollection:
+    """
+    In-memory stand-in for a pymongo collection. Documents are kept in a dict keyed by `_id`. Fields passed to
+    `create_index` get a value --> `_id` index that is used for equality and `$in` lookups.
+    """
+
+    def __init__(self, name, database_name="memory"):
+        self.name = name
+        self.full_name = "{}.{}".format(database_name, name)
+        self._docs = {}
+        self._indexes = {}  # field --> {value: set of _ids}
+        self._lock = threading.RLock()
+
+    # ---------- indexes ----------
+    @staticmethod
+    def _index_keys(doc, field):
+        keys = set()
+        for value in _get_values(doc, field) or [None]:
+            for v in value if isinstance(value, list) else [value]:
+                try:
+                    hash(v)
+                    keys.add(v)
+                except TypeError:
+                    pass
+        return keys
+
+    def _index_add(self, doc):
+        for field, index in self._indexes.items():
+            for key in self._index_keys(doc, field):
+                index.setdefault(key, set()).add(doc["_id"])
+
+    def _index_remove(self, doc):
+        for field, index in self._indexes.items():
+            for key in self._index_keys(doc, field):
+                index.get(key, set()).discard(doc["_id"])
+
+    def create_index(self, keys, **kwargs):
+        field = keys if isinstance(keys, str) else keys[0][0]
+        with self._lock:
+            if field not in self._indexes:
+                self._indexes[field] = {}
+                for doc in self._docs.values():
+                    for key in self._index_keys(doc, field):
+                        self._indexes[field].setdefault(key, set()).add(doc["_id"])
+        return "{}_1".format(field)
+
+    def index_information(self):
+        return {"{}_1".format(f): {"key": [(f, 1)]} for f in ["_id"] + list(self._indexes)}
+
+    def _candidates(self, query):
+        """Returns the documents that may match a query, narrowed with `_id` or an index when possible."""
+        query = query or {}
+        for field, condition in query.items():
+            if field != "_id" and field not in self._indexes:
+                continue
+            if isinstance(condition, dict):
+                if set(condition) != {"$in"}:
+                    continue
+                targets = condition["$in"]
+            else:
+                targets = [condition]
+            try:
+                if field == "_id":
+                    ids = [t for t in targets if t in self._docs]
+                else:
+                    ids = set().union(*[self._indexes[field].get(t, set()) for t in targets])
+            except TypeError:
+                continue
+            return [self._docs[i] for i in sorted(ids, key=str) if i in self._docs]
+        return list(self._docs.values())
+
+    def _find(self, query):
+        return [doc for doc in self._candidates(query) if match(doc, query)]
+
+    # ---------- reads ----------
+    def find(self, query=None, projection=None, sort=None, limit=0):
+        with self._lock:
+            cursor = MemoryCursor(self._find(query), projection)
+        if sort:
+            cursor.sort(sort)
+        return cursor.limit(limit)
+
+    def find_one(self, query=None, projection=None, sort=None):
+        if query is not None and not isinstance(query, dict):
+            query = {"_id": query}
+        docs = list(self.find(query, projection, sort=sort, limit=1))
+        return docs[0] if docs else None
+
+    def count_documents(self, query, **kwargs):
+        with self._lock:
+            return len(self._find(query))
+
+    def distinct(self, key, query=None):
+        return self.find(query).distinct(key)
+
+    # ---------- writes ----------
+    def _upsert_doc(self, query, update):
+        doc = {k: v for k, v in (query or {}).items()
+               if not k.startswith("$") and not (isinstance(v, dict) and any(i.startswith("$") for i in v))}
+        if isinstance(update, dict) and not any(k.startswith("$") for k in update):
+            doc.update(copy.deepcopy(update))
+        else:
+            apply_update(doc, update)
+        if "_id" not in doc:
+            doc["_id"] = ObjectId()
+        return doc
+
+    def _write(self, old, new):
+        if old is not None:
+            self._index_remove(old)
+        self._docs[new["_id"]] = new
+        self._index_add(new)
+
+    def _update(self, query, update, upsert=False, many=False, sort=None):
+        """Returns (old document, new document, matched count, modified count, upserted id)."""
+        matches = self._find(query)
+        if sort:
+            matches = list(MemoryCursor(matches).sort(sort)._docs)
+        if not many:
+            matches = matches[:1]
+        if not matches:
+            if not upsert:
+                return None, None, 0, 0, None
+            doc = self._upsert_doc(query, update)
+            self._write(None, doc)
+            return None, doc, 0, 0, doc["_id"]
+        modified = 0
+        old = new = None
+        for old in matches:
+            new = copy.deepcopy(old)
+            apply_update(new, update)
+            if new != old:
+                modified += 1
+                self._write(old, new)
+        return old, new, len(matches), modified, None
+
+    def update_one(self, query, update, upsert=False, **kwargs):
+        with self._lock:
+            _, _, matched, modified, upserted_id = self._update(query, update, upsert=upsert)
+        return UpdateResult(matched, modified, upserted_id)
+
+    def update_many(self, query, update, upsert=False, **kwargs):
+        with self._lock:
+            _, _, matched, modified, upserted_id = self._update(query, update, upsert=upsert, many=True)
+        return UpdateResult(matched, modified, upserted_id)
+
+    def replace_one(self, query, replacement, upsert=False, **kwargs):
+        with self._lock:
+            matches = self._find(query)[:1]
+            if not matches and not upsert:
+                return UpdateResult(0, 0, None)
+            new = copy.deepcopy(replacement)
+            new.setdefault("_id", matches[0]["_id"] if matches else (query or {}).get("_id"))
+            if matches:
+                self._docs.pop(matches[0]["_id"])
+                self._index_remove(matches[0])
+            self._write(None, new)
+            if matches:
+                return UpdateResult(1, int(new != matches[0]), None)
+            return UpdateResult(0, 0, new["_id"])
+
+    def find_one_and_update(self, query, update, projection=None, sort=None, upsert=False,
+                            return_document=ReturnDocument.BEFORE, **kwargs):
+        with self._lock:
+            old, new, _, _, _ = self._update(query, update, upsert=upsert, sort=sort)
+        doc = new if return_document == ReturnDocument.AFTER else old
+        return project(doc, projection) if doc is not None else None
+
+    def insert_one(self, document, **kwargs):
+        with self._lock:
+            document.setdefault("_id", ObjectId())
+            if document["_id"] in self._docs:
+                raise KeyError("Duplicate _id {} in {}.".format(document["_id"], self.full_name))
+            self._write(None, copy.deepcopy(document))
+        return InsertOneResult(document["_id"])
+
+    def insert_many(self, documents, **kwargs):
+        return InsertManyResult([self.insert_one(d).inserted_id for d in documents])
+
+    def delete_one(self, query, **kwargs):
+        with self._lock:
+            matches = self._find(query)[:1]
+            for doc in matches:
+                self._index_remove(self._docs.pop(doc["_id"]))
+        return DeleteResult(len(matches))
+
+    def delete_many(self, query, **kwargs):
+        with self._lock:
+            matches = self._find(query)
+            for doc in matches:
+                self._index_remove(self._docs.pop(doc["_id"]))
+        return DeleteResult(len(matches))
+
+    def bulk_write(self, requests, ordered=True, **kwargs):
+        """Applies pymongo UpdateOne, UpdateMany, ReplaceOne, InsertOne, DeleteOne and DeleteMany requests."""
+        counts = dict(matched_count=0, modified_count=0, upserted_count=0, inserted_count=0, deleted_count=0)
+        with self._lock:
+            for req in requests:
+                name = type(req).__name__
+                if name in ("UpdateOne", "UpdateMany", "ReplaceOne"):
+                    if name == "ReplaceOne":
+                        result = self.replace_one(req._filter, req._doc, upsert=req._upsert)
+                    elif name == "UpdateOne":
+                        result = self.update_one(req._filter, req._doc, upsert=req._upsert)
+                    else:
+                        result = self.update_many(req._filter, req._doc, upsert=req._upsert)
+                    counts["matched_count"] += result.matched_count
+                    counts["modified_count"] += result.modified_count
+                    counts["upserted_count"] += result.upserted_id is not None
+                elif name == "InsertOne":
+                    self.insert_one(req._doc)
+                    counts["inserted_count"] += 1
+                elif name in ("DeleteOne", "DeleteMany"):
+                    delete = self.delete_one if name == "DeleteOne" else self.delete_many
+                    counts["deleted_count"] += delete(req._filter).deleted_count
+                else:
+                    raise NotImplementedError("Bulk request {} is not supported by the memory backend.".format(name))
+        return BulkWriteResult(**counts)
+
+    def drop(self):
+        with self._lock:
+            self._docs.clear()
+            for index in self._indexes.values():
+                index.clear()
+
+    def watch(self, *args, **kwargs):
+        raise NotImplementedError("Change streams are not supported by the memory backend.")
+
+
+class MemoryDatabase:
+    """In-memory stand-in for a pymongo database."""
+
+    def __init__(self, name):
+        self.name = name
+        self._collections = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, coll_name):
+        with self._lock:
+            if coll_name not in self._collections:
+                self._collections[coll_name] = MemoryCollection(coll_name, database_name=self.name)
+            return self._collections[coll_name]
+
+    def list_collection_names(self):
+        return list(self._collections)
+
+    def drop_collection(self, coll_name):
+        self._collections.pop(coll_name, None)
+
+
+class MemoryClient:
+    """In-memory stand-in for a pymongo MongoClient. Data lives only as long as the process."""
+
+    def __init__(self):
+        self._databases = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, db_name):
+        with self._lock:
+            if db_name not in self._databases:
+                self._databases[db_name] = MemoryDatabase(db_name)
+            return self._databases[db_name]
+
+    def drop_database(self, db_name):
+        self._databases.pop(db_name, None)
+
+
+MEMORY_CLIENT = MemoryClient()
@@ -1,14 +1,22 @@
 import os
 import json
+import uuid
 import warnings
+import threading
+from datetime import datetime
 import jsonschema
+import numpy as np
 import pandas as pd
 from urllib import request
 from dotty_dict import dotty
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument, UpdateOne, ReplaceOne, DeleteOne, DeleteMany
+from pymongo.errors import ConfigurationError, DuplicateKeyError, OperationFailure
 from monty.json import jsanitize
 import python_jsonschema_objects as pjs
-from robotics_api.settings import DB_INFO_FILE
+from robotics_api.utils.memory_db import MEMORY_CLIENT
+from robotics_api.utils.status_notifier import STATUS_NOTIFIER
+from robotics_api.settings import DB_BACKEND, DB_INFO_FILE, SCHEMA_CACHE_DIR, SCHEMA_BUNDLE_DIR, SCHEMA_OFFLINE, \
+    STATUS_HISTORY_CAP
 
 
 def db_info_generator(db_file=DB_INFO_FILE):
@@ -41,6 +49,8 @@ def db_info_generator(db_file=DB_INFO_FILE):
                     "database": "backend"
                 }
         }
+    if DB_BACKEND == "memory" and not os.path.isfile(db_file):
+        return {}
     with open(db_file, "r") as f:
         return json.load(f)
 
@@ -49,9 +59,87 @@ DB_INFO = db_info_generator()
 print(DB_INFO)
 
 
+_SCHEMAS = {}  # (database, schema_name, branch) --> schema dict
+_SCHEMA_NAMESPACES = {}  # (database, schema_name, branch, named_only) --> python_jsonschema_objects namespace
+_SCHEMA_VALIDATORS = {}  # (database, schema_name, branch) --> compiled jsonschema validator
+
+
+def schema_file(root, database, schema_name, branch="main"):
+    """
+    Returns the local path for a schema within a schema cache or bundle directory.
+
+    Args:
+        root (str): Schema cache or bundle directory.
+        database (str): Database name.
+        schema_name (str): Schema name, including any schema directory (e.g., "directory/name").
+        branch (str, optional): Schema version (GitHub branch). Defaults to "main".
+
+    Returns:
+        str: Path to the schema JSON file.
+    """
+    return os.path.join(root, branch, "schema_{}".format(database).replace("robotics_", ""),
+                        "{}.schema.json".format(schema_name).replace("robotics_", ""))
+
+
+def load_schema(database, schema_name, branch="main"):
+    """
+    Loads a D3TaLES schema, checking the in-process cache, the on-disk schema cache (SCHEMA_CACHE_DIR), and the
+    bundled schema snapshot (SCHEMA_BUNDLE_DIR) before downloading it from GitHub. Downloaded schemas are written to
+    the schema cache. If SCHEMA_OFFLINE is True, the schema is never downloaded.
+
+    Args:
+        database (str): Database name.
+        schema_name (str): Schema name, including any schema directory (e.g., "directory/name").
+        branch (str, optional): Schema version (GitHub branch). Defaults to "main".
+
+    Returns:
+        dict: The schema.
+
+    Raises:
+        FileNotFoundError: If SCHEMA_OFFLINE is True and the schema is not cached or bundled.
+    """
+    key = (database, schema_name, branch)
+    if key in _SCHEMAS:
+        return _SCHEMAS[key]
+
+    for root in [SCHEMA_CACHE_DIR, SCHEMA_BUNDLE_DIR]:
+        if not root:
+            continue
+        local_file = schema_file(root, *key)
+        if os.path.isfile(local_file):
+            with open(local_file, "r") as fn:
+                _SCHEMAS[key] = json.load(fn)
+            return _SCHEMAS[key]
+
+    if SCHEMA_OFFLINE:
+        raise FileNotFoundError("Schema {} for database {} (version {}) is not in the schema cache and SCHEMA_OFFLINE "
+                                "is True.".format(schema_name, database, branch))
+    schema_url = "https://raw.githubusercontent.com/D3TaLES/schema/{}/schema_{}/{}.schema.json".format(
+        branch, database, schema_name).replace("robotics_", "")
+    response = request.urlopen(schema_url)
+    schema = json.loads(response.read().decode())
+
+    # Write to schema cache; write then rename so concurrent workers never read a partial file
+    if not SCHEMA_CACHE_DIR:
+        _SCHEMAS[key] = schema
+        return schema
+    cache_file = schema_file(SCHEMA_CACHE_DIR, *key)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        temp_file = "{}.{}.tmp".format(cache_file, os.getpid())
+        with open(temp_file, "w") as fn:
+            json.dump(schema, fn, indent=2)
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        warnings.warn("Schema {} could not be written to the schema cache: {}".format(schema_name, e))
+
+    _SCHEMAS[key] = schema
+    return schema
+
+
 class Schema2Class:
     """
-    Get D3TaLES schema from GitHub and load it to a class
+    Get D3TaLES schema (from the local schema cache or GitHub) and load it to a class
     Copyright 2021, University of Kentucky
     """
 
@@ -72,14 +160,14 @@ class Schema2Class:
         self.database = database
         self.branch = schema_version or "main"
         self.schema_name = '{}/{}'.format(schema_directory, schema_name) if schema_directory else schema_name
-        schema_url = "https://raw.githubusercontent.com/D3TaLES/schema/{}/schema_{}/{}.schema.json".format(
-            self.branch, self.database, self.schema_name).replace("robotics_", "")
-        # print(schema_url)
-        response = request.urlopen(schema_url)
-        self.schema = json.loads(response.read().decode())
+        self._key = (self.database, self.schema_name, self.branch)
+        self.schema = load_schema(*self._key)
         # generating classes
-        builder = pjs.ObjectBuilder(self.schema)
-        ns = builder.build_classes(named_only=named_only)
+        ns_key = self._key + (named_only,)
+        if ns_key not in _SCHEMA_NAMESPACES:
+            builder = pjs.ObjectBuilder(self.schema)
+            _SCHEMA_NAMESPACES[ns_key] = builder.build_classes(named_only=named_only)
+        ns = _SCHEMA_NAMESPACES[ns_key]
 
         # get all name space
         for name_space in dir(ns):
@@ -94,21 +182,105 @@ class Schema2Class:
         else:
             self.required = None
 
+    @property
+    def validator(self):
+        """
+        Returns the compiled jsonschema validator for this schema, memoized per process.
+
+        Returns:
+            jsonschema.protocols.Validator: Validator for this schema.
+        """
+        if self._key not in _SCHEMA_VALIDATORS:
+            validator_cls = jsonschema.validators.validator_for(self.schema)
+            validator_cls.check_schema(self.schema)
+            _SCHEMA_VALIDATORS[self._key] = validator_cls(self.schema)
+        return _SCHEMA_VALIDATORS[self._key]
+
+    def validate(self, instance):
+        """
+        Validates an instance against this schema.
+
+        Args:
+            instance (dict): Instance to validate.
+
+        Raises:
+            jsonschema.ValidationError: If the instance is not valid.
+        """
+        error = jsonschema.exceptions.best_match(self.validator.iter_errors(instance))
+        if error is not None:
+            raise error
+
+
+_MONGO_CLIENTS = {}
+_MONGO_CLIENTS_LOCK = threading.Lock()
+
+# db_infos.json pool setting names --> MongoClient keyword arguments
+POOL_SETTINGS = {
+    "max_pool_size": "maxPoolSize",
+    "min_pool_size": "minPoolSize",
+    "max_idle_time_ms": "maxIdleTimeMS",
+    "wait_queue_timeout_ms": "waitQueueTimeoutMS",
+    "connect_timeout_ms": "connectTimeoutMS",
+    "socket_timeout_ms": "socketTimeoutMS",
+    "server_selection_timeout_ms": "serverSelectionTimeoutMS",
+}
+
+
+def get_mongo_client(host, port=None, username=None, password=None, **kwargs):
+    """
+    Returns a shared MongoClient for the given host and credentials, creating it on first use.
+
+    Clients are pooled per process, so every database object in a worker reuses the same connections. The process
+    ID is part of the registry key because MongoClient instances must not be shared across a fork.
+
+    Args:
+        host (str): MongoDB host or connection URI.
+        port (int, optional): MongoDB port. Defaults to None.
+        username (str, optional): Username. Defaults to None.
+        password (str, optional): Password. Defaults to None.
+        **kwargs: Additional MongoClient keyword arguments (e.g., pool size and timeout settings).
+
+    Returns:
+        pymongo.MongoClient: The shared client.
+    """
+    key = (os.getpid(), host, port, username, password, tuple(sorted(kwargs.items())))
+    with _MONGO_CLIENTS_LOCK:
+        client = _MONGO_CLIENTS.get(key)
+        if client is None:
+            if "@" in host:
+                client = MongoClient(host, **kwargs)
+            else:
+                client = MongoClient(host=host, port=port, username=username, password=password, **kwargs)
+            _MONGO_CLIENTS[key] = client
+        return client
+
+
+def close_mongo_clients():
+    """Closes and forgets all shared MongoClients created by this process."""
+    with _MONGO_CLIENTS_LOCK:
+        for key in [k for k in _MONGO_CLIENTS if k[0] == os.getpid()]:
+            _MONGO_CLIENTS.pop(key).close()
+
 
 class DBconnector:
     """
     Class to retrieve a collection from a database and insert new entry.
-    Requires a db_infos.json file with credentials
+    Requires a db_infos.json file with credentials. Connection pool settings (`max_pool_size`, `min_pool_size`,
+    `max_idle_time_ms`, `wait_queue_timeout_ms`, `connect_timeout_ms`, `socket_timeout_ms`, and
+    `server_selection_timeout_ms`) may also be set for each database in db_infos.json.
     Copyright 2021, University of Kentucky
     """
 
-    def __init__(self, db_information: dict):
+    def __init__(self, db_information: dict, backend=DB_BACKEND):
         """
         Initializes the DBconnector object with database information.
 
         Args:
             db_information (dict): Dictionary containing database information.
+            backend (str, optional): "mongo" to connect to MongoDB or "memory" to use the in-process memory
+                database. Defaults to DB_BACKEND.
         """
+        self.backend = backend
 
         self.host = db_information.get("host", )
         self.password = db_information.get("admin_password", )
@@ -116,22 +288,22 @@ class DBconnector:
         self.port = int(db_information.get("port", 0))
         self.database = db_information.get("database", )
         self.collection = db_information.get("collection", )
+        self.pool_settings = {v: db_information[k] for k, v in POOL_SETTINGS.items()
+                              if db_information.get(k) is not None}
 
     def get_database(self, **kwargs):
         """
-        Returns a database object.
+        Returns a database object from the shared client for this host, or from the in-process memory client if
+        the backend is "memory".
 
         Returns:
             pymongo.database.Database: A database object.
         """
+        if self.backend == "memory":
+            return MEMORY_CLIENT[self.database]
         try:
-            if "@" in self.host:
-                conn = MongoClient(self.host)
-            else:
-                conn = MongoClient(host=self.host, port=self.port,
-                                   username=self.user,
-                                   password=self.password, **kwargs)
-
+            conn = get_mongo_client(self.host, port=self.port, username=self.user, password=self.password,
+                                    **{**self.pool_settings, **kwargs})
             db = conn[self.database]
         except:
             raise ConnectionError
@@ -164,7 +336,8 @@ class MongoDatabase:
     """
 
     def __init__(self, database=None, collection_name=None, instance=None, schema_layer="", schema_directory=None,
-                 public=None, schema_db=None, default_id=None, validate_schema=True, verbose=1, schema_version=None):
+                 public=None, schema_db=None, default_id=None, validate_schema=True, verbose=1, schema_version=None,
+                 backend=None):
         """
         Initializes the MongoDatabase object.
 
@@ -180,13 +353,15 @@ class MongoDatabase:
             validate_schema (bool, optional): Validates schema if True. Defaults to True.
             verbose (int, optional): Verbosity level. Defaults to 1.
             schema_version (str, optional): Version of the schema. Defaults to None.
+            backend (str, optional): Database backend, "mongo" or "memory". Defaults to DB_BACKEND.
         """
         self.collection_name = collection_name
         self.instance = {schema_layer: self.dot2dict(instance)} if schema_layer else self.dot2dict(instance)
         self.database = database
         self.verbose = verbose
         self.public = public
-        self.dbc = DBconnector(DB_INFO.get(self.database))
+        self.backend = backend or DB_BACKEND
+        self.dbc = DBconnector(DB_INFO.get(self.database) or {"database": self.database}, backend=self.backend)
         self.coll = self.dbc.get_collection(self.collection_name)
         schema_db = schema_db or database
 
@@ -195,9 +370,9 @@ class MongoDatabase:
             self.instance['_id'] = self.instance.get("_id") or default_id
             self.s2c = Schema2Class(schema_name=collection_name, database=schema_db, schema_directory=schema_directory,
                                     schema_version=schema_version)
-            jsonschema.validate(schema=self.s2c.schema, instance=self.instance)
+            self.s2c.validate(self.instance)
 
-    def insert(self, _id, nested=False, update_public=True, instance=None, override_lists=True):
+    def insert(self, _id, nested=False, update_public=True, instance=None, override_lists=True, bulk=True):
         """
         Upserts a dictionary into a MongoDB collection.
 
@@ -207,10 +382,20 @@ class MongoDatabase:
             update_public (bool, optional): Updates the public status if True. Defaults to True.
             instance (dict, optional): Instance to be inserted. Defaults to None.
             override_lists (bool, optional): Overrides existing lists in insertion if True. Defaults to True.
+            bulk (bool, optional): Writes the whole instance in one update (or one ordered bulk write if paths
+                overlap) if True; issues one update per key if False. Defaults to True.
         """
         if not instance:
             instance = jsanitize(self.instance, allow_bson=True)
 
+        if bulk:
+            operations = [("$set", "public", self.public)] if isinstance(self.public, bool) and update_public else []
+            operations.extend(self.insert_operations(instance, nested=nested, override_lists=override_lists))
+            self.write_operations(_id, operations)
+            print("{} {}... inserted into the {} database.".format(_id, str(instance)[:15],
+                                                                   self.database)) if self.verbose > 1 else None
+            return
+
         # Update public status
         if isinstance(self.public, bool) and update_public:
             self.coll.update_one({"_id": _id}, {"$set": {"public": self.public}}, upsert=True)
@@ -219,7 +404,7 @@ class MongoDatabase:
             if nested and isinstance(v, dict):
                 for nest_k, nest_v in v.items():
                     new_path = ".".join(path.split(".") + [nest_k])
-                    self.insert(_id, nested=True, update_public=False, instance={new_path: nest_v})
+                    self.insert(_id, nested=True, update_public=False, instance={new_path: nest_v}, bulk=False)
 
             elif isinstance(v, list) and not override_lists:
                 self.array_checker(path, _id)
@@ -230,6 +415,71 @@ class MongoDatabase:
         print("{} {}... inserted into the {} database.".format(_id, str(instance)[:15],
                                                                self.database)) if self.verbose > 1 else None
 
+    @staticmethod
+    def insert_operations(instance: dict, nested=False, override_lists=True):
+        """
+        Flattens an instance into the update operations `insert` would apply, in order.
+
+        Args:
+            instance (dict): Instance to be inserted.
+            nested (bool, optional): Flattens nested dictionaries into dot-notation paths if True. Defaults to False.
+            override_lists (bool, optional): Uses $set for top-level lists if True, $addToSet if False.
+                Defaults to True. Lists inside nested dictionaries are always set.
+
+        Returns:
+            list: List of (operator, path, value) tuples.
+        """
+        operations = []
+        for path, v in instance.items():
+            if nested and isinstance(v, dict):
+                for nest_k, nest_v in v.items():
+                    new_path = ".".join(path.split(".") + [nest_k])
+                    operations.extend(MongoDatabase.insert_operations({new_path: nest_v}, nested=True))
+            elif isinstance(v, list) and not override_lists:
+                operations.append(("$addToSet", path, v))
+            else:
+                operations.append(("$set", path, v))
+        return operations
+
+    def write_operations(self, _id, operations: list):
+        """
+        Upserts a list of (operator, path, value) operations for one document.
+
+        All operations are combined into a single update unless two paths overlap (e.g., `data` and `data.x`), in
+        which case they are sent as one ordered bulk write so they apply in the same order as individual updates.
+
+        Args:
+            _id (str): Instance ID.
+            operations (list): List of (operator, path, value) tuples, where operator is "$set" or "$addToSet".
+        """
+        if not operations:
+            return
+        if self._paths_overlap([path for _, path, _ in operations]):
+            self.coll.bulk_write([UpdateOne({"_id": _id}, self._update_doc([op]), upsert=True) for op in operations],
+                                 ordered=True)
+        else:
+            self.coll.update_one({"_id": _id}, self._update_doc(operations), upsert=True)
+
+    @staticmethod
+    def _paths_overlap(paths: list):
+        """Checks if any path equals another path or one of its parent paths (e.g., `data` and `data.x`)."""
+        seen, parents = set(), set()
+        for path in paths:
+            keys = path.split(".")
+            prefixes = {".".join(keys[:i]) for i in range(1, len(keys))}
+            if path in seen or path in parents or prefixes & seen:
+                return True
+            seen.add(path)
+            parents |= prefixes
+        return False
+
+    @staticmethod
+    def _update_doc(operations: list):
+        update = {}
+        for operator, path, value in operations:
+            update.setdefault(operator, {})[path] = {"$each": value} if operator == "$addToSet" else value
+        return update
+
     def path_insert(self, _id, path, value):
         """
         Inserts a value at a specific path in the collection.
@@ -270,25 +520,40 @@ class MongoDatabase:
         result = self.coll.find_one({field: entry})
         return result if result else {}
 
-    def make_query(self, query: dict = None, projection: dict = None, output="pandas", multi=True, limit=200):
+    def make_query(self, query: dict = None, projection: dict = None, output="pandas", multi=True, limit=None,
+                   batch_size=500, after_id=None):
         """
         Executes a MongoDB database query.
 
         Args:
             query (dict, optional): Query parameters. Defaults to an empty dictionary.
             projection (dict, optional): Fields to include or exclude. Defaults to an empty dictionary.
-            output (str, optional): Output type, can be "pandas", "json", or list. Defaults to "pandas".
+            output (str, optional): Output type, can be "pandas", "json", "stream", "numpy", "arrow", or list.
+                Defaults to "pandas". "stream" returns a generator of documents (see `iter_query`); "numpy" and
+                "arrow" return a generator of columnar batches (see `iter_columns`).
             multi (bool, optional): If True, returns multiple query responses. If False, returns a single result.
                 Defaults to True.
-            limit (int, optional): Maximum number of responses to return. Defaults to 200.
+            limit (int, optional): Maximum number of responses to return; 0 for no limit. Defaults to 200, or no
+                limit for "stream", "numpy", and "arrow" output.
+            batch_size (int, optional): Documents per server round trip for "stream", "numpy", and "arrow" output.
+                Defaults to 500.
+            after_id (optional): For "stream", "numpy", and "arrow" output, resume after this `_id`. Defaults to None.
 
         Returns:
             1) A dataframe if output="pandas"
-            2) A list if multi=False and a pymongo dursor if multi=True; output != "pandas
+            2) A generator if output is "stream", "numpy", or "arrow"
+            3) A list if multi=False and a pymongo dursor if multi=True; output != "pandas
         """
         query = query or {}
         projection = projection or {}
 
+        if output == "stream":
+            return self.iter_query(query, projection, batch_size=batch_size, after_id=after_id, limit=limit or 0)
+        if output in ("numpy", "arrow"):
+            return self.iter_columns(query, fields=projection, batch_size=batch_size, after_id=after_id,
+                                     limit=limit or 0, output=output)
+        limit = 200 if limit is None else limit
+
         if multi:
             if projection:
                 cursor = self.coll.find(query, projection).limit(limit)
@@ -303,11 +568,97 @@ class MongoDatabase:
         if output == "pandas":
             return pd.DataFrame.from_records(cursor)
         elif output == "json":
-            json_data = json.loads(json.dumps(list(cursor), ))
-            return json_data
+            return jsanitize(list(cursor))
         else:
             return list(cursor)
 
+    def iter_query(self, query: dict = None, projection: dict = None, batch_size=500, after_id=None, limit=0):
+        """
+        Streams query results in `_id` order, one page of `batch_size` documents at a time, so memory use is
+        bounded by the page size. Each page is a fresh query resuming after the last `_id` seen, so an interrupted
+        stream can be resumed by passing the last `_id` it yielded as `after_id`.
+
+        Args:
+            query (dict, optional): Query parameters. Defaults to an empty dictionary.
+            projection (dict, optional): Fields to include or exclude (applied by the server). Defaults to all
+                fields.
+            batch_size (int, optional): Documents per page. Defaults to 500.
+            after_id (optional): Resume after this `_id`. Defaults to None.
+            limit (int, optional): Maximum number of documents to yield; 0 for no limit. Defaults to 0.
+
+        Yields:
+            dict: Documents.
+        """
+        query = query or {}
+        projection = dict(projection) if projection else None
+        drop_id = bool(projection) and not projection.get("_id", 1)
+        if drop_id:
+            projection.pop("_id")  # _id is needed to resume the next page
+            projection = projection or None
+
+        count = 0
+        while True:
+            page_query = {"$and": [query, {"_id": {"$gt": after_id}}]} if after_id is not None else query
+            page_size = min(batch_size, limit - count) if limit else batch_size
+            cursor = self.coll.find(page_query, projection).sort("_id", 1).limit(page_size).batch_size(page_size)
+            n = 0
+            for doc in cursor:
+                n += 1
+                after_id = doc["_id"]
+                if drop_id:
+                    doc.pop("_id")
+                yield doc
+            count += n
+            if n < page_size or (limit and count >= limit):
+                return
+
+    def iter_columns(self, query: dict = None, fields=None, batch_size=500, after_id=None, limit=0, output="numpy"):
+        """
+        Streams query results as columnar batches. Only the requested fields are fetched from the server.
+
+        Args:
+            query (dict, optional): Query parameters. Defaults to an empty dictionary.
+            fields (list or dict, optional): Field paths (dot notation) to return as columns. Defaults to all
+                top-level fields of each batch.
+            batch_size (int, optional): Documents per batch. Defaults to 500.
+            after_id (optional): Resume after this `_id`. Defaults to None.
+            limit (int, optional): Maximum number of documents; 0 for no limit. Defaults to 0.
+            output (str, optional): "numpy" for a dict of field --> numpy array, or "arrow" for a pyarrow Table
+                (requires pyarrow). Defaults to "numpy".
+
+        Yields:
+            dict or pyarrow.Table: One columnar batch per page of results.
+        """
+        if output == "arrow":
+            try:
+                import pyarrow as pa
+            except ModuleNotFoundError:
+                raise ImportError("pyarrow is required for arrow output. Install it with `pip install pyarrow`.")
+        fields = [f for f, v in fields.items() if v] if isinstance(fields, dict) else list(fields or [])
+        projection = {f: 1 for f in fields} if fields else None
+
+        batch = []
+        for doc in self.iter_query(query, projection, batch_size=batch_size, after_id=after_id, limit=limit):
+            batch.append(doc)
+            if len(batch) == batch_size:
+                yield self._columns(batch, fields, output)
+                batch = []
+        if batch:
+            yield self._columns(batch, fields, output)
+
+    @staticmethod
+    def _columns(docs, fields, output):
+        fields = fields or list(dict.fromkeys(["_id"] + [k for d in docs for k in d]))
+        columns = {}
+        for field in fields:
+            values = [dotty(d).get(field) if "." in field else d.get(field) for d in docs]
+            columns[field] = values if output == "arrow" else np.asarray(values, dtype=object if any(
+                isinstance(v, (dict, list, str)) or v is None for v in values) else None)
+        if output == "arrow":
+            import pyarrow as pa
+            return pa.table({k: pa.array([jsanitize(v) for v in vals]) for k, vals in columns.items()})
+        return columns
+
     @staticmethod
     def dot2dict(dot_dict):
         """
@@ -334,16 +685,243 @@ class MongoDatabase:
         return dot_dict
 
 
+class StatusJournal(MongoDatabase):
+    """
+    Append-only journal of status changes, stored in the `status_events` collection. Each event records the
+    status collection, the entity (status document ID), a per-entity sequence number, the status field, the old and
+    new values, and a timestamp. Status documents hold only current values; histories are rebuilt from the journal.
+
+    A status change and its event are written in the same update: the event is appended to the status document's
+    `_events` (pending events) array, then copied to the journal and removed from the document by `flush`. If a
+    worker stops between the two steps, the event stays pending and is flushed by the next write to that document,
+    a history read, or `replay`. With STATUS_HISTORY_CAP set, only the latest events per document and field are kept.
+    """
+    _indexed = set()  # (backend, full collection name) of journals with ensured indexes
+
+    def __init__(self, backend=None):
+        """
+        Initializes the StatusJournal.
+
+        Args:
+            backend (str, optional): Database backend, "mongo" or "memory". Defaults to DB_BACKEND.
+        """
+        super().__init__("robotics", "status_events", validate_schema=False, backend=backend)
+
+    def ensure_indexes(self):
+        """Creates the journal indexes (once per process)."""
+        key = (self.backend, self.coll.full_name)
+        if key in StatusJournal._indexed:
+            return
+        self.coll.create_index([("collection", 1), ("entity", 1), ("seq", 1)])
+        self.coll.create_index([("collection", 1), ("entity", 1), ("field", 1)])
+        StatusJournal._indexed.add(key)
+
+    def record(self, collection: str, entity: str, seq: int, field: str, old=None, new=None, kind="update",
+               props: dict = None):
+        """
+        Appends an event directly to the journal. Status writes use pending events and `flush` instead, so the
+        event cannot be lost between the status update and the journal write.
+
+        Args:
+            collection (str): Status collection name (e.g., "status_vials").
+            entity (str): Status document ID.
+            seq (int): Sequence number of the change for this entity.
+            field (str): Status field (e.g., "location").
+            old: Value before the change. Defaults to None.
+            new: Value after the change (or the appended entry). Defaults to None.
+            kind (str, optional): "update" if `new` replaced `current_<field>`, "append" if `new` is a history
+                entry. Defaults to "update".
+            props (dict, optional): Other properties set on the status document by the same change.
+
+        Returns:
+            dict: The event.
+        """
+        event = self.event(collection, entity, seq, field, old=old, new=new, kind=kind, props=props)
+        self.coll.insert_one(event)
+        return event
+
+    @staticmethod
+    def event(collection: str, entity: str, seq: int, field: str, old=None, new=None, kind="update",
+              props: dict = None, timestamp: datetime = None):
+        """
+        Builds a journal event without writing it. See `record`.
+
+        Returns:
+            dict: The event.
+        """
+        event = {"_id": "{}/{}/{}".format(collection, entity, seq), "collection": collection, "entity": entity,
+                 "seq": seq, "field": field, "kind": kind, "old": old, "new": new,
+                 "timestamp": timestamp or datetime.now()}
+        if props:
+            event["set"] = props
+        return jsanitize(event, allow_bson=True)
+
+    @staticmethod
+    def pending_event(seq, field: str, old=None, new=None, kind="update", props: dict = None):
+        """
+        Builds an event to store in a status document's `_events` array until it is flushed. `seq` and `old` may
+        be aggregation expressions when the event is built inside a pipeline update.
+
+        Returns:
+            dict: The pending event.
+        """
+        event = {"seq": seq, "field": field, "kind": kind, "old": old, "new": new, "timestamp": datetime.now()}
+        if props:
+            event["props"] = props
+        return jsanitize(event, allow_bson=True)
+
+    def flush(self, collection: str, pending: dict):
+        """
+        Copies pending events into the journal, then removes them from their status documents. Copying is
+        idempotent (events are keyed by collection, entity and sequence number), so a repeated flush is harmless.
+
+        Args:
+            collection (str): Status collection name.
+            pending (dict): Status document ID --> list of pending events (see `pending_event`).
+
+        Returns:
+            list: The journal events written.
+        """
+        pending = {_id: p for _id, p in pending.items() if p}
+        if not pending:
+            return []
+        events = [self.event(collection, _id, **e) for _id, p in pending.items() for e in p]
+        self.coll.bulk_write([ReplaceOne({"_id": e["_id"]}, e, upsert=True) for e in events], ordered=False)
+        self.dbc.get_collection(collection).bulk_write(
+            [UpdateOne({"_id": _id}, {"$pull": {PENDING_EVENTS: {"seq": {"$in": [e["seq"] for e in p]}}}})
+             for _id, p in pending.items()], ordered=False)
+        if STATUS_HISTORY_CAP:
+            self.prune(collection, {(e["entity"], e["field"]) for e in events})
+        return events
+
+    def flush_collection(self, collection: str, entity=None):
+        """
+        Flushes every pending event left in a status collection (e.g., by a worker that stopped mid-write).
+
+        Args:
+            collection (str): Status collection name.
+            entity (str or list, optional): Status document ID(s). Defaults to all entities.
+
+        Returns:
+            list: The journal events written.
+        """
+        query = {PENDING_EVENTS: {"$exists": True, "$ne": []}}
+        if entity is not None:
+            query["_id"] = {"$in": entity} if isinstance(entity, (list, tuple, set)) else entity
+        docs = self.dbc.get_collection(collection).find(query, {PENDING_EVENTS: 1})
+        return self.flush(collection, {d["_id"]: d.get(PENDING_EVENTS) for d in docs})
+
+    def prune(self, collection: str, keys, cap: int = None):
+        """
+        Deletes all but the latest `cap` events for each status document and field. The latest event of each field
+        is always kept, so `replay` still reconstructs the current values.
+
+        Args:
+            collection (str): Status collection name.
+            keys (iterable): (status document ID, field) pairs to prune.
+            cap (int, optional): Events to keep per document and field. Defaults to STATUS_HISTORY_CAP.
+        """
+        cap = cap or STATUS_HISTORY_CAP
+        for entity, field in keys:
+            old = self.coll.find({"collection": collection, "entity": entity, "field": field}, {"_id": 1})
+            old = [e["_id"] for e in old.sort("seq", -1).skip(cap)]
+            if old:
+                self.coll.delete_many({"_id": {"$in": old}})
+
+    def events(self, collection: str, entity=None, field: str = None, **query):
+        """
+        Gets journal events in sequence order.
+
+        Args:
+            collection (str): Status collection name.
+            entity (str or list, optional): Status document ID(s). Defaults to all entities.
+            field (str, optional): Status field. Defaults to all fields.
+            **query: Additional query conditions.
+
+        Returns:
+            list: Events, ordered by entity and sequence number.
+        """
+        query.update({"collection": collection})
+        if entity is not None:
+            query["entity"] = {"$in": entity} if isinstance(entity, (list, tuple, set)) else entity
+        if field:
+            query["field"] = field
+        return list(self.coll.find(query).sort([("entity", 1), ("seq", 1)]))
+
+    def history(self, collection: str, entity: str, field: str):
+        """
+        Rebuilds a status history. For updated fields (e.g., "location") the history holds the previous values,
+        for appended fields (e.g., vial "content") it holds the appended entries.
+
+        Args:
+            collection (str): Status collection name.
+            entity (str): Status document ID.
+            field (str): Status field.
+
+        Returns:
+            list: The history, oldest first.
+        """
+        return [e.get("new") if e.get("kind") == "append" else e.get("old")
+                for e in self.events(collection, entity=entity, field=field)]
+
+    def replay(self, collection: str, entity=None, apply=False):
+        """
+        Reconstructs current status values from the journal, e.g., to repair status documents after a crash.
+
+        Args:
+            collection (str): Status collection name.
+            entity (str or list, optional): Status document ID(s). Defaults to all entities.
+            apply (bool, optional): Writes the reconstructed values to the status collection if True.
+                Defaults to False.
+
+        Returns:
+            dict: Status document ID --> reconstructed properties (including `_seq`).
+        """
+        self.flush_collection(collection, entity=entity)
+        state = {}
+        for event in self.events(collection, entity=entity):
+            props = state.setdefault(event["entity"], {})
+            if event.get("kind") == "update":
+                props["current_" + event["field"]] = event.get("new")
+            props.update(event.get("set") or {})
+            props["_seq"] = event["seq"]
+        if apply and state:
+            status_coll = self.dbc.get_collection(collection)
+            status_coll.bulk_write([UpdateOne({"_id": _id}, {"$set": props}, upsert=True)
+                                    for _id, props in state.items()], ordered=False)
+            RobotStatusDB._write_generations[collection] = RobotStatusDB._write_generations.get(collection, 0) + 1
+        return state
+
+    def clear(self, collection: str, entity=None):
+        """
+        Deletes journal events for a status collection (e.g., when the status collection is reset).
+
+        Args:
+            collection (str): Status collection name.
+            entity (str, optional): Status document ID. Defaults to all entities.
+        """
+        query = {"collection": collection}
+        if entity is not None:
+            query["entity"] = entity
+        self.coll.delete_many(query)
+
+
 class RobotStatusDB(MongoDatabase):
     """
     Provides access to the Robot Status database.
 
-    This class is used to interact with the status database for a specific type of apparatus.
+    This class is used to interact with the status database for a specific type of apparatus. Property reads are
+    served from a per-instance snapshot of the status document, which is fetched once and reused until
+    `refresh` is called, a write is made through any status object in this process, or a new task starts (see
+    `start_task`). Station claims are the status that other workers change during a task, so claim and availability
+    reads (e.g., `available`, `owner`, `lease_expires`) use `get_prop(prop, refresh=True)`.
     Copyright 2021, University of Kentucky.
     """
+    _write_generations = {}  # collection name --> number of local writes made to that collection
+    _task_epoch = 0  # number of tasks started in this process; snapshots from earlier tasks are discarded
 
     def __init__(self, apparatus_type: str, _id: str = None, instance: dict = None,
-                 override_lists: bool = True, wflow_name: str = None, validate_schema=False):
+                 override_lists: bool = True, wflow_name: str = None, validate_schema=False, backend=None):
         """
         Initializes the RobotStatusDB class.
 
@@ -355,14 +933,18 @@ class RobotStatusDB(MongoDatabase):
             wflow_name (str, optional): Name of the active workflow. If set, verifies that the instance has the
                 appropriate workflow name. Defaults to None.
             validate_schema (bool, optional): If True, validates the instance against the schema. Defaults to False.
+            backend (str, optional): Database backend, "mongo" or "memory". Defaults to DB_BACKEND.
 
         Raises:
             IOError: If no ID is provided for the status database insertion.
         """
         super().__init__("robotics", 'status_' + apparatus_type, instance, schema_db='robot',
-                         validate_schema=validate_schema)
+                         validate_schema=validate_schema, backend=backend)
         self.id = _id or self.instance.get("_id")
         self.wflow_name = wflow_name
+        self._doc = None
+        self._doc_key = None
+        self._journal = None
 
         if instance:
             instance["_id"] = self.id
@@ -376,6 +958,49 @@ class RobotStatusDB(MongoDatabase):
     def __str__(self):
         return self.id
 
+    @property
+    def _generation(self):
+        return RobotStatusDB._task_epoch, RobotStatusDB._write_generations.get(self.collection_name, 0)
+
+    @staticmethod
+    def start_task():
+        """
+        Drops the cached snapshots of every status object in this process, so no snapshot outlives the task that
+        fetched it. Called at the start of each Firetask.
+        """
+        RobotStatusDB._task_epoch += 1
+
+    @property
+    def document(self):
+        """
+        Gets the cached status document for this instance, fetching it only if no valid snapshot exists.
+
+        Returns:
+            dict: The status document, or an empty dict if no entry exists.
+        """
+        if self._doc is None or self._doc_key != (self.id, self._generation):
+            return self.refresh()
+        return self._doc
+
+    def refresh(self):
+        """
+        Re-fetches the status document from the database and replaces the cached snapshot.
+
+        Returns:
+            dict: The status document, or an empty dict if no entry exists.
+        """
+        self._doc = (self.coll.find_one({"_id": self.id}) if self.id else None) or {}
+        self._doc_key = (self.id, self._generation)
+        return self._doc
+
+    def invalidate(self):
+        """
+        Drops the cached snapshot for this instance and for every other status object reading the same collection
+        in this process. Must be called after any write to the collection.
+        """
+        self._doc = None
+        RobotStatusDB._write_generations[self.collection_name] = self._generation[1] + 1
+
     @property
     def exists(self):
         """Checks if an entry with the given ID exists in the database.
@@ -383,7 +1008,7 @@ class RobotStatusDB(MongoDatabase):
         Returns:
             bool: True if the entry exists, False otherwise.
         """
-        return bool(self.coll.find_one({"_id": self.id}))
+        return bool(self.document)
 
     def check_wflow_name(self):
         """Checks if the workflow name matches the instance's current workflow name.
@@ -392,36 +1017,391 @@ class RobotStatusDB(MongoDatabase):
             NameError: If the workflow name does not match the current instance's workflow name.
         """
         print("ID", self.id)
-        current_wflow = self.coll.find_one({"_id": self.id}).get("current_wflow_name")
+        current_wflow = self.document.get("current_wflow_name")
         if current_wflow == self.wflow_name:
             return True
         raise NameError("Argument wflow_name ({}) does not match instance current_wflow_name {}. "
                         "Make sure that only one workflow is initialized.".format(self.wflow_name, current_wflow))
 
-    def get_prop(self, prop: str):
+    def get_prop(self, prop: str, refresh=False):
         """
-        Retrieves a property from the database for the instance with the given ID.
+        Retrieves a property from the cached status document for the instance with the given ID.
 
         Args:
             prop (str): Name of the property to retrieve.
+            refresh (bool, optional): Re-fetches the status document first if True. Use for status that other
+                processes may change. Defaults to False.
 
         Returns:
             Any: The value of the property, or None if the property does not exist.
         """
-        return (self.coll.find_one({"_id": self.id}) or {}).get(prop)
+        return (self.refresh() if refresh else self.document).get(prop)
+
+    def insert(self, _id, **kwargs):
+        """
+        Upserts a dictionary into the status collection and invalidates cached status documents.
+
+        Args:
+            _id (str): ID for insertion.
+            **kwargs: Keyword arguments passed to MongoDatabase.insert.
+        """
+        super().insert(_id, **kwargs)
+        self.invalidate()
+
+    def path_insert(self, _id, path, value):
+        """
+        Inserts a value at a specific path in the status collection and invalidates cached status documents.
+
+        Args:
+            _id (str): Instance ID.
+            path (str): Path for insertion.
+            value: Value to insert.
+        """
+        super().path_insert(_id, path, value)
+        self.invalidate()
+
+    def update_props(self, **props):
+        """
+        Sets one or more top-level properties on the status document.
+
+        Args:
+            **props: Property names and their new values.
+
+        Returns:
+            pymongo.results.UpdateResult: Result of the update operation.
+        """
+        result = self.coll.update_one({"_id": self.id}, {"$set": props})
+        self.invalidate()
+        return result
+
+    def reset(self, documents: list, diff=True, validate_schema=False):
+        """
+        Replaces the contents of the status collection with a list of documents in one bulk write. Documents not in
+        the list are deleted.
+
+        Args:
+            documents (list): Status documents; each must have an `_id`.
+            diff (bool, optional): Leaves existing documents that already match (ignoring `_seq`) and their journal
+                events untouched if True. Defaults to True.
+            validate_schema (bool, optional): Validates all documents against the schema before writing if True.
+                Defaults to False.
+
+        Returns:
+            list: IDs of the documents that were written.
+
+        Raises:
+            IOError: If a document has no `_id`.
+        """
+        documents = [jsanitize(dict(d), allow_bson=True) for d in documents]
+        if not all(d.get("_id") for d in documents):
+            raise IOError("ID is required for {} status database insertion.".format(self.collection_name))
+        if validate_schema:
+            s2c = Schema2Class(schema_name=self.collection_name, database="robot")
+            for doc in documents:
+                s2c.validate(doc)
+
+        existing = {d["_id"]: d for d in self.coll.find({})} if diff else {}
+        unchanged = {_id for _id, d in existing.items()
+                     if {k: v for k, v in d.items() if k != "_seq"} in documents}
+        written = [d["_id"] for d in documents if d["_id"] not in unchanged]
+        requests = [ReplaceOne({"_id": d["_id"]}, d, upsert=True) for d in documents if d["_id"] not in unchanged]
+        requests.append(DeleteMany({"_id": {"$nin": [d["_id"] for d in documents]}}))
+        self.coll.bulk_write(requests, ordered=True)
+        self.journal.coll.delete_many({"collection": self.collection_name, "entity": {"$nin": list(unchanged)}})
+        self.invalidate()
+        return written
+
+    @property
+    def journal(self):
+        """
+        Gets the status event journal.
+
+        Returns:
+            StatusJournal: The journal.
+        """
+        if self._journal is None:
+            self._journal = StatusJournal(backend=self.backend)
+        return self._journal
+
+    def history(self, status_name: str):
+        """
+        Rebuilds a status history (e.g., "location" or "content") from the status event journal.
+
+        Args:
+            status_name (str): Name of the status.
+
+        Returns:
+            list: The history, oldest first.
+        """
+        self.flush_journal()
+        return self.journal.history(self.collection_name, self.id, status_name)
+
+    def flush_journal(self):
+        """
+        Copies any events still pending on this status document into the status event journal.
+        """
+        self.journal.flush_collection(self.collection_name, entity=self.id)
+
+    def _write_event(self, update: list):
+        """Applies a pipeline update that appends a pending event, then flushes the document's pending events."""
+        doc = self.coll.find_one_and_update({"_id": self.id}, update, upsert=True,
+                                            return_document=ReturnDocument.AFTER)
+        self.invalidate()
+        pending = doc.pop(PENDING_EVENTS, None) or []
+        self.journal.flush(self.collection_name, {self.id: pending})
+        self._doc, self._doc_key = doc, (self.id, self._generation)
+        return pending[-1]
+
+    def append_history(self, status_name: str, entry, **props):
+        """
+        Records a history entry in the status event journal and sets properties on the status document. The
+        properties and the pending event are written in one atomic update (see StatusJournal).
+
+        Args:
+            status_name (str): Name of the status the entry belongs to (e.g., "content").
+            entry: Entry to append to the history.
+            **props: Top-level properties to set on the status document.
+
+        Returns:
+            dict: The pending journal event.
+        """
+        event = StatusJournal.pending_event(NEXT_SEQ, status_name, new=entry, kind="append", props=props)
+        new_values = {k: {"$literal": v} for k, v in jsanitize(props, allow_bson=True).items()}
+        return self._write_event([{"$set": dict(new_values, _seq=NEXT_SEQ, **{PENDING_EVENTS: _append_pending(
+            _literal_event(event, "seq"))})}])
 
     def update_status(self, new_status: str or float, status_name: str = "location"):
         """
         Updates the status for a vial location or station vial.
 
+        The status document only holds the current status. The new status, the `_seq` counter and a pending
+        journal event (with the previous status) are written in one atomic update, then the event is flushed to the
+        status event journal, so the cost of an update does not grow with the history length and a crash cannot
+        lose the event.
+
         Args:
             new_status (str or float): New status, such as the new vial location or new vial in the station.
             status_name (str, optional): Name of the status property. Defaults to "location".
         """
-        current_status = self.get_prop("current_" + status_name)
-        history = self.get_prop(status_name + "_history") or []
-        history.append(current_status)
-        self.insert(self.id, override_lists=True, instance={
-            "current_" + status_name: new_status,
-            status_name + "_history": history
-        })
+        current_name = "current_" + status_name
+        event = StatusJournal.pending_event(NEXT_SEQ, status_name, old=None, new=new_status)
+        event = dict(_literal_event(event, "seq", "old"), old={"$ifNull": ["$" + current_name, None]})
+        self._write_event([{"$set": {current_name: {"$literal": event["new"]["$literal"]}, "_seq": NEXT_SEQ,
+                                     PENDING_EVENTS: _append_pending(event)}}])
+
+
+PENDING_EVENTS = "_events"  # status document field holding journal events that are not yet in the journal
+NEXT_SEQ = {"$add": [{"$ifNull": ["$_seq", 0]}, 1]}  # aggregation expression for a document's next _seq
+
+
+def _literal_event(event: dict, *expressions):
+    """Wraps the values of a pending event in $literal, except the keys that hold aggregation expressions."""
+    return {k: v if k in expressions else {"$literal": v} for k, v in event.items()}
+
+
+def _append_pending(event: dict):
+    """Aggregation expression appending an event to a status document's pending events."""
+    return {"$concatArrays": [{"$ifNull": ["$" + PENDING_EVENTS, []]}, [event]]}
+
+
+class StatusTransitionConflict(Exception):
+    """Raised when a status document changed between the read and the write of a StatusTransition."""
+
+
+class StatusTransition:
+    """
+    Stages status changes to several status documents (e.g., a vial and the stations it moves between) and
+    commits them together.
+
+    On commit, the staged documents are read once to get their current values and `_seq` counters. The changes
+    and their pending journal events (see StatusJournal) are then written as one bulk write per collection, with
+    each update conditioned on the `_seq` that was read, and the events are flushed to the journal. If the MongoDB
+    server supports transactions (replica set), the writes run in one transaction and are retried on conflict.
+
+    Without transactions (e.g., a standalone mongod or the memory backend), the collections are written one after
+    another. If a later write conflicts, the writes already made are rolled back and the transition is retried; a
+    conflict on the last attempt raises StatusTransitionConflict. Each written document carries a `_txn` token, and
+    only documents still holding it are restored. This is not atomic: other workers can briefly read the partly
+    applied transition before it is rolled back, and a crash between the collection writes leaves it partly
+    applied (the written documents keep their pending events).
+
+    Example:
+        with StatusTransition() as transition:
+            transition.update_status(vial, "balance_01", "location")
+            transition.update_status(station, vial.id, "content")
+            transition.update_props(station, available=False)
+    """
+    _transactions = {}  # (backend, host, database) --> whether the server supports transactions
+
+    def __init__(self, max_retries=3):
+        """
+        Initializes the StatusTransition.
+
+        Args:
+            max_retries (int, optional): Maximum attempts when a transaction conflicts. Defaults to 3.
+        """
+        self.max_retries = max_retries
+        self._changes = {}  # (collection name, _id) --> {"status": RobotStatusDB, "statuses": [], "props": {}}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.commit()
+
+    def _entry(self, status: RobotStatusDB):
+        if not status.id:
+            raise IOError("ID is required to stage a status change.")
+        return self._changes.setdefault((status.collection_name, status.id),
+                                        {"status": status, "statuses": [], "props": {}})
+
+    def update_status(self, status: RobotStatusDB, new_status, status_name: str = "location"):
+        """
+        Stages a status update (see RobotStatusDB.update_status).
+
+        Args:
+            status (RobotStatusDB): The status object.
+            new_status (str or float): The new status.
+            status_name (str, optional): Name of the status property. Defaults to "location".
+        """
+        self._entry(status)["statuses"].append((status_name, new_status))
+
+    def update_props(self, status: RobotStatusDB, **props):
+        """
+        Stages top-level properties to set (see RobotStatusDB.update_props).
+
+        Args:
+            status (RobotStatusDB): The status object.
+            **props: Property names and their new values.
+        """
+        self._entry(status)["props"].update(props)
+
+    def _plan(self):
+        """
+        Reads the staged documents and builds the writes: collection name --> (collection, updates, pending events
+        by document ID, rollbacks).
+        """
+        by_coll = {}
+        for (coll_name, _id), entry in self._changes.items():
+            by_coll.setdefault(coll_name, []).append(entry)
+
+        plan, token = {}, uuid.uuid4().hex  # token marks this attempt's writes, so only they are rolled back
+        for coll_name, entries in by_coll.items():
+            coll = entries[0]["status"].coll
+            docs = {d["_id"]: d for d in coll.find({"_id": {"$in": [e["status"].id for e in entries]}})}
+            updates, pending, rollbacks = [], {}, []
+            for entry in entries:
+                _id = entry["status"].id
+                doc = docs.get(_id)
+                seq = (doc or {}).get("_seq", 0)
+                new_values, events = {}, []
+                for i, (status_name, new_status) in enumerate(entry["statuses"]):
+                    current_name = "current_" + status_name
+                    old = new_values.get(current_name, (doc or {}).get(current_name))
+                    new_values[current_name] = new_status
+                    events.append(StatusJournal.pending_event(seq + i + 1, status_name, old=old, new=new_status))
+                new_values.update(entry["props"])
+                update = {"$set": dict(new_values, _txn=token)}
+                if events:
+                    update["$inc"] = {"_seq": len(events)}
+                    update["$push"] = {PENDING_EVENTS: {"$each": events}}
+                # Events left pending by an earlier write are flushed along with this transition's events
+                pending[_id] = ((doc or {}).get(PENDING_EVENTS) or []) + events
+                seq_filter = seq if doc and "_seq" in doc else {"$exists": False}
+                updates.append(UpdateOne({"_id": _id, "_seq": seq_filter}, update, upsert=doc is None))
+                rollbacks.append(self._rollback_op(_id, doc, dict(new_values, _txn=token), token))
+            plan[coll_name] = (coll, updates, pending, rollbacks)
+        return plan
+
+    @staticmethod
+    def _rollback_op(_id, doc, new_values, token):
+        """Builds the write that restores one document, matched only if it still holds this attempt's write."""
+        if doc is None:
+            return DeleteOne({"_id": _id, "_txn": token})
+        fields = list(new_values) + ["_seq", PENDING_EVENTS]
+        restore = {"$set": {k: doc[k] for k in fields if k in doc}, "$unset": {k: "" for k in fields if k not in doc}}
+        return UpdateOne({"_id": _id, "_txn": token}, {k: v for k, v in restore.items() if v})
+
+    def _apply(self, plan, session=None):
+        """
+        Writes a plan. Raises StatusTransitionConflict if any staged document changed since it was read. Outside a
+        transaction, the collections already written are rolled back before raising.
+        """
+        kwargs = {"session": session} if session else {}
+        written = []
+        for coll_name, (coll, updates, pending, rollbacks) in plan.items():
+            written.append((coll, rollbacks))
+            try:
+                result = coll.bulk_write(updates, ordered=True, **kwargs)
+                conflict = result.matched_count + result.upserted_count != len(updates)
+            except DuplicateKeyError:
+                conflict = True
+            if conflict:
+                if session is None:
+                    self._rollback(written)
+                raise StatusTransitionConflict("A {} document changed during the transition.".format(coll_name))
+
+    @staticmethod
+    def _rollback(written):
+        """Undoes non-transactional writes. Documents changed again by another worker are left as they are."""
+        for coll, rollbacks in reversed(written):
+            coll.bulk_write(rollbacks, ordered=False)
+
+    def _client(self, status: RobotStatusDB):
+        """Returns the MongoClient if the server supports transactions, otherwise None."""
+        db = status.dbc.get_database()
+        client = getattr(db, "client", None)
+        key = (status.backend, status.dbc.host, status.dbc.database)
+        if client is None:
+            return None
+        if key not in StatusTransition._transactions:
+            try:
+                StatusTransition._transactions[key] = client.admin.command("isMaster").get("setName") is not None
+            except OperationFailure:
+                StatusTransition._transactions[key] = False
+        return client if StatusTransition._transactions[key] else None
+
+    def commit(self):
+        """
+        Writes all staged changes with their pending journal events, flushes the events to the journal, then
+        clears the staged changes.
+
+        Raises:
+            StatusTransitionConflict: If a staged document still changed concurrently on the last attempt. Without
+                transactions, the writes already made are rolled back first.
+        """
+        if not self._changes:
+            return
+        statuses = [e["status"] for e in self._changes.values()]
+        journal = StatusJournal(backend=statuses[0].backend)
+        client = self._client(statuses[0])
+
+        for attempt in range(1, self.max_retries + 1):
+            plan = self._plan()
+            try:
+                if client is None:
+                    self._apply(plan)
+                    break
+                try:
+                    with client.start_session() as session:
+                        session.with_transaction(lambda s: self._apply(plan, session=s))
+                    break
+                except ConfigurationError:
+                    client = None
+                    plan = self._plan()
+                    self._apply(plan)
+                    break
+            except StatusTransitionConflict:
+                if attempt == self.max_retries:
+                    raise
+                print("Status transition conflicted with another worker; retrying.")
+
+        for coll_name, (_, _, pending, _) in plan.items():
+            journal.flush(coll_name, pending)
+        for status in statuses:
+            status.invalidate()
+        for entry in self._changes.values():
+            if entry["props"].get("available") is True:
+                STATUS_NOTIFIER.notify(entry["status"].coll)
+        self._changes = {}
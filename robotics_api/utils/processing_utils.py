@@ -1,11 +1,11 @@
-import pint
 import warnings
 import numpy as np
+from pint import DimensionalityError
 from datetime import datetime
 from robotics_api.settings import *
 from robotics_api.actions.db_manipulations import VialStatus
-from robotics_api.utils.base_utils import unit_conversion, sig_figs
-from robotics_api.actions.db_manipulations import ReagentStatus, ChemStandardsDB
+from robotics_api.utils.base_utils import UREG, unit_conversion, sig_figs, convert_quantity
+from robotics_api.actions.db_manipulations import ChemStandardsDB, REAGENT_REGISTRY
 from d3tales_api.Processors.parser_echem import CVDescriptorCalculator, CVPlotter, ProcessChiCV, ProcessChiCA, CAPlotter
 
 
@@ -24,7 +24,110 @@ def collection_dict(coll_data: list):
     return {tag: [d for d in coll_data if d.get("collect_tag") == tag] for tag in tags}
 
 
-def get_concentration(vial_content, solute_id, solv_id, soln_density=None, precision=3, mol_fraction=False):
+def reagent_properties(reagent_ids):
+    """
+    Get the molecular weight (g/mol) and density (in DENSITY_UNIT) of reagents from the workflow reagent registry.
+
+    Args:
+        reagent_ids (list): Reagent IDs.
+
+    Returns:
+        dict: Reagent ID --> {"molecular_weight": float or None, "density": float or None}
+    """
+    return REAGENT_REGISTRY.properties(reagent_ids)
+
+
+def _reagent_amount(amount, unit, density=None):
+    """
+    Convert a reagent amount to a unit, returning NaN if a mass <--> volume conversion is needed but no density is
+    known.
+    """
+    try:
+        return unit_conversion(amount, default_unit=unit, density=density)
+    except DimensionalityError:
+        return np.nan
+
+
+def solution_composition(vial_content, solv_id, soln_density=None, precision=3, reagent_props=None):
+    """
+    Calculate the mass, moles, concentration, and mol fraction of every reagent in a vial in one pass.
+
+    Reagent masses are only needed for moles and for the solution density volume. A reagent dispensed by volume
+    with no known density gets a NaN mass (and no moles, concentration, or mol fractions), but the solvent volume
+    is taken directly from the dispensed volume.
+
+    Args:
+        vial_content (list): List of dictionaries representing the content of the vial.
+        solv_id (str): Solvent reagent ID.
+        soln_density (str or float, optional): Solution density. If not provided, the solution volume is assumed to
+            be the solvent volume.
+        precision (int, optional): Significant figures for concentrations. Defaults to 3.
+        reagent_props (dict, optional): Pre-resolved reagent properties (see `reagent_properties`). Defaults to
+            the workflow reagent registry.
+
+    Returns:
+        dict: {"volume": solution volume in L, "reagents": reagent ID --> {"mass": g, "mols": mol,
+            "molarity": M, "concentration": str in CONCENTRATION_UNIT, "mol_fraction": float}}
+    """
+    ids = list(dict.fromkeys(r.get("reagent_uuid") for r in vial_content))
+    props = reagent_props if reagent_props is not None else reagent_properties(ids)
+    props = {i: props.get(i) or {} for i in ids}
+    densities = {i: f"{props[i]['density']}{DENSITY_UNIT}" if props[i].get("density") else None for i in ids}
+
+    # Masses (g) and moles of each reagent
+    idx = {i: n for n, i in enumerate(ids)}
+    masses = np.zeros(len(ids))
+    for r in vial_content:
+        masses[idx[r.get("reagent_uuid")]] += _reagent_amount(r.get("amount"), "g", densities[r.get("reagent_uuid")])
+    mws = np.array([props[i].get("molecular_weight") or np.nan for i in ids], dtype=float)
+    mols = masses / mws
+
+    # Solution volume (L)
+    if soln_density and unit_conversion(soln_density, default_unit=DENSITY_UNIT):
+        missing = [i for i in ids if np.isnan(masses[idx[i]])]
+        if missing:
+            raise ValueError(f"Solution volume cannot be calculated from the solution density because reagents "
+                             f"{missing} were reported as volume, but they do not have a density.")
+        volume = unit_conversion(f"{masses.sum()}g", default_unit="L", density=soln_density)
+    else:
+        warnings.warn("No solution density provided. The solution volume is assumed to be the solvent volume. "
+                      "This may not be accurate if volume expansion is present. ")
+        volume = sum(unit_conversion(r.get("amount"), default_unit="L", density=densities[solv_id])
+                     for r in vial_content if r.get("reagent_uuid") == solv_id)
+
+    molarity = mols / volume if volume else np.full(len(ids), np.nan)
+    mol_fractions = mols / mols.sum() if not np.isnan(mols).any() else np.full(len(ids), np.nan)
+    return {
+        "volume": volume,
+        "reagents": {i: {
+            "mass": float(masses[n]),
+            "mols": float(mols[n]),
+            "molarity": float(molarity[n]),
+            "concentration": format_concentration(molarity[n], precision),
+            "mol_fraction": None if np.isnan(mol_fractions[n]) else float(mol_fractions[n]),
+        } for i, n in idx.items()},
+    }
+
+
+def format_concentration(molarity: float, precision=3):
+    """
+    Format a molarity as a concentration string in CONCENTRATION_UNIT.
+
+    Args:
+        molarity (float): Concentration in M.
+        precision (int, optional): Significant figures. Defaults to 3.
+
+    Returns:
+        str: Concentration (EX: "0.01M"), or None if the molarity is NaN.
+    """
+    if np.isnan(molarity):
+        return None
+    conc_factor = unit_conversion("1M", default_unit=CONCENTRATION_UNIT)
+    return "{}{}".format(sig_figs(molarity * conc_factor, precision), CONCENTRATION_UNIT)
+
+
+def get_concentration(vial_content, solute_id, solv_id, soln_density=None, precision=3, mol_fraction=False,
+                      composition=None):
     """
    Calculate the concentration of a solute in a solvent based on the provided vial content.
 
@@ -35,62 +138,70 @@ def get_concentration(vial_content, solute_id, solv_id, soln_density=None, preci
        soln_density (float, optional):
        precision (int, optional):
        mol_fraction (bool, optional):
+       composition (dict, optional): Precomputed `solution_composition` for this vial content, so several
+           concentrations can be read from one calculation.
 
    Returns:
        str: Concentration of the solute in the solvent, expressed in molarity.
    """
     solute_masses = [r.get("amount") for r in vial_content if r.get("reagent_uuid") == solute_id]
     solv_amounts = [r.get("amount") for r in vial_content if r.get("reagent_uuid") == solv_id]
-    total_masses = [r.get("amount") for r in vial_content]
     if not solute_masses or not solv_amounts:
         if FIZZLE_CONCENTRATION_FAILURE:
             raise Exception(f"Concentration calculation did not work...check all variables: solute_id={solute_id}, "
                             f"solv_id={solv_id}, solute_mass={solute_masses}, solv_vol={solv_amounts}")
         return DEFAULT_CONCENTRATION
 
-    ureg = pint.UnitRegistry()
-    total_mass = sum([ureg(u) for u in total_masses])
-    solute_mass = sum([ureg(u) for u in solute_masses])
-    solv_amt = sum([ureg(u) for u in solv_amounts])
-    solute_mw = float(ReagentStatus(_id=solute_id).molecular_weight) * ureg('g/mol')
-    solv_density = f"{ReagentStatus(_id=solv_id).density}{DENSITY_UNIT}"
+    composition = composition or solution_composition(vial_content, solv_id, soln_density=soln_density,
+                                                      precision=precision)
+    solute = composition["reagents"][solute_id]
+    if np.isnan(solute["mass"]):
+        raise Exception(f"Cannot calculate solute mass because {solute_id} was reported as volume, but it does not "
+                        f"have a density.")
+    if np.isnan(solute["mols"]):
+        raise Exception(f"Cannot calculate molecular weight because no SMILES is associated with {solute_id}.")
 
     if mol_fraction:
-        solute_mols = solute_mass / solute_mw
-        total_mols = 0
-        for reagent in vial_content:
-            r_mw = ReagentStatus(_id=reagent['reagent_uuid']).molecular_weight * ureg('g/mol')
-            r_density = f"{ReagentStatus(_id=reagent['reagent_uuid']).density}{DENSITY_UNIT}"
-            if not r_density:
-                warnings.warn(f"Mol fraction could not be calculated because reagent {reagent} was reported as volume, "
-                              "but it does not have a density.")
-                return None
-            r_mass = unit_conversion(reagent["amount"], default_unit="g", density=r_density) * ureg.gram
-            total_mols += r_mass / r_mw
-        x = solute_mols / total_mols
-        print(f"MOL FRACTION: {x.magnitude:.5f}")
-        return x.magnitude
-    else:
-        if soln_density and ureg(soln_density).magnitude:
-            soln_volume = unit_conversion(total_mass, default_unit="L", density=soln_density) * ureg.liter
-        else:
-            warnings.warn("No solution density provided. The solution volume is assumed to be the solvent volume. "
-                          "This may not be accurate if volume expansion is present. ")
-            soln_volume = unit_conversion(solv_amt, default_unit="L", density=solv_density) * ureg.liter
-        if not soln_volume:
-            if FIZZLE_CONCENTRATION_FAILURE:
-                raise Exception(f"Concentration calculation did not work because solution volume was 0..check all "
-                                f"variables: solute_id={solute_id}, solv_id={solv_id}, solute_mass={solute_masses}")
-            return DEFAULT_CONCENTRATION
-
-        concentration = solute_mass / solute_mw / soln_volume
-        print(f"CONCENTRATION: {concentration:.5f}")
-        return "{}{}".format(sig_figs(concentration.to(CONCENTRATION_UNIT).magnitude, precision), CONCENTRATION_UNIT)
+        if solute["mol_fraction"] is None:
+            warnings.warn(f"Mol fraction could not be calculated because a reagent in {vial_content} does not have a "
+                          f"molecular weight.")
+            return None
+        print(f"MOL FRACTION: {solute['mol_fraction']:.5f}")
+        return solute["mol_fraction"]
+    if not composition["volume"]:
+        if FIZZLE_CONCENTRATION_FAILURE:
+            raise Exception(f"Concentration calculation did not work because solution volume was 0..check all "
+                            f"variables: solute_id={solute_id}, solv_id={solv_id}, solute_mass={solute_masses}")
+        return DEFAULT_CONCENTRATION
+    concentration = format_concentration(solute["molarity"], precision)
+    print(f"CONCENTRATION: {concentration}")
+    return concentration
+
+
+KCL_CONDUCTIVITY = {  # Conductivity (μS/cm) of 0.01M KCl by temperature (°C)
+    15: 1141.5,
+    16: 1167.5,
+    17: 1193.5,
+    18: 1219.9,
+    19: 1246.4,
+    20: 1273.0,
+    21: 1299.7,
+    22: 1326.6,
+    23: 1353.6,
+    24: 1380.8,
+    25: 1408.1,
+    26: 1435.6,
+    27: 1463.2,
+    28: 1490.9,
+    29: 1518.7,
+    30: 1546.7,
+}
 
 
 def get_kcl_conductivity(temp):
     """
-    Returns the conductivity of a 0.01M KCl solution based on the temperature.
+    Returns the conductivity of a 0.01M KCl solution based on the temperature, interpolated linearly between the
+    tabulated whole-degree values.
 
     Args:
         temp (float): The temperature at which the conductivity is measured. Expected in Celsius or other convertible units.
@@ -98,25 +209,11 @@ def get_kcl_conductivity(temp):
     Returns:
         float: Conductivity of the KCl solution at the given temperature in μS/cm, or None if temperature is out of range.
     """
-    temp_k = round(unit_conversion(temp, default_unit="K"))
-    return {
-        15: 1141.5,
-        16: 1167.5,
-        17: 1193.5,
-        18: 1219.9,
-        19: 1246.4,
-        20: 1273.0,
-        21: 1299.7,
-        22: 1326.6,
-        23: 1353.6,
-        24: 1380.8,
-        25: 1408.1,
-        26: 1435.6,
-        27: 1463.2,
-        28: 1490.9,
-        29: 1518.7,
-        30: 1546.7,
-    }.get(temp_k - 273)
+    temp_c = unit_conversion(temp, default_unit="K") - 273.15
+    temps = sorted(KCL_CONDUCTIVITY)
+    if not temps[0] <= temp_c <= temps[-1]:
+        return None
+    return round(float(np.interp(temp_c, temps, [KCL_CONDUCTIVITY[t] for t in temps])), 1)
 
 
 def kcl_cell_constant(conductance_measured, temperature, di_water_conductivity=DI_WATER_COND):
@@ -370,30 +467,37 @@ class DefaultConditions:
         self.soln_density = firetask_obj.metadata.get("soln_density")
         active_vial_id = firetask_obj.metadata.get("active_vial_id")
         self.vial_contents = VialStatus(active_vial_id).vial_content
+        self._composition = None
+
+    @property
+    def composition(self):
+        if self._composition is None:
+            self._composition = solution_composition(self.vial_contents, self.solv_id, soln_density=self.soln_density)
+        return self._composition
 
     @property
     def redox_mol_concentration(self):
         conc = get_concentration(self.vial_contents, solute_id=self.rom_id, solv_id=self.solv_id,
-                                 soln_density=self.soln_density)
-        ureg = pint.UnitRegistry()
-        return ureg(conc).to("M").magnitude
+                                 soln_density=self.soln_density, composition=self.composition)
+        return convert_quantity(conc, "M")
 
     @property
     def electrolyte_concentration(self):
         conc = get_concentration(self.vial_contents, self.elect_id, self.solv_id,
-                                 soln_density=self.soln_density)
-        ureg = pint.UnitRegistry()
-        return ureg(conc).to("M").magnitude
+                                 soln_density=self.soln_density, composition=self.composition)
+        return convert_quantity(conc, "M")
 
     @property
     def redox_mol_fraction(self):
         return float(get_concentration(self.vial_contents, solute_id=self.rom_id, solv_id=self.solv_id,
-                                       soln_density=self.soln_density, mol_fraction=True))
+                                       soln_density=self.soln_density, mol_fraction=True,
+                                       composition=self.composition))
 
     @property
     def electrolyte_mol_fraction(self):
         return float(get_concentration(self.vial_contents, self.elect_id, self.solv_id,
-                                       soln_density=self.soln_density, mol_fraction=True))
+                                       soln_density=self.soln_density, mol_fraction=True,
+                                       composition=self.composition))
 
     @property
     def total_mol_fraction(self):
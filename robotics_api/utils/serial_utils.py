@@ -0,0 +1,359 @@
+import time
+import atexit
+import serial
+import threading
+from collections import deque
+from robotics_api.settings import SERIAL_SETTLE_TIME, SERIAL_RECONNECT_WAIT, SERIAL_RECONNECT_ATTEMPTS, \
+    SERIAL_LOG_INTERVAL, SERIAL_LINE_TIMEOUT, SERIAL_IDLE_CLOSE
+
+
+class RateLimitedPrinter:
+    """
+    Prints a message at most once per interval. Used for progress messages inside wait loops.
+    """
+
+    def __init__(self, interval: float = SERIAL_LOG_INTERVAL):
+        self.interval = interval
+        self._last = None
+
+    def __call__(self, message: str, force: bool = False):
+        now = time.monotonic()
+        if force or self._last is None or now - self._last >= self.interval:
+            print(message)
+            self._last = now
+
+
+class SerialSession:
+    """
+    Long-lived, thread-safe connection to one serial port. The port is opened (and allowed to settle) once, then
+    reused for every command. A reader thread collects complete response lines into a queue, so callers wake as soon
+    as a response arrives instead of polling. Text without a line terminator is delivered as a line once the port
+    has been quiet for `line_timeout` seconds. A command that fails with a serial error closes the port, reconnects
+    and retries.
+
+    An open port cannot be used by other processes. The port is closed after `idle_close` seconds without use and
+    reopened by the next command; with `idle_close=None`, only one process can use each port.
+    """
+
+    def __init__(self, port: str, baudrate: int = 9600, timeout: float = 1, settle_time: float = SERIAL_SETTLE_TIME,
+                 line_timeout: float = SERIAL_LINE_TIMEOUT, idle_close: float = SERIAL_IDLE_CLOSE):
+        """
+        Initializes the SerialSession. The port is not opened until the first command.
+
+        Args:
+            port (str): Serial port address (e.g., "COM4").
+            baudrate (int, optional): Baud rate. Defaults to 9600.
+            timeout (float, optional): Default seconds to wait for a single line. Defaults to 1.
+            settle_time (float, optional): Seconds to wait after opening the port. Defaults to SERIAL_SETTLE_TIME.
+            line_timeout (float, optional): Quiet seconds after which unterminated text is delivered as a line.
+                Defaults to SERIAL_LINE_TIMEOUT.
+            idle_close (float, optional): Seconds without use after which the port is closed, or None to keep it open.
+                Defaults to SERIAL_IDLE_CLOSE.
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.settle_time = settle_time
+        self.line_timeout = line_timeout
+        self.idle_close = idle_close
+        self.lock = threading.RLock()  # held for a whole command, so commands from different threads do not interleave
+        self._lines = deque()  # complete lines received and not yet read
+        self._partial = b""  # bytes received after the last complete line
+        self._discards = 0  # incremented by discard_input, so the reader drops lines split off before a discard
+        self._readers = 0  # threads waiting in readline
+        self._last_used = time.monotonic()
+        self._listeners = []  # callables that receive each line first; a True return consumes the line
+        self._condition = threading.Condition()  # signals new lines or reader errors
+        self._serial = None
+        self._reader = None
+        self._reader_error = None
+
+    def __str__(self):
+        return f"SerialSession({self.port})"
+
+    @property
+    def is_open(self):
+        return bool(self._serial and self._serial.is_open)
+
+    def open(self):
+        """
+        Opens the port and starts the reader thread if the port is not already open, retrying up to
+        SERIAL_RECONNECT_ATTEMPTS times.
+
+        Returns:
+            serial.Serial: The open port.
+
+        Raises:
+            Exception: If the port cannot be opened.
+        """
+        with self.lock:
+            if self.is_open:
+                return self._serial
+            for attempt in range(SERIAL_RECONNECT_ATTEMPTS + 1):
+                try:
+                    self._serial = serial.Serial(self.port, self.baudrate, timeout=0.1)
+                    break
+                except (serial.SerialException, OSError) as e:
+                    if attempt == SERIAL_RECONNECT_ATTEMPTS:
+                        raise Exception("Warning! {} is not connected because: {}".format(self.port, e))
+                    print(f"Could not open {self.port} ({e}). Trying again in {SERIAL_RECONNECT_WAIT} seconds...")
+                    time.sleep(SERIAL_RECONNECT_WAIT)
+            time.sleep(self.settle_time)  # give the connection time to settle, once per connection
+            self._serial.reset_input_buffer()
+            with self._condition:
+                self._lines.clear()
+                self._partial = b""
+                self._reader_error = None
+            self._last_used = time.monotonic()
+            self._reader = threading.Thread(target=self._read_loop, args=(self._serial,), daemon=True,
+                                            name=f"serial-reader-{self.port}")
+            self._reader.start()
+            return self._serial
+
+    def _read_loop(self, port):
+        last_data = time.monotonic()
+        while port.is_open:
+            try:
+                data = port.read(port.in_waiting or 1)
+            except (serial.SerialException, OSError, TypeError) as e:
+                if port.is_open:
+                    with self._condition:
+                        self._reader_error = e
+                        self._condition.notify_all()
+                return
+            now = time.monotonic()
+            with self._condition:
+                if data:
+                    last_data = now
+                    self._partial += data
+                if b"\n" in self._partial:
+                    *lines, self._partial = self._partial.split(b"\n")
+                elif self._partial and now - last_data >= self.line_timeout:
+                    lines, self._partial = [self._partial], b""  # unterminated response
+                else:
+                    lines = []
+                listeners, discards = list(self._listeners), self._discards
+            if not lines:
+                if not data:
+                    self._close_if_idle(port)
+                continue
+            lines = [l.decode(errors="replace").strip() for l in lines]
+            lines = [l for l in lines if l and not any(listener(l) for listener in listeners)]
+            with self._condition:
+                if discards == self._discards:
+                    self._lines.extend(lines)
+                    self._condition.notify_all()
+
+    def _close_if_idle(self, port):
+        if self.idle_close is None or time.monotonic() - self._last_used < self.idle_close:
+            return
+        if not self.lock.acquire(blocking=False):  # a command is in progress
+            return
+        try:
+            with self._condition:
+                busy = self._listeners or self._readers
+            if not busy and self._serial is port and time.monotonic() - self._last_used >= self.idle_close:
+                print(f"Closing {self.port} after {self.idle_close} seconds without use.")
+                self.close()
+        finally:
+            self.lock.release()
+
+    def close(self):
+        """
+        Closes the port and stops the reader thread.
+        """
+        with self.lock:
+            if self._serial:
+                try:
+                    self._serial.close()
+                except (serial.SerialException, OSError):
+                    pass
+            if self._reader and self._reader is not threading.current_thread():
+                self._reader.join(timeout=1)
+            self._serial = None
+            self._reader = None
+
+    def reconnect(self):
+        """
+        Closes and reopens the port.
+
+        Returns:
+            serial.Serial: The open port.
+        """
+        with self.lock:
+            self.close()
+            return self.open()
+
+    def healthy(self):
+        """
+        Checks that the port is open, its reader thread is running, and it still responds to status queries.
+
+        Returns:
+            bool: True if the port is usable.
+        """
+        with self.lock:
+            if not self.is_open or self._reader_error or not (self._reader and self._reader.is_alive()):
+                return False
+            try:
+                self._serial.in_waiting
+                return True
+            except (serial.SerialException, OSError):
+                return False
+
+    def subscribe(self, listener):
+        """
+        Registers a function that the reader thread calls with each complete line before it is queued. If the
+        function returns True, the line is consumed and not returned by `readline`. Used for continuous data streams.
+
+        Args:
+            listener (callable): Function taking a response line and returning a bool.
+        """
+        with self._condition:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """
+        Removes a function registered with `subscribe`.
+
+        Args:
+            listener (callable): The registered function.
+        """
+        with self._condition:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def discard_input(self):
+        """
+        Discards unread input on the port.
+        """
+        with self.lock:
+            try:
+                self.open().reset_input_buffer()
+            except (serial.SerialException, OSError):
+                self.close()
+            with self._condition:
+                self._lines.clear()
+                self._partial = b""
+                self._discards += 1
+
+    def write(self, text: str):
+        """
+        Writes text to the port, reconnecting once if the write fails.
+
+        Args:
+            text (str): Text to write.
+        """
+        with self.lock:
+            self._last_used = time.monotonic()
+            try:
+                self.open().write(bytes(text, encoding='utf-8'))
+            except (serial.SerialException, OSError) as e:
+                print(f"Write to {self.port} failed ({e}). Reconnecting...")
+                self.reconnect().write(bytes(text, encoding='utf-8'))
+
+    def readline(self, timeout: float = None):
+        """
+        Waits for the next complete line from the port.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. Defaults to the session timeout.
+
+        Returns:
+            str: The decoded and stripped line, or an empty string if no line arrived before the timeout.
+        """
+        with self._condition:
+            self._readers += 1
+        try:
+            self._last_used = time.monotonic()
+            self.open()
+            deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+            with self._condition:
+                while not self._lines and not self._reader_error:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return ""
+                    self._condition.wait(remaining)
+                if self._lines:
+                    return self._lines.popleft()
+                error, self._reader_error = self._reader_error, None
+        finally:
+            with self._condition:
+                self._readers -= 1
+                self._last_used = time.monotonic()
+        print(f"Read from {self.port} failed ({error}). Reconnecting...")
+        self.reconnect()
+        return ""
+
+    def command(self, text: str or None, until=None, timeout: float = None, label: str = None):
+        """
+        Writes a command and waits for lines until `until` accepts one or the timeout passes. Other threads cannot use
+        the port until the command finishes.
+
+        Args:
+            text (str): Command to write. If None, only read.
+            until (callable, optional): Function taking a response line and returning True when it is the final
+                response. Defaults to accepting the first non-empty line.
+            timeout (float, optional): Maximum seconds to wait for the response. If None, wait indefinitely.
+                Defaults to None.
+            label (str, optional): Name used in progress messages. Defaults to the port.
+
+        Returns:
+            str: The accepted response line.
+
+        Raises:
+            TimeoutError: If no accepted response arrives before the timeout.
+        """
+        until = until or (lambda line: True)
+        label = label or self.port
+        log = RateLimitedPrinter()
+        with self.lock:
+            if self.is_open and not self.healthy():
+                print(f"{self.port} stopped responding. Reconnecting...")
+                self.reconnect()
+            if text:
+                self.discard_input()  # a fresh command should not see replies left over from earlier commands
+                self.write(text)
+            start_time = time.monotonic()
+            deadline = None if timeout is None else start_time + timeout
+            while True:
+                wait = log.interval if deadline is None else min(log.interval, deadline - time.monotonic())
+                line = self.readline(timeout=max(wait, 0))
+                if line:
+                    print(f"{label} RESULT: ", line)
+                    if until(line):
+                        return line
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"{label} failed to respond after {timeout} s.")
+                log("waiting for {} results for {:.1f} seconds...".format(label, time.monotonic() - start_time))
+
+
+_SESSIONS = {}  # port --> SerialSession
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_serial_session(port: str, **kwargs):
+    """
+    Gets the process-wide session for a serial port, creating it on first use. While the session holds the port
+    open, other processes cannot use it (see SerialSession).
+
+    Args:
+        port (str): Serial port address.
+        **kwargs: SerialSession keyword arguments, used only when the session is created.
+
+    Returns:
+        SerialSession: The session for the port.
+    """
+    with _SESSIONS_LOCK:
+        if port not in _SESSIONS:
+            _SESSIONS[port] = SerialSession(port, **kwargs)
+        return _SESSIONS[port]
+
+
+@atexit.register
+def close_serial_sessions():
+    """
+    Closes every open serial session.
+    """
+    with _SESSIONS_LOCK:
+        for session in _SESSIONS.values():
+            session.close()
@@ -0,0 +1,301 @@
+import json
+import warnings
+import threading
+import numpy as np
+from pathlib import Path
+from robotics_api.settings import *
+
+POSE_KEYS = ("x", "y", "z", "thetaX", "thetaY", "thetaZ")
+
+
+def get_zone(angle, zone_dividers=ZONE_DIVIDERS, verbose=True):
+    """
+    Gets the workspace zone for a base (joint 1) angle.
+
+    Args:
+        angle (float): The angle in degrees.
+        zone_dividers (list): A list of zone divider angles in ascending order.
+        verbose (bool): Print the angle and zone dividers (default is True).
+    Returns:
+        int: The zone index (starting from 1) that the angle belongs to.
+    """
+
+    # Make sure zone_dividers starts with 0
+    zone_dividers = list(set([0] + zone_dividers))
+    zone_dividers.sort()
+
+    if verbose:
+        print("ZONES: ", angle, zone_dividers)
+    # Check if angle is above the last divider
+    if angle > zone_dividers[-1]:
+        return 1  # Belongs to Zone 1
+
+    # Find the zone
+    for idx in range(len(zone_dividers)):
+        if zone_dividers[idx] <= angle < (zone_dividers[(idx + 1) % len(zone_dividers)]):
+            return idx + 1  # Zone index starts from 1
+
+    raise ValueError(f"Zone not found for angle {angle} and dividers {zone_dividers}.")
+
+
+class Snapshot:
+    """
+    Base class for a parsed Kinova snapshot.
+    """
+
+    def __init__(self, name: str, path: str = None, zone_dividers=ZONE_DIVIDERS):
+        self.name = name
+        self.path = path
+        self.zone = get_zone(self.base_angle, zone_dividers=zone_dividers, verbose=False)
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name})"
+
+    @property
+    def base_angle(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def from_dict(data: dict, name: str, path: str = None, zone_dividers=ZONE_DIVIDERS):
+        """
+        Parses a Kinova snapshot (the JSON exported by the Kinova web UI).
+
+        Args:
+            data (dict): Snapshot JSON data.
+            name (str): Snapshot name.
+            path (str, optional): Snapshot file path. Defaults to None.
+            zone_dividers (list, optional): Zone divider angles. Defaults to ZONE_DIVIDERS.
+
+        Returns:
+            Snapshot: A JointSnapshot or PoseSnapshot.
+
+        Raises:
+            ValueError: If the snapshot is not a joint-angle or pose snapshot, or is missing values.
+        """
+        try:
+            if "jointAnglesGroup" in data:
+                joint_angles = data["jointAnglesGroup"]["jointAngles"][0]["reachJointAngles"]["jointAngles"][
+                    "jointAngles"]
+                angles = {int(j.get("jointIdentifier", i)): float(j["value"]) for i, j in enumerate(joint_angles)}
+                return JointSnapshot(name, [angles[i] for i in sorted(angles)], path=path, zone_dividers=zone_dividers)
+            if "poses" in data:
+                target_pose = data["poses"]["pose"][0]["reachPose"]["targetPose"]
+                return PoseSnapshot(name, path=path, zone_dividers=zone_dividers,
+                                    **{k: float(target_pose[k]) for k in POSE_KEYS})
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise ValueError(f"Snapshot {name} is malformed: missing or invalid {e}")
+        raise ValueError(f"Snapshot {name} type not suitable for robot movement")
+
+
+class JointSnapshot(Snapshot):
+    """
+    Snapshot that moves the arm to a set of joint angles.
+    """
+
+    def __init__(self, name: str, angles: list, path: str = None, zone_dividers=ZONE_DIVIDERS):
+        """
+        Args:
+            name (str): Snapshot name.
+            angles (list): Joint angles in degrees, indexed by joint identifier.
+            path (str, optional): Snapshot file path. Defaults to None.
+            zone_dividers (list, optional): Zone divider angles. Defaults to ZONE_DIVIDERS.
+        """
+        self.angles = tuple(angles)
+        self.joint_angle_values = [{"jointIdentifier": i, "value": v} for i, v in enumerate(self.angles)]
+        super().__init__(name, path=path, zone_dividers=zone_dividers)
+
+    @property
+    def base_angle(self):
+        return self.angles[0]
+
+
+class PoseSnapshot(Snapshot):
+    """
+    Snapshot that moves the arm tool to a Cartesian pose.
+    """
+
+    def __init__(self, name: str, x: float, y: float, z: float, thetaX: float, thetaY: float, thetaZ: float,
+                 path: str = None, zone_dividers=ZONE_DIVIDERS):
+        """
+        Args:
+            name (str): Snapshot name.
+            x, y, z (float): Position in meters.
+            thetaX, thetaY, thetaZ (float): Orientation in degrees.
+            path (str, optional): Snapshot file path. Defaults to None.
+            zone_dividers (list, optional): Zone divider angles. Defaults to ZONE_DIVIDERS.
+        """
+        self.coordinates = dict(x=x, y=y, z=z, thetaX=thetaX, thetaY=thetaY, thetaZ=thetaZ)
+        self._zone_dividers = zone_dividers
+        super().__init__(name, path=path, zone_dividers=zone_dividers)
+
+    @property
+    def base_angle(self):
+        return -np.degrees(np.arctan2(self.coordinates["y"], self.coordinates["x"])) % 360
+
+    def perturbed(self, perturb_amount: float = PERTURB_AMOUNT, axis="z"):
+        """
+        Creates a copy of this pose moved along one axis.
+
+        Args:
+            perturb_amount (float): Amount to move along the axis (default is PERTURB_AMOUNT).
+            axis (str): Axis to move along, defaults to "z".
+
+        Returns:
+            PoseSnapshot: The perturbed pose.
+        """
+        coordinates = dict(self.coordinates)
+        coordinates[axis] += perturb_amount
+        return PoseSnapshot(f"{self.name}_{axis}{perturb_amount:+g}", path=None, zone_dividers=self._zone_dividers,
+                            **coordinates)
+
+
+class SnapshotLibrary:
+    """
+    All snapshots in the snapshot directory, parsed once into JointSnapshot and PoseSnapshot objects with
+    precomputed zones. Perturbed poses are generated and cached in memory, so motion code does not read or write
+    snapshot files.
+    """
+
+    def __init__(self, snapshot_dir=SNAPSHOT_DIR, zone_dividers=ZONE_DIVIDERS):
+        """
+        Initializes the SnapshotLibrary. Call `load` to parse the snapshots.
+
+        Args:
+            snapshot_dir (str, optional): Snapshot directory. Defaults to SNAPSHOT_DIR.
+            zone_dividers (list, optional): Zone divider angles. Defaults to ZONE_DIVIDERS.
+        """
+        self.snapshot_dir = Path(snapshot_dir).resolve()
+        self.zone_dividers = zone_dividers
+        self.snapshots = {}  # snapshot name --> Snapshot
+        self._paths = {}  # resolved snapshot path --> Snapshot
+        self._keys = {}  # name or path as given by callers --> Snapshot
+        self._perturbed = {}  # (snapshot name, amount, axis) --> PoseSnapshot
+        self._lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self.snapshots
+
+    def __getitem__(self, name):
+        return self.snapshots[name]
+
+    def _parse(self, path: Path):
+        with open(path, 'r') as fn:
+            data = json.load(fn)
+        return Snapshot.from_dict(data, path.stem, path=str(path), zone_dividers=self.zone_dividers)
+
+    def load(self):
+        """
+        Parses every snapshot in the snapshot directory. Files starting with "_" are skipped.
+
+        Raises:
+            ValueError: If any snapshot cannot be parsed. The error lists every bad file.
+        """
+        snapshots, errors = {}, []
+        for path in sorted(self.snapshot_dir.glob("*.json")):
+            if path.name.startswith("_"):
+                continue
+            try:
+                snapshots[path.stem] = self._parse(path)
+            except (ValueError, OSError) as e:
+                errors.append(f"{path.name}: {e}")
+        if errors:
+            raise ValueError("Invalid snapshots in {}:\n{}".format(self.snapshot_dir, "\n".join(errors)))
+        with self._lock:
+            self.snapshots = snapshots
+            self._paths = {Path(s.path): s for s in snapshots.values()}
+            self._keys = {}
+            self._perturbed = {}
+
+    def validate(self, raise_error=False):
+        """
+        Checks that the snapshots the workflow relies on exist: home, end home, one per zone, and one per vial home
+        and station location.
+
+        Args:
+            raise_error (bool, optional): Raise if any snapshot is missing. Defaults to False, which only warns.
+
+        Returns:
+            list: Names of missing snapshots.
+        """
+        required = [Path(SNAPSHOT_HOME).stem, Path(SNAPSHOT_END_HOME).stem]
+        required += [f"zone_{z:02d}" for z in range(1, len(set([0] + self.zone_dividers)))]
+        required += ["VialHome_{}_{}".format(*v.split("_")) for v in VIALS]
+        required += [s for s in STATIONS if s != "robot_grip" and not s.startswith("temperature")]
+        missing = [name for name in required if name not in self.snapshots]
+        if missing:
+            message = f"Missing snapshots in {self.snapshot_dir}: {', '.join(missing)}"
+            if raise_error:
+                raise ValueError(message)
+            warnings.warn(message)
+        return missing
+
+    def get(self, snapshot):
+        """
+        Gets a snapshot by object, file path, or name. Paths outside the library are parsed once and cached.
+
+        Args:
+            snapshot (Snapshot or str or Path): The snapshot, its file path, or its name.
+
+        Returns:
+            Snapshot: The parsed snapshot.
+        """
+        if isinstance(snapshot, Snapshot):
+            return snapshot
+        key = str(snapshot)
+        if key in self._keys:
+            return self._keys[key]
+        with self._lock:
+            if key in self.snapshots:
+                self._keys[key] = self.snapshots[key]
+                return self._keys[key]
+            path = Path(snapshot).resolve()
+            if path not in self._paths:
+                self._paths[path] = self._parse(path)
+            self._keys[key] = self._paths[path]
+            return self._keys[key]
+
+    def perturbed(self, snapshot, perturb_amount: float = PERTURB_AMOUNT, axis="z"):
+        """
+        Gets a pose snapshot moved along one axis, cached by snapshot, amount, and axis.
+
+        Args:
+            snapshot (Snapshot or str or Path): The pose snapshot, its file path, or its name.
+            perturb_amount (float): Amount to move along the axis (default is PERTURB_AMOUNT).
+            axis (str): Axis to move along, defaults to "z".
+
+        Returns:
+            PoseSnapshot: The perturbed pose.
+        """
+        snapshot = self.get(snapshot)
+        if not isinstance(snapshot, PoseSnapshot):
+            raise ValueError(f"Snapshot {snapshot} is not a pose snapshot and cannot be perturbed along {axis}.")
+        key = (snapshot.name, perturb_amount, axis)
+        with self._lock:
+            if key not in self._perturbed:
+                self._perturbed[key] = snapshot.perturbed(perturb_amount, axis=axis)
+            return self._perturbed[key]
+
+
+_SNAPSHOT_LIBRARY = None
+
+
+def snapshot_library(reload=False):
+    """
+    Gets the process-wide snapshot library, loading and validating it on first use.
+
+    Args:
+        reload (bool, optional): Re-read the snapshot directory. Defaults to False.
+
+    Returns:
+        SnapshotLibrary: The loaded library.
+    """
+    global _SNAPSHOT_LIBRARY
+    if _SNAPSHOT_LIBRARY is None or reload:
+        library = SnapshotLibrary()
+        library.load()
+        library.validate()
+        _SNAPSHOT_LIBRARY = library
+    return _SNAPSHOT_LIBRARY
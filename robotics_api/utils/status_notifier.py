@@ -0,0 +1,159 @@
+import os
+import time
+import threading
+from pymongo.errors import PyMongoError
+from robotics_api.settings import STATUS_NOTIFY_DIR, STATUS_CHANGE_STREAMS, STATUS_SIGNAL_INTERVAL
+
+
+class StatusNotifier:
+    """
+    Wakes processes waiting on a status database collection as soon as that collection changes.
+
+    Changes are signaled through three channels: an in-process condition variable, a MongoDB change stream (only
+    available when MongoDB runs as a replica set), and a signal file in STATUS_NOTIFY_DIR for other processes on
+    the same machine. Waiters still poll the database at the fallback interval, so a missed signal only delays
+    them, it never blocks them.
+    """
+
+    def __init__(self, notify_dir=STATUS_NOTIFY_DIR, change_streams=STATUS_CHANGE_STREAMS,
+                 signal_interval=STATUS_SIGNAL_INTERVAL):
+        """
+        Initializes the StatusNotifier.
+
+        Args:
+            notify_dir (str, optional): Directory for signal files. If None, signal files are not used. Defaults to
+                STATUS_NOTIFY_DIR.
+            change_streams (bool, optional): If True, watch collections with MongoDB change streams when the server
+                supports them. Defaults to STATUS_CHANGE_STREAMS.
+            signal_interval (float, optional): Seconds between signal file checks while waiting. Defaults to
+                STATUS_SIGNAL_INTERVAL.
+        """
+        self.notify_dir = notify_dir
+        self.change_streams = change_streams
+        self.signal_interval = signal_interval
+        self._condition = threading.Condition()
+        self._versions = {}  # collection name --> number of changes seen in this process
+        self._watchers = {}  # collection name --> change stream thread (None if change streams are unsupported)
+
+    def _signal_file(self, coll_name):
+        return os.path.join(self.notify_dir, "{}.signal".format(coll_name)) if self.notify_dir else None
+
+    def _signal_mtime(self, coll_name):
+        signal_file = self._signal_file(coll_name)
+        try:
+            return os.stat(signal_file).st_mtime_ns if signal_file else None
+        except OSError:
+            return None
+
+    def _bump(self, coll_name):
+        with self._condition:
+            self._versions[coll_name] = self._versions.get(coll_name, 0) + 1
+            self._condition.notify_all()
+
+    def _watch(self, coll):
+        try:
+            with coll.watch([{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]) as stream:
+                for _ in stream:
+                    self._bump(coll.full_name)
+        except (PyMongoError, NotImplementedError) as e:
+            print(f"Change stream unavailable for {coll.full_name}; using local signals and polling. ({e})")
+        self._watchers[coll.full_name] = None
+
+    def _start_watcher(self, coll):
+        if not self.change_streams or coll.full_name in self._watchers:
+            return
+        watcher = threading.Thread(target=self._watch, args=(coll,), daemon=True)
+        self._watchers[coll.full_name] = watcher
+        watcher.start()
+
+    def token(self, coll):
+        """
+        Returns a marker of the signals seen so far for a collection. Take the token before checking the
+        database so a change made between the check and the wait is not missed.
+
+        Args:
+            coll (pymongo.collection.Collection): Status collection.
+
+        Returns:
+            tuple: (in-process version, signal file modification time)
+        """
+        self._start_watcher(coll)
+        with self._condition:
+            version = self._versions.get(coll.full_name, 0)
+        return version, self._signal_mtime(coll.full_name)
+
+    def notify(self, coll):
+        """
+        Signals that a status collection changed.
+
+        Args:
+            coll (pymongo.collection.Collection): Status collection.
+        """
+        self._bump(coll.full_name)
+        signal_file = self._signal_file(coll.full_name)
+        if signal_file:
+            try:
+                os.makedirs(self.notify_dir, exist_ok=True)
+                with open(signal_file, "a"):
+                    os.utime(signal_file)
+            except OSError as e:
+                print(f"Could not write status signal file {signal_file}: {e}")
+
+    def wait_for_change(self, coll, token, timeout):
+        """
+        Blocks until a collection is signaled as changed since `token`, or until the timeout.
+
+        Args:
+            coll (pymongo.collection.Collection): Status collection.
+            token (tuple): Token from `token`.
+            timeout (float): Maximum seconds to wait.
+
+        Returns:
+            bool: True if a change was signaled, False on timeout.
+        """
+        version, mtime = token
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            with self._condition:
+                if self._versions.get(coll.full_name, 0) != version:
+                    return True
+                if remaining <= 0:
+                    return False
+                self._condition.wait(min(self.signal_interval, remaining) if self.notify_dir else remaining)
+            if self.notify_dir and self._signal_mtime(coll.full_name) != mtime:
+                return True
+
+    def wait(self, coll, check, max_time=None, poll_interval=2, message=None):
+        """
+        Waits until `check` returns a truthy value. `check` runs once per change signal, and at least every
+        `poll_interval` seconds.
+
+        Args:
+            coll (pymongo.collection.Collection): Status collection `check` reads from.
+            check (callable): Function with no arguments that queries the database.
+            max_time (float, optional): Maximum seconds to wait. If None, wait indefinitely. Defaults to None.
+            poll_interval (float, optional): Maximum seconds between database checks. Defaults to 2.
+            message (str, optional): Message printed each time the fallback poll interval passes. Defaults to None.
+
+        Returns:
+            The last value returned by `check` (falsy if the wait timed out).
+        """
+        start = time.monotonic()
+        last_message = start
+        while True:
+            token = self.token(coll)
+            result = check()
+            now = time.monotonic()
+            if result:
+                return result
+            if max_time and now - start >= max_time:
+                return result
+            if message and now - last_message >= poll_interval:
+                print(message.format(round(now - start)))
+                last_message = now
+            timeout = poll_interval if not max_time else min(poll_interval, max_time - (now - start))
+            self.wait_for_change(coll, token, timeout)
+
+
+STATUS_NOTIFIER = StatusNotifier()